@@ -428,6 +428,10 @@ TSharedPtr<FJsonValue> FUnrealMCPCommonUtils::ActorToJson(AActor* Actor)
     TSharedPtr<FJsonObject> ActorObject = MakeShared<FJsonObject>();
     ActorObject->SetStringField(TEXT("name"), Actor->GetName());
     ActorObject->SetStringField(TEXT("class"), Actor->GetClass()->GetName());
+#if WITH_EDITOR
+    // The name shown in the World Outliner, which may differ from the object name
+    ActorObject->SetStringField(TEXT("label"), Actor->GetActorLabel());
+#endif
     
     FVector Location = Actor->GetActorLocation();
     TArray<TSharedPtr<FJsonValue>> LocationArray;
@@ -453,6 +457,57 @@ TSharedPtr<FJsonValue> FUnrealMCPCommonUtils::ActorToJson(AActor* Actor)
     return MakeShared<FJsonValueObject>(ActorObject);
 }
 
+TSharedPtr<FJsonValue> FUnrealMCPCommonUtils::ActorToJson(AActor* Actor, const TSet<FString>& Fields)
+{
+    if (Fields.Num() == 0)
+    {
+        return ActorToJson(Actor);
+    }
+    if (!Actor)
+    {
+        return MakeShared<FJsonValueNull>();
+    }
+
+    auto VectorToJson = [](double X, double Y, double Z)
+    {
+        TArray<TSharedPtr<FJsonValue>> Array;
+        Array.Add(MakeShared<FJsonValueNumber>(X));
+        Array.Add(MakeShared<FJsonValueNumber>(Y));
+        Array.Add(MakeShared<FJsonValueNumber>(Z));
+        return Array;
+    };
+
+    TSharedPtr<FJsonObject> ActorObject = MakeShared<FJsonObject>();
+    ActorObject->SetStringField(TEXT("name"), Actor->GetName());
+    if (Fields.Contains(TEXT("class")))
+    {
+        ActorObject->SetStringField(TEXT("class"), Actor->GetClass()->GetName());
+    }
+#if WITH_EDITOR
+    if (Fields.Contains(TEXT("label")))
+    {
+        ActorObject->SetStringField(TEXT("label"), Actor->GetActorLabel());
+    }
+#endif
+    if (Fields.Contains(TEXT("location")))
+    {
+        FVector Location = Actor->GetActorLocation();
+        ActorObject->SetArrayField(TEXT("location"), VectorToJson(Location.X, Location.Y, Location.Z));
+    }
+    if (Fields.Contains(TEXT("rotation")))
+    {
+        FRotator Rotation = Actor->GetActorRotation();
+        ActorObject->SetArrayField(TEXT("rotation"), VectorToJson(Rotation.Pitch, Rotation.Yaw, Rotation.Roll));
+    }
+    if (Fields.Contains(TEXT("scale")))
+    {
+        FVector Scale = Actor->GetActorScale3D();
+        ActorObject->SetArrayField(TEXT("scale"), VectorToJson(Scale.X, Scale.Y, Scale.Z));
+    }
+
+    return MakeShared<FJsonValueObject>(ActorObject);
+}
+
 TSharedPtr<FJsonObject> FUnrealMCPCommonUtils::ActorToJsonObject(AActor* Actor, bool bDetailed)
 {
     if (!Actor)
@@ -463,6 +518,10 @@ TSharedPtr<FJsonObject> FUnrealMCPCommonUtils::ActorToJsonObject(AActor* Actor,
     TSharedPtr<FJsonObject> ActorObject = MakeShared<FJsonObject>();
     ActorObject->SetStringField(TEXT("name"), Actor->GetName());
     ActorObject->SetStringField(TEXT("class"), Actor->GetClass()->GetName());
+#if WITH_EDITOR
+    // The name shown in the World Outliner, which may differ from the object name
+    ActorObject->SetStringField(TEXT("label"), Actor->GetActorLabel());
+#endif
     
     FVector Location = Actor->GetActorLocation();
     TArray<TSharedPtr<FJsonValue>> LocationArray;
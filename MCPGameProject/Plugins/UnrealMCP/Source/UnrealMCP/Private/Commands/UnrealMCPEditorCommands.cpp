@@ -21,9 +21,35 @@
 #include "Engine/Blueprint.h"
 #include "Engine/BlueprintGeneratedClass.h"
 #include "AssetRegistry/AssetRegistryModule.h"
+#include "UObject/UObjectGlobals.h"
+
+// Removed actor names kept for deltas; older removals force a full listing
+static const int32 MaxRemovedActors = 4096;
 
 FUnrealMCPEditorCommands::FUnrealMCPEditorCommands()
 {
+    LevelEpoch = FGuid::NewGuid();
+
+    if (GEngine)
+    {
+        ActorAddedHandle = GEngine->OnLevelActorAdded().AddRaw(this, &FUnrealMCPEditorCommands::OnLevelActorAdded);
+        ActorDeletedHandle = GEngine->OnLevelActorDeleted().AddRaw(this, &FUnrealMCPEditorCommands::OnLevelActorDeleted);
+        ActorMovedHandle = GEngine->OnActorMoved().AddRaw(this, &FUnrealMCPEditorCommands::OnActorMoved);
+    }
+    PropertyChangedHandle = FCoreUObjectDelegates::OnObjectPropertyChanged.AddRaw(this, &FUnrealMCPEditorCommands::OnObjectPropertyChanged);
+    MapChangeHandle = FEditorDelegates::MapChange.AddRaw(this, &FUnrealMCPEditorCommands::OnMapChange);
+}
+
+FUnrealMCPEditorCommands::~FUnrealMCPEditorCommands()
+{
+    if (GEngine)
+    {
+        GEngine->OnLevelActorAdded().Remove(ActorAddedHandle);
+        GEngine->OnLevelActorDeleted().Remove(ActorDeletedHandle);
+        GEngine->OnActorMoved().Remove(ActorMovedHandle);
+    }
+    FCoreUObjectDelegates::OnObjectPropertyChanged.Remove(PropertyChangedHandle);
+    FEditorDelegates::MapChange.Remove(MapChangeHandle);
 }
 
 TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params)
@@ -81,20 +107,95 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleCommand(const FString& C
 
 TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleGetActorsInLevel(const TSharedPtr<FJsonObject>& Params)
 {
+    // With a version token from an earlier listing, only return what changed since then
+    FString SinceToken;
+    uint64 SinceVersion = 0;
+    const bool bDelta = Params->TryGetStringField(TEXT("since"), SinceToken)
+        && ParseLevelVersionToken(SinceToken, SinceVersion);
+
+    // Only actors of this class or one of its subclasses
+    FString ClassFilter;
+    Params->TryGetStringField(TEXT("class_filter"), ClassFilter);
+
+    // Only serialize the requested fields
+    TSet<FString> Fields;
+    const TArray<TSharedPtr<FJsonValue>>* FieldsArray;
+    if (Params->TryGetArrayField(TEXT("fields"), FieldsArray))
+    {
+        for (const TSharedPtr<FJsonValue>& Field : *FieldsArray)
+        {
+            Fields.Add(Field->AsString());
+        }
+    }
+
+    // Page through the matching actors
+    int32 Offset = 0;
+    int32 Limit = -1;
+    Params->TryGetNumberField(TEXT("offset"), Offset);
+    Params->TryGetNumberField(TEXT("limit"), Limit);
+    Offset = FMath::Max(Offset, 0);
+
     TArray<AActor*> AllActors;
     UGameplayStatics::GetAllActorsOfClass(GWorld, AActor::StaticClass(), AllActors);
     
     TArray<TSharedPtr<FJsonValue>> ActorArray;
+    int32 Matched = 0;
     for (AActor* Actor : AllActors)
     {
         if (Actor)
         {
-            ActorArray.Add(FUnrealMCPCommonUtils::ActorToJson(Actor));
+            if (bDelta)
+            {
+                const uint64* ChangedAt = ActorVersions.Find(Actor->GetName());
+                if (!ChangedAt || *ChangedAt <= SinceVersion)
+                {
+                    continue;
+                }
+            }
+            if (!ClassFilter.IsEmpty())
+            {
+                bool bClassMatches = false;
+                for (UClass* Class = Actor->GetClass(); Class && !bClassMatches; Class = Class->GetSuperClass())
+                {
+                    bClassMatches = Class->GetName() == ClassFilter;
+                }
+                if (!bClassMatches)
+                {
+                    continue;
+                }
+            }
+
+            // Count every match for the total, but only serialize the requested page
+            const int32 Index = Matched++;
+            if (Index >= Offset && (Limit < 0 || Index < Offset + Limit))
+            {
+                ActorArray.Add(FUnrealMCPCommonUtils::ActorToJson(Actor, Fields));
+            }
         }
     }
     
     TSharedPtr<FJsonObject> ResultObj = MakeShared<FJsonObject>();
     ResultObj->SetArrayField(TEXT("actors"), ActorArray);
+    ResultObj->SetStringField(TEXT("version"), GetLevelVersionToken());
+    ResultObj->SetBoolField(TEXT("delta"), bDelta);
+    ResultObj->SetNumberField(TEXT("total"), Matched);
+    if (Limit >= 0 && Offset + Limit < Matched)
+    {
+        ResultObj->SetNumberField(TEXT("next_offset"), Offset + Limit);
+    }
+
+    if (bDelta)
+    {
+        TArray<TSharedPtr<FJsonValue>> RemovedArray;
+        for (const TPair<uint64, FString>& Removed : RemovedActors)
+        {
+            if (Removed.Key > SinceVersion)
+            {
+                RemovedArray.Add(MakeShared<FJsonValueString>(Removed.Value));
+            }
+        }
+        ResultObj->SetArrayField(TEXT("removed"), RemovedArray);
+    }
     
     return ResultObj;
 }
@@ -213,6 +314,7 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleSpawnActor(const TShared
         FTransform Transform = NewActor->GetTransform();
         Transform.SetScale3D(Scale);
         NewActor->SetActorTransform(Transform);
+        MarkActorChanged(NewActor);
 
         // Return the created actor's details
         return FUnrealMCPCommonUtils::ActorToJsonObject(NewActor, true);
@@ -241,6 +343,7 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleDeleteActor(const TShare
             
             // Delete the actor
             Actor->Destroy();
+            MarkActorRemoved(ActorName);
             
             TSharedPtr<FJsonObject> ResultObj = MakeShared<FJsonObject>();
             ResultObj->SetObjectField(TEXT("deleted_actor"), ActorInfo);
@@ -297,6 +400,7 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleSetActorTransform(const
 
     // Set the new transform
     TargetActor->SetActorTransform(NewTransform);
+    MarkActorChanged(TargetActor);
 
     // Return updated actor info
     return FUnrealMCPCommonUtils::ActorToJsonObject(TargetActor, true);
@@ -382,6 +486,7 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleSetActorProperty(const T
     if (FUnrealMCPCommonUtils::SetObjectProperty(TargetActor, PropertyName, PropertyValue, ErrorMessage))
     {
         // Property set successfully
+        MarkActorChanged(TargetActor);
         TSharedPtr<FJsonObject> ResultObj = MakeShared<FJsonObject>();
         ResultObj->SetStringField(TEXT("actor"), ActorName);
         ResultObj->SetStringField(TEXT("property"), PropertyName);
@@ -459,6 +564,7 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleSpawnBlueprintActor(cons
         AActor* NewActor = World->SpawnActor<AActor>(Blueprint->GeneratedClass, SpawnTransform, SpawnParams);
         if (NewActor)
         {
+            MarkActorChanged(NewActor);
             return FUnrealMCPCommonUtils::ActorToJsonObject(NewActor, true);
         }
 
@@ -597,4 +703,89 @@ TSharedPtr<FJsonObject> FUnrealMCPEditorCommands::HandleTakeScreenshot(const TSh
     }
     
     return FUnrealMCPCommonUtils::CreateErrorResponse(TEXT("Failed to take screenshot"));
-}
\ No newline at end of file
+}
+
+FString FUnrealMCPEditorCommands::GetLevelVersionToken() const
+{
+    return FString::Printf(TEXT("%s:%llu"), *LevelEpoch.ToString(EGuidFormats::Digits), LevelVersion);
+}
+
+bool FUnrealMCPEditorCommands::ParseLevelVersionToken(const FString& Token, uint64& OutVersion) const
+{
+    FString Epoch;
+    FString Version;
+    if (!Token.Split(TEXT(":"), &Epoch, &Version) || Epoch != LevelEpoch.ToString(EGuidFormats::Digits))
+    {
+        // Issued before a map change or editor restart
+        return false;
+    }
+
+    OutVersion = FCString::Strtoui64(*Version, nullptr, 10);
+    return OutVersion >= OldestDeltaVersion && OutVersion <= LevelVersion;
+}
+
+void FUnrealMCPEditorCommands::MarkActorChanged(const AActor* Actor)
+{
+    if (Actor)
+    {
+        ActorVersions.Add(Actor->GetName(), ++LevelVersion);
+    }
+}
+
+void FUnrealMCPEditorCommands::MarkActorRemoved(const FString& ActorName)
+{
+    ActorVersions.Remove(ActorName);
+    RemovedActors.Emplace(++LevelVersion, ActorName);
+
+    if (RemovedActors.Num() > MaxRemovedActors)
+    {
+        const int32 Excess = RemovedActors.Num() - MaxRemovedActors;
+        OldestDeltaVersion = RemovedActors[Excess - 1].Key;
+        RemovedActors.RemoveAt(0, Excess);
+    }
+}
+
+void FUnrealMCPEditorCommands::ResetLevelJournal()
+{
+    LevelEpoch = FGuid::NewGuid();
+    LevelVersion = 0;
+    OldestDeltaVersion = 0;
+    ActorVersions.Reset();
+    RemovedActors.Reset();
+}
+
+void FUnrealMCPEditorCommands::OnLevelActorAdded(AActor* Actor)
+{
+    MarkActorChanged(Actor);
+}
+
+void FUnrealMCPEditorCommands::OnLevelActorDeleted(AActor* Actor)
+{
+    if (Actor)
+    {
+        MarkActorRemoved(Actor->GetName());
+    }
+}
+
+void FUnrealMCPEditorCommands::OnActorMoved(AActor* Actor)
+{
+    MarkActorChanged(Actor);
+}
+
+void FUnrealMCPEditorCommands::OnObjectPropertyChanged(UObject* Object, FPropertyChangedEvent& Event)
+{
+    if (AActor* Actor = Cast<AActor>(Object))
+    {
+        MarkActorChanged(Actor);
+    }
+    else if (UActorComponent* Component = Cast<UActorComponent>(Object))
+    {
+        MarkActorChanged(Component->GetOwner());
+    }
+}
+
+void FUnrealMCPEditorCommands::OnMapChange(uint32 MapChangeFlags)
+{
+    // A different level was loaded, so no earlier version token can be answered with a delta
+    ResetLevelJournal();
+}
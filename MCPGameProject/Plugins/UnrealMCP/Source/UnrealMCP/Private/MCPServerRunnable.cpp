@@ -7,13 +7,159 @@
 #include "Dom/JsonValue.h"
 #include "Serialization/JsonSerializer.h"
 #include "Serialization/JsonReader.h"
+#include "Serialization/JsonWriter.h"
 #include "JsonObjectConverter.h"
 #include "Misc/ScopeLock.h"
 #include "HAL/PlatformTime.h"
+#include "Misc/Compression.h"
+#include "Serialization/CborReader.h"
+#include "Serialization/CborWriter.h"
+#include "Serialization/MemoryReader.h"
+#include "Serialization/MemoryWriter.h"
 
 // Buffer size for receiving data
 const int32 BufferSize = 8192;
 
+// Largest message accepted from a client
+const int32 MaxMessageSize = 64 * 1024 * 1024;
+
+// Set in the length header of a zlib-compressed frame
+const uint32 CompressedFlag = 0x80000000;
+
+static uint32 ReadBigEndian32(const uint8* Data)
+{
+    return (uint32(Data[0]) << 24) | (uint32(Data[1]) << 16) | (uint32(Data[2]) << 8) | uint32(Data[3]);
+}
+
+static void AppendBigEndian32(TArray<uint8>& Data, uint32 Value)
+{
+    Data.Add((Value >> 24) & 0xFF);
+    Data.Add((Value >> 16) & 0xFF);
+    Data.Add((Value >> 8) & 0xFF);
+    Data.Add(Value & 0xFF);
+}
+
+// Integers up to 2^53 survive the round trip through a JSON double
+const double MaxExactInteger = 9007199254740992.0;
+
+static void WriteCborValue(FCborWriter& Writer, const TSharedPtr<FJsonValue>& Value)
+{
+    switch (Value.IsValid() ? Value->Type : EJson::Null)
+    {
+    case EJson::String:
+        Writer.WriteValue(Value->AsString());
+        break;
+    case EJson::Number:
+    {
+        // Write whole numbers as integers, as a JSON client would read them
+        const double Number = Value->AsNumber();
+        if (FMath::Abs(Number) <= MaxExactInteger && Number == FMath::TruncToDouble(Number))
+        {
+            Writer.WriteValue((int64)Number);
+        }
+        else
+        {
+            Writer.WriteValue(Number);
+        }
+        break;
+    }
+    case EJson::Boolean:
+        Writer.WriteValue(Value->AsBool());
+        break;
+    case EJson::Array:
+    {
+        const TArray<TSharedPtr<FJsonValue>>& Items = Value->AsArray();
+        Writer.WriteContainerStart(ECborCode::Array, Items.Num());
+        for (const TSharedPtr<FJsonValue>& Item : Items)
+        {
+            WriteCborValue(Writer, Item);
+        }
+        break;
+    }
+    case EJson::Object:
+    {
+        const TMap<FString, TSharedPtr<FJsonValue>>& Fields = Value->AsObject()->Values;
+        Writer.WriteContainerStart(ECborCode::Map, Fields.Num());
+        for (const TPair<FString, TSharedPtr<FJsonValue>>& Field : Fields)
+        {
+            Writer.WriteValue(Field.Key);
+            WriteCborValue(Writer, Field.Value);
+        }
+        break;
+    }
+    default:
+        Writer.WriteNull();
+        break;
+    }
+}
+
+static TSharedPtr<FJsonValue> ReadCborValue(FCborReader& Reader, const FCborContext& Context)
+{
+    switch (Context.MajorType())
+    {
+    case ECborCode::Uint:
+        return MakeShared<FJsonValueNumber>((double)Context.AsUInt());
+    case ECborCode::Int:
+        return MakeShared<FJsonValueNumber>((double)Context.AsInt());
+    case ECborCode::TextString:
+        return MakeShared<FJsonValueString>(Context.AsString());
+    case ECborCode::Array:
+    {
+        // The reader ends finite and indefinite containers alike with a break
+        TArray<TSharedPtr<FJsonValue>> Items;
+        FCborContext ItemContext;
+        while (Reader.ReadNext(ItemContext) && !ItemContext.IsBreak())
+        {
+            TSharedPtr<FJsonValue> Item = ReadCborValue(Reader, ItemContext);
+            if (!Item.IsValid())
+            {
+                return nullptr;
+            }
+            Items.Add(Item);
+        }
+        return MakeShared<FJsonValueArray>(Items);
+    }
+    case ECborCode::Map:
+    {
+        TSharedPtr<FJsonObject> Object = MakeShared<FJsonObject>();
+        FCborContext KeyContext;
+        FCborContext ValueContext;
+        while (Reader.ReadNext(KeyContext) && !KeyContext.IsBreak())
+        {
+            if (KeyContext.MajorType() != ECborCode::TextString || !Reader.ReadNext(ValueContext))
+            {
+                return nullptr;
+            }
+            TSharedPtr<FJsonValue> FieldValue = ReadCborValue(Reader, ValueContext);
+            if (!FieldValue.IsValid())
+            {
+                return nullptr;
+            }
+            Object->SetField(KeyContext.AsString(), FieldValue);
+        }
+        return MakeShared<FJsonValueObject>(Object);
+    }
+    case ECborCode::Prim:
+        switch (Context.AdditionalValue())
+        {
+        case ECborCode::False:
+        case ECborCode::True:
+            return MakeShared<FJsonValueBoolean>(Context.AsBool());
+        case ECborCode::Null:
+            return MakeShared<FJsonValueNull>();
+        case ECborCode::Value_4Bytes:
+            return MakeShared<FJsonValueNumber>(Context.AsFloat());
+        case ECborCode::Value_8Bytes:
+            return MakeShared<FJsonValueNumber>(Context.AsDouble());
+        default:
+            return nullptr;
+        }
+    default:
+        // Byte strings and tags have no JSON equivalent
+        return nullptr;
+    }
+}
+
 FMCPServerRunnable::FMCPServerRunnable(UUnrealMCPBridge* InBridge, TSharedPtr<FSocket> InListenerSocket)
     : Bridge(InBridge)
     , ListenerSocket(InListenerSocket)
@@ -38,284 +184,564 @@ uint32 FMCPServerRunnable::Run()
     
     while (bRunning)
     {
-        // UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Waiting for client connection..."));
-        
-        bool bPending = false;
-        if (ListenerSocket->HasPendingConnection(bPending) && bPending)
+        AcceptPendingClients();
+
+        // Service every connected client. Clients keep their socket open between
+        // commands, so a disconnected client is only removed once Recv reports it.
+        bool bReceivedData = false;
+        for (int32 Index = Clients.Num() - 1; Index >= 0; --Index)
         {
-            UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client connection pending, accepting..."));
-            
-            ClientSocket = MakeShareable(ListenerSocket->Accept(TEXT("MCPClient")));
-            if (ClientSocket.IsValid())
+            if (!ServiceClient(*Clients[Index], bReceivedData))
             {
-                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client connection accepted"));
-                
-                // Set socket options to improve connection stability
-                ClientSocket->SetNoDelay(true);
-                int32 SocketBufferSize = 65536;  // 64KB buffer
-                ClientSocket->SetSendBufferSize(SocketBufferSize, SocketBufferSize);
-                ClientSocket->SetReceiveBufferSize(SocketBufferSize, SocketBufferSize);
-                
-                uint8 Buffer[8192];
-                while (bRunning)
-                {
-                    int32 BytesRead = 0;
-                    if (ClientSocket->Recv(Buffer, sizeof(Buffer), BytesRead))
-                    {
-                        if (BytesRead == 0)
-                        {
-                            UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client disconnected (zero bytes)"));
-                            break;
-                        }
-
-                        // Convert received data to string
-                        Buffer[BytesRead] = '\0';
-                        FString ReceivedText = UTF8_TO_TCHAR(Buffer);
-                        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Received: %s"), *ReceivedText);
-
-                        // Parse JSON
-                        TSharedPtr<FJsonObject> JsonObject;
-                        TSharedRef<TJsonReader<>> Reader = TJsonReaderFactory<>::Create(ReceivedText);
-                        
-                        if (FJsonSerializer::Deserialize(Reader, JsonObject))
-                        {
-                            // Get command type
-                            FString CommandType;
-                            if (JsonObject->TryGetStringField(TEXT("type"), CommandType))
-                            {
-                                // Execute command
-                                FString Response = Bridge->ExecuteCommand(CommandType, JsonObject->GetObjectField(TEXT("params")));
-                                
-                                // Log response for debugging
-                                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Sending response: %s"), *Response);
-                                
-                                // Send response
-                                int32 BytesSent = 0;
-                                if (!ClientSocket->Send((uint8*)TCHAR_TO_UTF8(*Response), Response.Len(), BytesSent))
-                                {
-                                    UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to send response"));
-                                }
-                                else {
-                                    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Response sent successfully, bytes: %d"), BytesSent);
-                                }
-                            }
-                            else
-                            {
-                                UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Missing 'type' field in command"));
-                            }
-                        }
-                        else
-                        {
-                            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to parse JSON from: %s"), *ReceivedText);
-                        }
-                    }
-                    else
-                    {
-                        int32 LastError = (int32)ISocketSubsystem::Get()->GetLastErrorCode();
-                        // Don't break the connection for WouldBlock error, which is normal for non-blocking sockets
-                        bool bShouldBreak = true;
-                        
-                        // Check for "would block" error which isn't a real error for non-blocking sockets
-                        if (LastError == SE_EWOULDBLOCK) 
-                        {
-                            UE_LOG(LogTemp, Verbose, TEXT("MCPServerRunnable: Socket would block, continuing..."));
-                            bShouldBreak = false;
-                            // Small sleep to prevent tight loop when no data
-                            FPlatformProcess::Sleep(0.01f);
-                        }
-                        // Check for other transient errors we might want to tolerate
-                        else if (LastError == SE_EINTR) // Interrupted system call
-                        {
-                            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Socket read interrupted, continuing..."));
-                            bShouldBreak = false;
-                        }
-                        else 
-                        {
-                            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Client disconnected or error. Last error code: %d"), LastError);
-                        }
-                        
-                        if (bShouldBreak)
-                        {
-                            break;
-                        }
-                    }
-                }
-            }
-            else
-            {
-                UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to accept client connection"));
+                Clients[Index]->Socket->Close();
+                Clients.RemoveAtSwap(Index);
+                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client removed, %d client(s) connected"), Clients.Num());
             }
         }
-        
-        // Small sleep to prevent tight loop
-        FPlatformProcess::Sleep(0.1f);
+
+        // Small sleep to prevent tight loop when no client sent anything
+        if (!bReceivedData)
+        {
+            FPlatformProcess::Sleep(Clients.Num() > 0 ? 0.001f : 0.1f);
+        }
+    }
+
+    for (const TSharedPtr<FMCPClientConnection>& Client : Clients)
+    {
+        Client->Socket->Close();
     }
+    Clients.Empty();
     
     UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Server thread stopping"));
     return 0;
 }
 
-void FMCPServerRunnable::Stop()
+void FMCPServerRunnable::AcceptPendingClients()
 {
-    bRunning = false;
-}
+    bool bPending = false;
+    while (ListenerSocket->HasPendingConnection(bPending) && bPending)
+    {
+        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client connection pending, accepting..."));
 
-void FMCPServerRunnable::Exit()
-{
+        TSharedPtr<FSocket> NewSocket = MakeShareable(ListenerSocket->Accept(TEXT("MCPClient")));
+        if (!NewSocket.IsValid())
+        {
+            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to accept client connection"));
+            return;
+        }
+
+        // Set socket options to improve connection stability
+        NewSocket->SetNonBlocking(true);
+        NewSocket->SetNoDelay(true);
+        int32 SocketBufferSize = 65536;  // 64KB buffer
+        NewSocket->SetSendBufferSize(SocketBufferSize, SocketBufferSize);
+        NewSocket->SetReceiveBufferSize(SocketBufferSize, SocketBufferSize);
+
+        TSharedPtr<FMCPClientConnection> NewClient = MakeShared<FMCPClientConnection>();
+        NewClient->Socket = NewSocket;
+        Clients.Add(NewClient);
+        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client connection accepted, %d client(s) connected"), Clients.Num());
+    }
 }
 
-void FMCPServerRunnable::HandleClientConnection(TSharedPtr<FSocket> InClientSocket)
+bool FMCPServerRunnable::ServiceClient(FMCPClientConnection& Client, bool& bOutReceivedData)
 {
-    if (!InClientSocket.IsValid())
+    uint8 Buffer[BufferSize];
+    int32 BytesRead = 0;
+    if (!Client.Socket->Recv(Buffer, BufferSize, BytesRead))
     {
-        UE_LOG(LogTemp, Error, TEXT("MCPServerRunnable: Invalid client socket passed to HandleClientConnection"));
-        return;
+        int32 LastError = (int32)ISocketSubsystem::Get()->GetLastErrorCode();
+
+        // "Would block" isn't a real error for non-blocking sockets, the client is just idle
+        if (LastError == SE_EWOULDBLOCK)
+        {
+            return true;
+        }
+        // Interrupted system call, try again on the next pass
+        if (LastError == SE_EINTR)
+        {
+            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Socket read interrupted, continuing..."));
+            return true;
+        }
+
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Client disconnected or error. Last error code: %d"), LastError);
+        return false;
     }
 
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Starting to handle client connection"));
-    
-    // Set socket options for better connection stability
-    InClientSocket->SetNonBlocking(false);
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Set socket to blocking mode"));
-    
-    // Properly read full message with timeout
-    const int32 MaxBufferSize = 4096;
-    uint8 Buffer[MaxBufferSize];
-    FString MessageBuffer;
-    
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Starting message receive loop"));
-    
-    while (bRunning && InClientSocket.IsValid())
-    {
-        // Log socket state
-        bool bIsConnected = InClientSocket->GetConnectionState() == SCS_Connected;
-        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Socket state - Connected: %s"), 
-               bIsConnected ? TEXT("true") : TEXT("false"));
-        
-        // Log pending data status before receive
-        uint32 PendingDataSize = 0;
-        bool HasPendingData = InClientSocket->HasPendingData(PendingDataSize);
-        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Before Recv - HasPendingData=%s, Size=%d"), 
-               HasPendingData ? TEXT("true") : TEXT("false"), PendingDataSize);
-        
-        // Try to receive data with timeout
-        int32 BytesRead = 0;
-        bool bReadSuccess = false;
-        
-        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Attempting to receive data..."));
-        bReadSuccess = InClientSocket->Recv(Buffer, MaxBufferSize, BytesRead, ESocketReceiveFlags::None);
-        
-        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Recv attempt complete - Success=%s, BytesRead=%d"), 
-               bReadSuccess ? TEXT("true") : TEXT("false"), BytesRead);
-        
-        if (BytesRead > 0)
+    if (BytesRead == 0)
+    {
+        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Client disconnected (zero bytes)"));
+        return false;
+    }
+
+    bOutReceivedData = true;
+    Client.ReceiveBuffer.Append(Buffer, BytesRead);
+
+    // A single Recv may carry part of a message or several messages
+    TArray<uint8> Payload;
+    bool bMalformed = false;
+    while (ExtractMessage(Client, Payload, bMalformed))
+    {
+        if (!ProcessMessage(Client, Payload))
+        {
+            return false;
+        }
+    }
+
+    if (bMalformed || Client.ReceiveBuffer.Num() > MaxMessageSize)
+    {
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Dropping client after malformed or oversized message (%d bytes buffered)"), Client.ReceiveBuffer.Num());
+        return false;
+    }
+
+    return true;
+}
+
+bool FMCPServerRunnable::ExtractMessage(FMCPClientConnection& Client, TArray<uint8>& OutPayload, bool& bOutMalformed)
+{
+    TArray<uint8>& Data = Client.ReceiveBuffer;
+    int32 PayloadStart = 0;
+    int32 PayloadLength = INDEX_NONE;
+    int32 ConsumedLength = 0;
+
+    if (Client.Framing == EMCPFraming::LengthPrefix)
+    {
+        if (Data.Num() < 4)
+        {
+            return false;
+        }
+        const uint32 Header = ReadBigEndian32(Data.GetData());
+        const uint32 Declared = Header & ~CompressedFlag;
+        if (Declared > (uint32)MaxMessageSize)
         {
-            // Log raw data for debugging
-            FString HexData;
-            for (int32 i = 0; i < FMath::Min(BytesRead, 50); ++i)
+            bOutMalformed = true;
+            return false;
+        }
+        if (Data.Num() < 4 + (int32)Declared)
+        {
+            return false;
+        }
+        if (Header & CompressedFlag)
+        {
+            // Compressed frames start with the size of the payload they inflate to
+            const uint32 UncompressedSize = Declared >= 4 ? ReadBigEndian32(Data.GetData() + 4) : 0;
+            if (Client.CompressionThreshold <= 0 || Declared < 4 || UncompressedSize > (uint32)MaxMessageSize)
             {
-                HexData += FString::Printf(TEXT("%02X "), Buffer[i]);
+                bOutMalformed = true;
+                return false;
             }
-            UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Raw data (first 50 bytes hex): %s%s"), 
-                   *HexData, BytesRead > 50 ? TEXT("...") : TEXT(""));
-            
-            // Convert and log received data
-            Buffer[BytesRead] = 0; // Null terminate
-            FString ReceivedData = UTF8_TO_TCHAR(Buffer);
-            UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Received data as string: '%s'"), *ReceivedData);
-            
-            // Append to message buffer
-            MessageBuffer.Append(ReceivedData);
-            
-            // Process complete messages (messages are terminated with newline)
-            if (MessageBuffer.Contains(TEXT("\n")))
+            OutPayload.SetNumUninitialized((int32)UncompressedSize);
+            if (!FCompression::UncompressMemory(NAME_Zlib, OutPayload.GetData(), (int32)UncompressedSize, Data.GetData() + 8, (int32)Declared - 4))
             {
-                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Newline detected in buffer, processing messages"));
-                
-                TArray<FString> Messages;
-                MessageBuffer.ParseIntoArray(Messages, TEXT("\n"), true);
-                
-                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Found %d message(s) in buffer"), Messages.Num());
-                
-                // Process all complete messages
-                for (int32 i = 0; i < Messages.Num() - 1; ++i)
+                UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to inflate compressed frame of %u bytes"), Declared);
+                bOutMalformed = true;
+                return false;
+            }
+            Data.RemoveAt(0, 4 + (int32)Declared, false);
+            return true;
+        }
+        PayloadStart = 4;
+        PayloadLength = (int32)Declared;
+        ConsumedLength = 4 + PayloadLength;
+    }
+    else if (Client.Framing == EMCPFraming::Ndjson)
+    {
+        int32 NewlineIndex = INDEX_NONE;
+        if (!Data.Find((uint8)'\n', NewlineIndex))
+        {
+            return false;
+        }
+        PayloadLength = NewlineIndex;
+        ConsumedLength = NewlineIndex + 1;
+    }
+    else
+    {
+        // Legacy: scan for the end of the top-level JSON object, skipping braces inside strings
+        int32 Depth = 0;
+        bool bInString = false;
+        bool bEscaped = false;
+        for (int32 Index = 0; Index < Data.Num(); ++Index)
+        {
+            const uint8 Byte = Data[Index];
+            if (bInString)
+            {
+                if (bEscaped)
+                {
+                    bEscaped = false;
+                }
+                else if (Byte == '\\')
                 {
-                    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Processing message %d: '%s'"), 
-                           i + 1, *Messages[i]);
-                    ProcessMessage(InClientSocket, Messages[i]);
+                    bEscaped = true;
                 }
-                
-                // Keep any incomplete message in the buffer
-                MessageBuffer = Messages.Last();
-                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Remaining buffer after processing: %s"), 
-                       *MessageBuffer);
+                else if (Byte == '"')
+                {
+                    bInString = false;
+                }
+            }
+            else if (Byte == '"')
+            {
+                bInString = true;
+            }
+            else if (Byte == '{' || Byte == '[')
+            {
+                ++Depth;
             }
-            else
+            else if ((Byte == '}' || Byte == ']') && --Depth == 0)
             {
-                UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: No complete message yet (no newline detected)"));
+                PayloadLength = Index + 1;
+                ConsumedLength = Index + 1;
+                break;
             }
         }
-        else if (!bReadSuccess)
+        if (PayloadLength == INDEX_NONE)
         {
-            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Connection closed or error occurred - Last error: %d"), 
-                   (int32)ISocketSubsystem::Get()->GetLastErrorCode());
-            break;
+            return false;
         }
-        
-        // Small sleep to prevent tight loop
-        FPlatformProcess::Sleep(0.01f);
     }
-    
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Exited message receive loop"));
+
+    OutPayload.Reset(PayloadLength);
+    OutPayload.Append(Data.GetData() + PayloadStart, PayloadLength);
+    Data.RemoveAt(0, ConsumedLength, false);
+    return true;
 }
 
-void FMCPServerRunnable::ProcessMessage(TSharedPtr<FSocket> Client, const FString& Message)
+TSharedPtr<FJsonObject> FMCPServerRunnable::DecodeMessage(const FMCPClientConnection& Client, const TArray<uint8>& Payload)
 {
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Processing message: %s"), *Message);
-    
-    // Parse message as JSON
-    TSharedPtr<FJsonObject> JsonMessage;
+    if (Client.Codec == EMCPCodec::Cbor)
+    {
+        FMemoryReader Stream(Payload);
+        FCborReader Reader(&Stream, ECborEndianness::StandardCompliant);
+        FCborContext Context;
+        if (!Reader.ReadNext(Context) || Context.MajorType() != ECborCode::Map)
+        {
+            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to parse CBOR message of %d bytes"), Payload.Num());
+            return nullptr;
+        }
+        TSharedPtr<FJsonValue> Value = ReadCborValue(Reader, Context);
+        if (!Value.IsValid())
+        {
+            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to parse CBOR message of %d bytes"), Payload.Num());
+            return nullptr;
+        }
+        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Received CBOR message (%d bytes)"), Payload.Num());
+        return Value->AsObject();
+    }
+
+    FUTF8ToTCHAR Converter((const ANSICHAR*)Payload.GetData(), Payload.Num());
+    const FString Message(Converter.Length(), Converter.Get());
+    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Received: %s"), *Message);
+
+    // Parse JSON
+    TSharedPtr<FJsonObject> JsonObject;
     TSharedRef<TJsonReader<>> Reader = TJsonReaderFactory<>::Create(Message);
-    
-    if (!FJsonSerializer::Deserialize(Reader, JsonMessage) || !JsonMessage.IsValid())
+    if (!FJsonSerializer::Deserialize(Reader, JsonObject) || !JsonObject.IsValid())
     {
-        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to parse message as JSON"));
-        return;
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to parse JSON from: %s"), *Message);
+        return nullptr;
     }
-    
-    // Extract command type and parameters using MCP protocol format
+    return JsonObject;
+}
+
+bool FMCPServerRunnable::ProcessMessage(FMCPClientConnection& Client, const TArray<uint8>& Payload)
+{
+    TSharedPtr<FJsonObject> JsonObject = DecodeMessage(Client, Payload);
+    if (!JsonObject.IsValid())
+    {
+        return true;
+    }
+
+    // Get command type
     FString CommandType;
-    TSharedPtr<FJsonObject> Params = MakeShareable(new FJsonObject());
-    
-    if (!JsonMessage->TryGetStringField(TEXT("command"), CommandType))
+    if (!JsonObject->TryGetStringField(TEXT("type"), CommandType))
     {
-        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Message missing 'command' field"));
-        return;
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Missing 'type' field in command"));
+        return true;
     }
-    
-    // Parameters are optional in MCP protocol
-    if (JsonMessage->HasField(TEXT("params")))
+
+    // Parameters are optional
+    TSharedPtr<FJsonObject> Params = MakeShared<FJsonObject>();
+    const TSharedPtr<FJsonObject>* ParamsObject = nullptr;
+    if (JsonObject->TryGetObjectField(TEXT("params"), ParamsObject))
     {
-        TSharedPtr<FJsonValue> ParamsValue = JsonMessage->TryGetField(TEXT("params"));
-        if (ParamsValue.IsValid() && ParamsValue->Type == EJson::Object)
-        {
-            Params = ParamsValue->AsObject();
-        }
+        Params = *ParamsObject;
     }
-    
-    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Executing command: %s"), *CommandType);
-    
+
+    // Requests may carry an id, echoed in the response so that clients with
+    // several commands in flight can match responses to requests
+    const TSharedPtr<FJsonValue> RequestId = JsonObject->TryGetField(TEXT("id"));
+
+    // Requests may carry a W3C traceparent; the command is then logged with it,
+    // and the response reports where the editor spent its time
+    FString TraceParent;
+    const bool bTraced = JsonObject->TryGetStringField(TEXT("traceparent"), TraceParent);
+    if (bTraced)
+    {
+        UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Command %s has traceparent %s"), *CommandType, *TraceParent);
+    }
+
     // Execute command
-    FString Response = Bridge->ExecuteCommand(CommandType, Params);
-    
-    // Send response with newline terminator
-    Response += TEXT("\n");
-    int32 BytesSent = 0;
-    
+    double QueueSeconds = 0.0;
+    double ExecuteSeconds = 0.0;
+    FString Response = Bridge->ExecuteCommand(CommandType, Params, &QueueSeconds, &ExecuteSeconds);
+
+    // A ping may carry a capability handshake; the reply still uses the current
+    // framing and codec, and the negotiated ones apply from the next message on
+    EMCPFraming NextFraming = Client.Framing;
+    EMCPCodec NextCodec = Client.Codec;
+    int32 NextCompressionThreshold = Client.CompressionThreshold;
+    if (CommandType == TEXT("ping"))
+    {
+        Response = NegotiateCapabilities(Client, Params, Response, NextFraming, NextCodec, NextCompressionThreshold);
+    }
+
+    if (bTraced)
+    {
+        Response = AttachTiming(Response, QueueSeconds, ExecuteSeconds);
+    }
+
+    if (RequestId.IsValid())
+    {
+        Response = AttachRequestId(Response, RequestId);
+    }
+
+    // Log response for debugging
     UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Sending response: %s"), *Response);
-    
-    if (!Client->Send((uint8*)TCHAR_TO_UTF8(*Response), Response.Len(), BytesSent))
+
+    const bool bSent = SendMessage(Client, Response);
+    Client.Framing = NextFraming;
+    Client.Codec = NextCodec;
+    Client.CompressionThreshold = NextCompressionThreshold;
+    return bSent;
+}
+
+FString FMCPServerRunnable::NegotiateCapabilities(const FMCPClientConnection& Client, const TSharedPtr<FJsonObject>& Params, const FString& Response, EMCPFraming& OutFraming, EMCPCodec& OutCodec, int32& OutCompressionThreshold)
+{
+    const TSharedPtr<FJsonObject>* Requested = nullptr;
+    if (!Params->TryGetObjectField(TEXT("capabilities"), Requested))
+    {
+        return Response;
+    }
+
+    TSharedPtr<FJsonObject> ResponseJson;
+    TSharedRef<TJsonReader<>> Reader = TJsonReaderFactory<>::Create(Response);
+    const TSharedPtr<FJsonObject>* ResultObject = nullptr;
+    if (!FJsonSerializer::Deserialize(Reader, ResponseJson) || !ResponseJson->TryGetObjectField(TEXT("result"), ResultObject))
+    {
+        return Response;
+    }
+
+    TSharedPtr<FJsonObject> Accepted = MakeShared<FJsonObject>();
+
+    // Pick the first framing mode from the client's preference list that we support
+    FString Framing = TEXT("legacy");
+    EMCPFraming NegotiatedFraming = Client.Framing;
+    const TArray<TSharedPtr<FJsonValue>>* FramingModes = nullptr;
+    if ((*Requested)->TryGetArrayField(TEXT("framing"), FramingModes))
+    {
+        for (const TSharedPtr<FJsonValue>& Mode : *FramingModes)
+        {
+            const FString ModeName = Mode->AsString();
+            if (ModeName == TEXT("length_prefix"))
+            {
+                NegotiatedFraming = EMCPFraming::LengthPrefix;
+                Framing = ModeName;
+                break;
+            }
+            if (ModeName == TEXT("ndjson"))
+            {
+                NegotiatedFraming = EMCPFraming::Ndjson;
+                Framing = ModeName;
+                break;
+            }
+        }
+    }
+    Accepted->SetStringField(TEXT("framing"), Framing);
+
+    // Binary payloads can only be delimited by a length prefix
+    EMCPCodec NegotiatedCodec = Client.Codec;
+    const TArray<TSharedPtr<FJsonValue>>* Codecs = nullptr;
+    if (NegotiatedFraming == EMCPFraming::LengthPrefix && (*Requested)->TryGetArrayField(TEXT("codec"), Codecs))
+    {
+        for (const TSharedPtr<FJsonValue>& Codec : *Codecs)
+        {
+            if (Codec->AsString() == TEXT("cbor"))
+            {
+                NegotiatedCodec = EMCPCodec::Cbor;
+                Accepted->SetStringField(TEXT("codec"), TEXT("cbor"));
+                break;
+            }
+        }
+    }
+
+    // Compress frames from the client's threshold on, also only with a length prefix
+    int32 NegotiatedCompressionThreshold = 0;
+    const TArray<TSharedPtr<FJsonValue>>* Compressions = nullptr;
+    int32 RequestedThreshold = 0;
+    if (NegotiatedFraming == EMCPFraming::LengthPrefix && (*Requested)->TryGetArrayField(TEXT("compression"), Compressions)
+        && (*Requested)->TryGetNumberField(TEXT("compression_threshold"), RequestedThreshold) && RequestedThreshold > 0)
+    {
+        for (const TSharedPtr<FJsonValue>& Compression : *Compressions)
+        {
+            if (Compression->AsString() == TEXT("zlib"))
+            {
+                NegotiatedCompressionThreshold = RequestedThreshold;
+                Accepted->SetStringField(TEXT("compression"), TEXT("zlib"));
+                break;
+            }
+        }
+    }
+
+    // Every response echoes its request id, so clients may pipeline commands
+    bool bMultiplex = false;
+    if ((*Requested)->TryGetBoolField(TEXT("multiplex"), bMultiplex) && bMultiplex)
+    {
+        Accepted->SetBoolField(TEXT("multiplex"), true);
+    }
+
+    (*ResultObject)->SetObjectField(TEXT("capabilities"), Accepted);
+
+    FString NegotiatedResponse;
+    TSharedRef<TJsonWriter<>> Writer = TJsonWriterFactory<>::Create(&NegotiatedResponse);
+    FJsonSerializer::Serialize(ResponseJson.ToSharedRef(), Writer);
+
+    OutFraming = NegotiatedFraming;
+    OutCodec = NegotiatedCodec;
+    OutCompressionThreshold = NegotiatedCompressionThreshold;
+    return NegotiatedResponse;
+}
+
+FString FMCPServerRunnable::AttachRequestId(const FString& Response, const TSharedPtr<FJsonValue>& RequestId)
+{
+    FString IdJson;
+    if (RequestId->Type == EJson::Number)
+    {
+        IdJson = FString::Printf(TEXT("%lld"), (int64)RequestId->AsNumber());
+    }
+    else if (RequestId->Type == EJson::String)
+    {
+        IdJson = FString::Printf(TEXT("\"%s\""), *RequestId->AsString().ReplaceCharWithEscapedChar());
+    }
+    else
+    {
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Ignoring request id that is neither a number nor a string"));
+        return Response;
+    }
+
+    return PrependField(Response, FString::Printf(TEXT("\"id\":%s"), *IdJson));
+}
+
+FString FMCPServerRunnable::AttachTiming(const FString& Response, double QueueSeconds, double ExecuteSeconds)
+{
+    return PrependField(Response, FString::Printf(
+        TEXT("\"timing\":{\"queue_ms\":%.3f,\"execute_ms\":%.3f}"), QueueSeconds * 1000.0, ExecuteSeconds * 1000.0));
+}
+
+FString FMCPServerRunnable::PrependField(const FString& Response, const FString& Field)
+{
+    // Splice the field in after the opening brace rather than re-serializing
+    // the whole response, which may be large
+    int32 OpenBrace = INDEX_NONE;
+    if (!Response.FindChar(TEXT('{'), OpenBrace))
     {
-        UE_LOG(LogTemp, Error, TEXT("MCPServerRunnable: Failed to send response"));
+        return Response;
     }
-} 
\ No newline at end of file
+    const FString Rest = Response.Mid(OpenBrace + 1).TrimStart();
+    const FString Separator = Rest.StartsWith(TEXT("}")) ? TEXT("") : TEXT(",");
+    return FString::Printf(TEXT("{%s%s%s"), *Field, *Separator, *Rest);
+}
+
+bool FMCPServerRunnable::SendMessage(FMCPClientConnection& Client, const FString& Message)
+{
+    TArray<uint8> Payload;
+    if (Client.Codec == EMCPCodec::Cbor)
+    {
+        // Command handlers produce JSON text, so re-encode it
+        TSharedPtr<FJsonValue> Value;
+        TSharedRef<TJsonReader<>> Reader = TJsonReaderFactory<>::Create(Message);
+        if (!FJsonSerializer::Deserialize(Reader, Value) || !Value.IsValid())
+        {
+            UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to re-encode response as CBOR"));
+            return false;
+        }
+        FMemoryWriter Stream(Payload);
+        FCborWriter Writer(&Stream, ECborEndianness::StandardCompliant);
+        WriteCborValue(Writer, Value);
+    }
+    else
+    {
+        // Measure the UTF-8 length rather than the character count
+        FTCHARToUTF8 Utf8Message(*Message);
+        Payload.Append((const uint8*)Utf8Message.Get(), Utf8Message.Length());
+    }
+    const int32 PayloadLength = Payload.Num();
+
+    TArray<uint8> Frame;
+    if (Client.Framing == EMCPFraming::LengthPrefix && Client.CompressionThreshold > 0 && PayloadLength >= Client.CompressionThreshold)
+    {
+        int32 CompressedLength = FCompression::CompressMemoryBound(NAME_Zlib, PayloadLength);
+        TArray<uint8> Compressed;
+        Compressed.SetNumUninitialized(CompressedLength);
+        // Payloads that don't shrink go out uncompressed
+        if (FCompression::CompressMemory(NAME_Zlib, Compressed.GetData(), CompressedLength, Payload.GetData(), PayloadLength)
+            && CompressedLength < PayloadLength)
+        {
+            Frame.Reserve(8 + CompressedLength);
+            AppendBigEndian32(Frame, CompressedFlag | (uint32)(4 + CompressedLength));
+            AppendBigEndian32(Frame, (uint32)PayloadLength);
+            Frame.Append(Compressed.GetData(), CompressedLength);
+        }
+    }
+
+    if (Frame.Num() == 0)
+    {
+        Frame.Reserve(PayloadLength + 5);
+        if (Client.Framing == EMCPFraming::LengthPrefix)
+        {
+            AppendBigEndian32(Frame, (uint32)PayloadLength);
+        }
+        Frame.Append(Payload);
+    }
+    if (Client.Framing == EMCPFraming::Ndjson)
+    {
+        Frame.Add((uint8)'\n');
+    }
+
+    if (!SendAll(*Client.Socket, Frame.GetData(), Frame.Num()))
+    {
+        UE_LOG(LogTemp, Warning, TEXT("MCPServerRunnable: Failed to send response"));
+        return false;
+    }
+
+    UE_LOG(LogTemp, Display, TEXT("MCPServerRunnable: Response sent successfully, bytes: %d"), Frame.Num());
+    return true;
+}
+
+bool FMCPServerRunnable::SendAll(FSocket& Socket, const uint8* Data, int32 Length)
+{
+    // Client sockets are non-blocking, so large responses may go out in several pieces
+    int32 Offset = 0;
+    while (Offset < Length && bRunning)
+    {
+        int32 BytesSent = 0;
+        if (!Socket.Send(Data + Offset, Length - Offset, BytesSent))
+        {
+            if ((int32)ISocketSubsystem::Get()->GetLastErrorCode() != SE_EWOULDBLOCK)
+            {
+                return false;
+            }
+            FPlatformProcess::Sleep(0.001f);
+            continue;
+        }
+        Offset += BytesSent;
+    }
+    return Offset == Length;
+}
+
+void FMCPServerRunnable::Stop()
+{
+    bRunning = false;
+}
+
+void FMCPServerRunnable::Exit()
+{
+}
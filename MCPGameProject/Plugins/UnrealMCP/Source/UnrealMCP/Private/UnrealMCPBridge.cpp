@@ -201,132 +201,239 @@ void UUnrealMCPBridge::StopServer()
 }
 
 // Execute a command received from a client
-FString UUnrealMCPBridge::ExecuteCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params)
+FString UUnrealMCPBridge::ExecuteCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params, double* OutQueueSeconds, double* OutExecuteSeconds)
 {
     UE_LOG(LogTemp, Display, TEXT("UnrealMCPBridge: Executing command: %s"), *CommandType);
     
     // Create a promise to wait for the result
     TPromise<FString> Promise;
     TFuture<FString> Future = Promise.GetFuture();
+
+    // Written on the game thread before the promise is fulfilled, read after
+    const double QueuedAt = FPlatformTime::Seconds();
+    double StartedAt = QueuedAt;
+    double FinishedAt = QueuedAt;
     
     // Queue execution on Game Thread
-    AsyncTask(ENamedThreads::GameThread, [this, CommandType, Params, Promise = MoveTemp(Promise)]() mutable
+    AsyncTask(ENamedThreads::GameThread, [this, CommandType, Params, &StartedAt, &FinishedAt, Promise = MoveTemp(Promise)]() mutable
     {
-        TSharedPtr<FJsonObject> ResponseJson = MakeShareable(new FJsonObject);
-        
-        try
+        StartedAt = FPlatformTime::Seconds();
+        TSharedPtr<FJsonObject> ResponseJson;
+        if (CommandType == TEXT("batch"))
         {
-            TSharedPtr<FJsonObject> ResultJson;
-            
-            if (CommandType == TEXT("ping"))
-            {
-                ResultJson = MakeShareable(new FJsonObject);
-                ResultJson->SetStringField(TEXT("message"), TEXT("pong"));
-            }
-            // Editor Commands (including actor manipulation)
-            else if (CommandType == TEXT("get_actors_in_level") || 
-                     CommandType == TEXT("find_actors_by_name") ||
-                     CommandType == TEXT("spawn_actor") ||
-                     CommandType == TEXT("create_actor") ||
-                     CommandType == TEXT("delete_actor") || 
-                     CommandType == TEXT("set_actor_transform") ||
-                     CommandType == TEXT("get_actor_properties") ||
-                     CommandType == TEXT("set_actor_property") ||
-                     CommandType == TEXT("spawn_blueprint_actor") ||
-                     CommandType == TEXT("focus_viewport") || 
-                     CommandType == TEXT("take_screenshot"))
-            {
-                ResultJson = EditorCommands->HandleCommand(CommandType, Params);
-            }
-            // Blueprint Commands
-            else if (CommandType == TEXT("create_blueprint") || 
-                     CommandType == TEXT("add_component_to_blueprint") || 
-                     CommandType == TEXT("set_component_property") || 
-                     CommandType == TEXT("set_physics_properties") || 
-                     CommandType == TEXT("compile_blueprint") || 
-                     CommandType == TEXT("set_blueprint_property") || 
-                     CommandType == TEXT("set_static_mesh_properties") ||
-                     CommandType == TEXT("set_pawn_properties"))
-            {
-                ResultJson = BlueprintCommands->HandleCommand(CommandType, Params);
-            }
-            // Blueprint Node Commands
-            else if (CommandType == TEXT("connect_blueprint_nodes") || 
-                     CommandType == TEXT("add_blueprint_get_self_component_reference") ||
-                     CommandType == TEXT("add_blueprint_self_reference") ||
-                     CommandType == TEXT("find_blueprint_nodes") ||
-                     CommandType == TEXT("add_blueprint_event_node") ||
-                     CommandType == TEXT("add_blueprint_input_action_node") ||
-                     CommandType == TEXT("add_blueprint_function_node") ||
-                     CommandType == TEXT("add_blueprint_get_component_node") ||
-                     CommandType == TEXT("add_blueprint_variable"))
-            {
-                ResultJson = BlueprintNodeCommands->HandleCommand(CommandType, Params);
-            }
-            // Project Commands
-            else if (CommandType == TEXT("create_input_mapping"))
-            {
-                ResultJson = ProjectCommands->HandleCommand(CommandType, Params);
-            }
-            // UMG Commands
-            else if (CommandType == TEXT("create_umg_widget_blueprint") ||
-                     CommandType == TEXT("add_text_block_to_widget") ||
-                     CommandType == TEXT("add_button_to_widget") ||
-                     CommandType == TEXT("bind_widget_event") ||
-                     CommandType == TEXT("set_text_block_binding") ||
-                     CommandType == TEXT("add_widget_to_viewport"))
-            {
-                ResultJson = UMGCommands->HandleCommand(CommandType, Params);
-            }
-            else
-            {
-                ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
-                ResponseJson->SetStringField(TEXT("error"), FString::Printf(TEXT("Unknown command: %s"), *CommandType));
-                
-                FString ResultString;
-                TSharedRef<TJsonWriter<>> Writer = TJsonWriterFactory<>::Create(&ResultString);
-                FJsonSerializer::Serialize(ResponseJson.ToSharedRef(), Writer);
-                Promise.SetValue(ResultString);
-                return;
-            }
-            
-            // Check if the result contains an error
-            bool bSuccess = true;
-            FString ErrorMessage;
-            
-            if (ResultJson->HasField(TEXT("success")))
-            {
-                bSuccess = ResultJson->GetBoolField(TEXT("success"));
-                if (!bSuccess && ResultJson->HasField(TEXT("error")))
-                {
-                    ErrorMessage = ResultJson->GetStringField(TEXT("error"));
-                }
-            }
-            
-            if (bSuccess)
-            {
-                // Set success status and include the result
-                ResponseJson->SetStringField(TEXT("status"), TEXT("success"));
-                ResponseJson->SetObjectField(TEXT("result"), ResultJson);
-            }
-            else
-            {
-                // Set error status and include the error message
-                ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
-                ResponseJson->SetStringField(TEXT("error"), ErrorMessage);
-            }
+            ResponseJson = ExecuteBatch(Params);
         }
-        catch (const std::exception& e)
+        else
         {
-            ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
-            ResponseJson->SetStringField(TEXT("error"), UTF8_TO_TCHAR(e.what()));
+            ResponseJson = DispatchCommand(CommandType, Params);
         }
         
         FString ResultString;
         TSharedRef<TJsonWriter<>> Writer = TJsonWriterFactory<>::Create(&ResultString);
         FJsonSerializer::Serialize(ResponseJson.ToSharedRef(), Writer);
+        FinishedAt = FPlatformTime::Seconds();
         Promise.SetValue(ResultString);
     });
     
-    return Future.Get();
-}
\ No newline at end of file
+    FString Result = Future.Get();
+    if (OutQueueSeconds)
+    {
+        *OutQueueSeconds = StartedAt - QueuedAt;
+    }
+    if (OutExecuteSeconds)
+    {
+        *OutExecuteSeconds = FinishedAt - StartedAt;
+    }
+    return Result;
+}
+
+// Run one command and wrap its result in a status envelope. Must be called on the game thread.
+TSharedPtr<FJsonObject> UUnrealMCPBridge::DispatchCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params)
+{
+    TSharedPtr<FJsonObject> ResponseJson = MakeShareable(new FJsonObject);
+    
+    try
+    {
+        TSharedPtr<FJsonObject> ResultJson;
+        
+        if (CommandType == TEXT("ping"))
+        {
+            ResultJson = MakeShareable(new FJsonObject);
+            ResultJson->SetStringField(TEXT("message"), TEXT("pong"));
+        }
+        // Editor Commands (including actor manipulation)
+        else if (CommandType == TEXT("get_actors_in_level") || 
+                 CommandType == TEXT("find_actors_by_name") ||
+                 CommandType == TEXT("spawn_actor") ||
+                 CommandType == TEXT("create_actor") ||
+                 CommandType == TEXT("delete_actor") || 
+                 CommandType == TEXT("set_actor_transform") ||
+                 CommandType == TEXT("get_actor_properties") ||
+                 CommandType == TEXT("set_actor_property") ||
+                 CommandType == TEXT("spawn_blueprint_actor") ||
+                 CommandType == TEXT("focus_viewport") || 
+                 CommandType == TEXT("take_screenshot"))
+        {
+            ResultJson = EditorCommands->HandleCommand(CommandType, Params);
+        }
+        // Blueprint Commands
+        else if (CommandType == TEXT("create_blueprint") || 
+                 CommandType == TEXT("add_component_to_blueprint") || 
+                 CommandType == TEXT("set_component_property") || 
+                 CommandType == TEXT("set_physics_properties") || 
+                 CommandType == TEXT("compile_blueprint") || 
+                 CommandType == TEXT("set_blueprint_property") || 
+                 CommandType == TEXT("set_static_mesh_properties") ||
+                 CommandType == TEXT("set_pawn_properties"))
+        {
+            ResultJson = BlueprintCommands->HandleCommand(CommandType, Params);
+        }
+        // Blueprint Node Commands
+        else if (CommandType == TEXT("connect_blueprint_nodes") || 
+                 CommandType == TEXT("add_blueprint_get_self_component_reference") ||
+                 CommandType == TEXT("add_blueprint_self_reference") ||
+                 CommandType == TEXT("find_blueprint_nodes") ||
+                 CommandType == TEXT("add_blueprint_event_node") ||
+                 CommandType == TEXT("add_blueprint_input_action_node") ||
+                 CommandType == TEXT("add_blueprint_function_node") ||
+                 CommandType == TEXT("add_blueprint_get_component_node") ||
+                 CommandType == TEXT("add_blueprint_variable"))
+        {
+            ResultJson = BlueprintNodeCommands->HandleCommand(CommandType, Params);
+        }
+        // Project Commands
+        else if (CommandType == TEXT("create_input_mapping"))
+        {
+            ResultJson = ProjectCommands->HandleCommand(CommandType, Params);
+        }
+        // UMG Commands
+        else if (CommandType == TEXT("create_umg_widget_blueprint") ||
+                 CommandType == TEXT("add_text_block_to_widget") ||
+                 CommandType == TEXT("add_button_to_widget") ||
+                 CommandType == TEXT("bind_widget_event") ||
+                 CommandType == TEXT("set_text_block_binding") ||
+                 CommandType == TEXT("add_widget_to_viewport"))
+        {
+            ResultJson = UMGCommands->HandleCommand(CommandType, Params);
+        }
+        else
+        {
+            ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
+            ResponseJson->SetStringField(TEXT("error"), FString::Printf(TEXT("Unknown command: %s"), *CommandType));
+            return ResponseJson;
+        }
+        
+        // Check if the result contains an error
+        bool bSuccess = true;
+        FString ErrorMessage;
+        
+        if (ResultJson->HasField(TEXT("success")))
+        {
+            bSuccess = ResultJson->GetBoolField(TEXT("success"));
+            if (!bSuccess && ResultJson->HasField(TEXT("error")))
+            {
+                ErrorMessage = ResultJson->GetStringField(TEXT("error"));
+            }
+        }
+        
+        if (bSuccess)
+        {
+            // Set success status and include the result
+            ResponseJson->SetStringField(TEXT("status"), TEXT("success"));
+            ResponseJson->SetObjectField(TEXT("result"), ResultJson);
+        }
+        else
+        {
+            // Set error status and include the error message
+            ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
+            ResponseJson->SetStringField(TEXT("error"), ErrorMessage);
+        }
+    }
+    catch (const std::exception& e)
+    {
+        ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
+        ResponseJson->SetStringField(TEXT("error"), UTF8_TO_TCHAR(e.what()));
+    }
+    
+    return ResponseJson;
+}
+
+// Run an ordered list of sub-commands in a single game thread task. Must be called on the game thread.
+TSharedPtr<FJsonObject> UUnrealMCPBridge::ExecuteBatch(const TSharedPtr<FJsonObject>& Params)
+{
+    TSharedPtr<FJsonObject> ResponseJson = MakeShareable(new FJsonObject);
+
+    const TArray<TSharedPtr<FJsonValue>>* Commands = nullptr;
+    if (!Params.IsValid() || !Params->TryGetArrayField(TEXT("commands"), Commands))
+    {
+        ResponseJson->SetStringField(TEXT("status"), TEXT("error"));
+        ResponseJson->SetStringField(TEXT("error"), TEXT("Missing 'commands' parameter"));
+        return ResponseJson;
+    }
+
+    bool bStopOnError = false;
+    Params->TryGetBoolField(TEXT("stop_on_error"), bStopOnError);
+
+    TArray<TSharedPtr<FJsonValue>> Results;
+    int32 Succeeded = 0;
+    int32 Failed = 0;
+    bool bStopped = false;
+
+    for (const TSharedPtr<FJsonValue>& CommandValue : *Commands)
+    {
+        TSharedPtr<FJsonObject> ItemResponse;
+        const TSharedPtr<FJsonObject>* CommandObject = nullptr;
+        FString SubCommandType;
+
+        if (!CommandValue->TryGetObject(CommandObject) || !(*CommandObject)->TryGetStringField(TEXT("type"), SubCommandType))
+        {
+            ItemResponse = MakeShareable(new FJsonObject);
+            ItemResponse->SetStringField(TEXT("status"), TEXT("error"));
+            ItemResponse->SetStringField(TEXT("error"), TEXT("Missing 'type' field in batch command"));
+        }
+        else if (SubCommandType == TEXT("batch"))
+        {
+            ItemResponse = MakeShareable(new FJsonObject);
+            ItemResponse->SetStringField(TEXT("status"), TEXT("error"));
+            ItemResponse->SetStringField(TEXT("error"), TEXT("Batches cannot be nested"));
+        }
+        else
+        {
+            // Parameters are optional
+            TSharedPtr<FJsonObject> SubParams = MakeShared<FJsonObject>();
+            const TSharedPtr<FJsonObject>* SubParamsObject = nullptr;
+            if ((*CommandObject)->TryGetObjectField(TEXT("params"), SubParamsObject))
+            {
+                SubParams = *SubParamsObject;
+            }
+            UE_LOG(LogTemp, Display, TEXT("UnrealMCPBridge: Executing batch command %d: %s"), Results.Num(), *SubCommandType);
+            ItemResponse = DispatchCommand(SubCommandType, SubParams);
+        }
+
+        Results.Add(MakeShared<FJsonValueObject>(ItemResponse));
+        if (ItemResponse->GetStringField(TEXT("status")) == TEXT("success"))
+        {
+            ++Succeeded;
+        }
+        else
+        {
+            ++Failed;
+            if (bStopOnError)
+            {
+                bStopped = true;
+                break;
+            }
+        }
+    }
+
+    TSharedPtr<FJsonObject> ResultJson = MakeShareable(new FJsonObject);
+    ResultJson->SetArrayField(TEXT("results"), Results);
+    ResultJson->SetNumberField(TEXT("succeeded"), Succeeded);
+    ResultJson->SetNumberField(TEXT("failed"), Failed);
+    ResultJson->SetNumberField(TEXT("skipped"), Commands->Num() - Results.Num());
+    ResultJson->SetBoolField(TEXT("stopped"), bStopped);
+
+    ResponseJson->SetStringField(TEXT("status"), TEXT("success"));
+    ResponseJson->SetObjectField(TEXT("result"), ResultJson);
+    return ResponseJson;
+}
@@ -37,6 +37,8 @@ public:
 
     // Actor utilities
     static TSharedPtr<FJsonValue> ActorToJson(AActor* Actor);
+    // Only the listed fields, plus the name; an empty set means every field
+    static TSharedPtr<FJsonValue> ActorToJson(AActor* Actor, const TSet<FString>& Fields);
     static TSharedPtr<FJsonObject> ActorToJsonObject(AActor* Actor, bool bDetailed = false);
     
     // Blueprint utilities
@@ -3,6 +3,9 @@
 #include "CoreMinimal.h"
 #include "Json.h"
 
+class AActor;
+struct FPropertyChangedEvent;
+
 /**
  * Handler class for Editor-related MCP commands
  * Handles viewport control, actor manipulation, and level management
@@ -11,6 +14,7 @@ class UNREALMCP_API FUnrealMCPEditorCommands
 {
 public:
     FUnrealMCPEditorCommands();
+    ~FUnrealMCPEditorCommands();
 
     // Handle editor commands
     TSharedPtr<FJsonObject> HandleCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params);
@@ -31,4 +35,35 @@ private:
     // Editor viewport commands
     TSharedPtr<FJsonObject> HandleFocusViewport(const TSharedPtr<FJsonObject>& Params);
     TSharedPtr<FJsonObject> HandleTakeScreenshot(const TSharedPtr<FJsonObject>& Params);
+
+    // Level change journal backing versioned get_actors_in_level queries
+    FString GetLevelVersionToken() const;
+    bool ParseLevelVersionToken(const FString& Token, uint64& OutVersion) const;
+    void MarkActorChanged(const AActor* Actor);
+    void MarkActorRemoved(const FString& ActorName);
+    void ResetLevelJournal();
+
+    // Editor delegate handlers feeding the journal
+    void OnLevelActorAdded(AActor* Actor);
+    void OnLevelActorDeleted(AActor* Actor);
+    void OnActorMoved(AActor* Actor);
+    void OnObjectPropertyChanged(UObject* Object, FPropertyChangedEvent& Event);
+    void OnMapChange(uint32 MapChangeFlags);
+
+    // Bumped by every recorded change
+    uint64 LevelVersion = 0;
+    // Regenerated when the journal restarts, so tokens from before are rejected
+    FGuid LevelEpoch;
+    // Version of the last change to each actor changed since the journal started
+    TMap<FString, uint64> ActorVersions;
+    // Names of removed actors with the version they were removed at, oldest first
+    TArray<TPair<uint64, FString>> RemovedActors;
+    // Deltas since an older version than this are answered with a full listing
+    uint64 OldestDeltaVersion = 0;
+
+    FDelegateHandle ActorAddedHandle;
+    FDelegateHandle ActorDeletedHandle;
+    FDelegateHandle ActorMovedHandle;
+    FDelegateHandle PropertyChangedHandle;
+    FDelegateHandle MapChangeHandle;
 }; 
\ No newline at end of file
@@ -4,9 +4,50 @@
 #include "HAL/Runnable.h"
 #include "Sockets.h"
 #include "Interfaces/IPv4/IPv4Address.h"
+#include "Dom/JsonObject.h"
+#include "Dom/JsonValue.h"
 
 class UUnrealMCPBridge;
 
+/**
+ * Wire framing used on a client connection.
+ * Every connection starts in Legacy mode and may switch after a ping handshake.
+ */
+enum class EMCPFraming : uint8
+{
+	/** Bare JSON documents, a message ends when its top-level object closes */
+	Legacy,
+	/** 4-byte big-endian payload length followed by the payload */
+	LengthPrefix,
+	/** One JSON document per line */
+	Ndjson
+};
+
+/**
+ * Encoding of messages inside a frame.
+ * Every connection starts with JSON and may switch after a ping handshake.
+ */
+enum class EMCPCodec : uint8
+{
+	/** UTF-8 JSON */
+	Json,
+	/** CBOR (RFC 8949), only used with LengthPrefix framing */
+	Cbor
+};
+
+/**
+ * State kept for each connected client
+ */
+struct FMCPClientConnection
+{
+	TSharedPtr<FSocket> Socket;
+	TArray<uint8> ReceiveBuffer;
+	EMCPFraming Framing = EMCPFraming::Legacy;
+	EMCPCodec Codec = EMCPCodec::Json;
+	/** Payload size from which frames are zlib-compressed, 0 unless compression was negotiated */
+	int32 CompressionThreshold = 0;
+};
+
 /**
  * Runnable class for the MCP server thread
  */
@@ -23,12 +64,22 @@ public:
 	virtual void Exit() override;
 
 protected:
-	void HandleClientConnection(TSharedPtr<FSocket> ClientSocket);
-	void ProcessMessage(TSharedPtr<FSocket> Client, const FString& Message);
+	void AcceptPendingClients();
+	bool ServiceClient(FMCPClientConnection& Client, bool& bOutReceivedData);
+	bool ExtractMessage(FMCPClientConnection& Client, TArray<uint8>& OutPayload, bool& bOutMalformed);
+	bool ProcessMessage(FMCPClientConnection& Client, const TArray<uint8>& Payload);
+	TSharedPtr<FJsonObject> DecodeMessage(const FMCPClientConnection& Client, const TArray<uint8>& Payload);
+	FString NegotiateCapabilities(const FMCPClientConnection& Client, const TSharedPtr<FJsonObject>& Params, const FString& Response, EMCPFraming& OutFraming, EMCPCodec& OutCodec, int32& OutCompressionThreshold);
+	FString AttachRequestId(const FString& Response, const TSharedPtr<FJsonValue>& RequestId);
+	FString AttachTiming(const FString& Response, double QueueSeconds, double ExecuteSeconds);
+	FString PrependField(const FString& Response, const FString& Field);
+	bool SendMessage(FMCPClientConnection& Client, const FString& Message);
+	bool SendAll(FSocket& Socket, const uint8* Data, int32 Length);
 
 private:
 	UUnrealMCPBridge* Bridge;
 	TSharedPtr<FSocket> ListenerSocket;
-	TSharedPtr<FSocket> ClientSocket;
+	// Connected clients, kept open across commands so callers can reuse them
+	TArray<TSharedPtr<FMCPClientConnection>> Clients;
 	bool bRunning;
-}; 
\ No newline at end of file
+};
@@ -41,10 +41,15 @@ public:
 	void StopServer();
 	bool IsRunning() const { return bIsRunning; }
 
-	// Command execution
-	FString ExecuteCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params);
+	// Command execution. The optional outputs get the seconds the command waited
+	// for the game thread and the seconds it ran there.
+	FString ExecuteCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params, double* OutQueueSeconds = nullptr, double* OutExecuteSeconds = nullptr);
 
 private:
+	// Game thread command execution
+	TSharedPtr<FJsonObject> DispatchCommand(const FString& CommandType, const TSharedPtr<FJsonObject>& Params);
+	TSharedPtr<FJsonObject> ExecuteBatch(const TSharedPtr<FJsonObject>& Params);
+
 	// Server state
 	bool bIsRunning;
 	TSharedPtr<FSocket> ListenerSocket;
@@ -0,0 +1,62 @@
+"""
+Connection layer for Unreal MCP.
+
+This package holds the socket-level plumbing between the MCP server and the
+Unreal plugin.
+"""
+
+from connection.admission import AdmissionLimiter, BusyError
+from connection.async_client import AsyncUnrealConnection, StreamConnection
+from connection.batch import BATCH_COMMAND, batch_params
+from connection.cache import ResponseCache
+from connection.capture import TrafficRecorder, read_capture
+from connection.codec import CODEC_CBOR, CODEC_JSON, CODEC_MSGPACK, get_codec
+from connection.compression import COMPRESSION_ZLIB, Compressor
+from connection.decoder import JsonStreamDecoder
+from connection.editors import EditorPool, parse_editors
+from connection.errors import CommandError, ConnectionClosedError, PoolTimeoutError, ProtocolError
+from connection.framing import FRAMING_LEGACY, FRAMING_LENGTH_PREFIX, FRAMING_NDJSON, FrameProtocol
+from connection.health import HealthMonitor
+from connection.multiplex import MultiplexedStream
+from connection.paging import ACTOR_FIELDS, ListingChangedError, decode_cursor, encode_cursor, listing_params
+from connection.scene import SceneMirror
+from connection.scheduler import CommandScheduler, QueueTimeoutError
+
+__all__ = [
+    "ACTOR_FIELDS",
+    "BATCH_COMMAND",
+    "CODEC_CBOR",
+    "CODEC_JSON",
+    "CODEC_MSGPACK",
+    "COMPRESSION_ZLIB",
+    "AdmissionLimiter",
+    "AsyncUnrealConnection",
+    "FRAMING_LEGACY",
+    "FRAMING_LENGTH_PREFIX",
+    "FRAMING_NDJSON",
+    "BusyError",
+    "CommandError",
+    "CommandScheduler",
+    "ConnectionClosedError",
+    "EditorPool",
+    "Compressor",
+    "FrameProtocol",
+    "HealthMonitor",
+    "JsonStreamDecoder",
+    "ListingChangedError",
+    "MultiplexedStream",
+    "ProtocolError",
+    "PoolTimeoutError",
+    "QueueTimeoutError",
+    "ResponseCache",
+    "SceneMirror",
+    "StreamConnection",
+    "TrafficRecorder",
+    "batch_params",
+    "decode_cursor",
+    "encode_cursor",
+    "get_codec",
+    "listing_params",
+    "parse_editors",
+    "read_capture",
+]
@@ -0,0 +1,261 @@
+"""
+Admission control for Unreal MCP.
+
+Every command a client sends takes a slot in front of the editors, and a
+runaway agent could otherwise queue hundreds of them behind everyone else's.
+``AdmissionLimiter`` caps the commands in flight, per MCP client session and
+across all sessions, and puts commands over a cap in a bounded FIFO queue.
+When a queue is full, or a command waits in it longer than ``timeout``, the
+command fails at once with a ``BusyError`` saying how long to wait before
+trying again, instead of hanging until it times out.
+
+A command first takes a slot of its session, then a global one. A limit of
+0 leaves that scope unlimited, and a queue of 0 rejects commands over the
+limit right away.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from connection.scheduler import current_session
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+SCOPE_SESSION = "session"
+SCOPE_GLOBAL = "global"
+
+SCOPES = (SCOPE_SESSION, SCOPE_GLOBAL)
+
+# Weight of the newest hold time in a gate's moving average
+HOLD_SMOOTHING = 0.2
+
+# Seconds a command is assumed to hold its slot before any has finished
+DEFAULT_HOLD = 1.0
+
+# Bounds of the retry-after hint, in seconds
+MIN_RETRY_AFTER = 0.1
+MAX_RETRY_AFTER = 60.0
+
+
+class BusyError(Exception):
+    """Raised when a command is turned away because too many are in flight or queued."""
+
+    def __init__(self, message: str, scope: str, retry_after: float):
+        super().__init__(message)
+        self.scope = scope
+        self.retry_after = retry_after
+
+    def response(self) -> Dict[str, Any]:
+        """Return the error response tools get instead of Unreal's."""
+        return {
+            "status": "error",
+            "error": str(self),
+            "busy": True,
+            "scope": self.scope,
+            "retry_after": self.retry_after,
+        }
+
+
+class _Gate:
+    """Slots of one scope, and the commands queued for them in arrival order."""
+
+    def __init__(self, limit: int, queue_limit: int):
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        # Moving average of the seconds a command holds a slot
+        self.hold = DEFAULT_HOLD
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and not self.waiters
+
+    @property
+    def full(self) -> bool:
+        """Whether a command arriving now would be turned away."""
+        return self.active >= self.limit and len(self.waiters) >= self.queue_limit
+
+    def retry_after(self) -> float:
+        """Seconds until a slot is likely to be free for a command arriving behind the queue."""
+        estimate = self.hold * (len(self.waiters) + 1) / self.limit
+        return round(min(max(estimate, MIN_RETRY_AFTER), MAX_RETRY_AFTER), 1)
+
+    def leave(self, held: Optional[float]):
+        """Give up a slot, handing it straight to the next queued command if there is one."""
+        if held is not None:
+            self.hold += HOLD_SMOOTHING * (held - self.hold)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionLimiter:
+    """Caps the commands in flight per session and overall, turning away commands when queues are full."""
+
+    scopes = SCOPES
+
+    def __init__(
+        self,
+        global_limit: int = 0,
+        session_limit: int = 0,
+        global_queue: int = 0,
+        session_queue: int = 0,
+        timeout: float = 30.0,
+        metrics=None,
+    ):
+        """
+        Args:
+            global_limit: Most commands in flight across all sessions, 0 for no limit
+            session_limit: Most commands in flight from one session, 0 for no limit
+            global_queue: Most commands waiting for a global slot
+            session_queue: Most commands of one session waiting for a slot of the session
+            timeout: Seconds a command may wait in a queue before it is turned away
+            metrics: Optional CommandMetrics recording rejections
+        """
+        if min(global_limit, session_limit, global_queue, session_queue) < 0:
+            raise ValueError("Admission limits and queue sizes must not be negative")
+        self.global_limit = global_limit
+        self.session_limit = session_limit
+        self.session_queue = session_queue
+        self.timeout = timeout
+        self.metrics = metrics
+        self._global = _Gate(global_limit, global_queue) if global_limit > 0 else None
+        # Gates of the sessions with commands in flight or queued
+        self._sessions: Dict[str, _Gate] = {}
+        self._admitted = {scope: 0 for scope in SCOPES}
+        self._rejected = {scope: 0 for scope in SCOPES}
+        self._timed_out = {scope: 0 for scope in SCOPES}
+        self._max_queued = {scope: 0 for scope in SCOPES}
+
+    def in_flight(self, scope: str) -> int:
+        """Number of commands holding a slot of a scope, summed over sessions for the session scope."""
+        if scope == SCOPE_GLOBAL:
+            return self._global.active if self._global is not None else 0
+        return sum(gate.active for gate in self._sessions.values())
+
+    def queued(self, scope: str) -> int:
+        """Number of commands waiting for a slot of a scope, summed over sessions for the session scope."""
+        if scope == SCOPE_GLOBAL:
+            return len(self._global.waiters) if self._global is not None else 0
+        return sum(len(gate.waiters) for gate in self._sessions.values())
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a slot of the current session, and a global one, while a command is in flight.
+
+        Raises:
+            BusyError: If a queue was full, or no slot was free within ``timeout``
+        """
+        session = current_session.get() or ""
+        gate = None
+        if self.session_limit > 0:
+            gate = self._sessions.get(session)
+            if gate is None:
+                gate = self._sessions[session] = _Gate(self.session_limit, self.session_queue)
+        # Turn the command away before it queues for its session if it would be turned away globally
+        if self._global is not None and self._global.full:
+            self._forget(session)
+            self._reject(self._global, SCOPE_GLOBAL, session)
+
+        entered: List[_Gate] = []
+        try:
+            if gate is not None:
+                await self._enter(gate, SCOPE_SESSION, session)
+                entered.append(gate)
+            if self._global is not None:
+                await self._enter(self._global, SCOPE_GLOBAL, session)
+                entered.append(self._global)
+        except BaseException:
+            for entered_gate in entered:
+                entered_gate.leave(None)
+            self._forget(session)
+            raise
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - started
+            for entered_gate in reversed(entered):
+                entered_gate.leave(held)
+            self._forget(session)
+
+    async def _enter(self, gate: _Gate, scope: str, session: str):
+        if gate.active < gate.limit and not gate.waiters:
+            gate.active += 1
+            self._admitted[scope] += 1
+            return
+        if len(gate.waiters) >= gate.queue_limit:
+            self._reject(gate, scope, session)
+
+        waiter = asyncio.get_running_loop().create_future()
+        gate.waiters.append(waiter)
+        self._max_queued[scope] = max(self._max_queued[scope], self.queued(scope))
+        try:
+            await asyncio.wait({waiter}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            if waiter.done():
+                # Handed a slot as the caller was cancelled: pass it on
+                gate.leave(None)
+            else:
+                gate.waiters.remove(waiter)
+            raise
+        if waiter.done():
+            self._admitted[scope] += 1
+            return
+
+        gate.waiters.remove(waiter)
+        self._timed_out[scope] += 1
+        self._reject(gate, scope, session, waited=True)
+
+    def _reject(self, gate: _Gate, scope: str, session: str, waited: bool = False):
+        self._rejected[scope] += 1
+        if self.metrics is not None:
+            self.metrics.admission_rejected.inc(scope)
+        retry_after = gate.retry_after()
+        who = f"session {session or '(default)'}" if scope == SCOPE_SESSION else "all sessions"
+        if waited:
+            reason = f"waited {self.timeout:.1f}s for one of the {gate.limit} slot(s) of {who}"
+        else:
+            reason = (f"{gate.active} command(s) in flight and {len(gate.waiters)} queued for {who}, "
+                      f"limit {gate.limit} in flight and {gate.queue_limit} queued")
+        message = f"Unreal MCP is busy: {reason}; retry after {retry_after:.1f}s"
+        logger.warning(message)
+        raise BusyError(message, scope, retry_after)
+
+    def _forget(self, session: str):
+        """Drop a session's gate once it has nothing in flight or queued."""
+        gate = self._sessions.get(session)
+        if gate is not None and gate.idle:
+            del self._sessions[session]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight and queued commands and counters per scope."""
+        limits = {
+            SCOPE_SESSION: (self.session_limit, self.session_queue),
+            SCOPE_GLOBAL: (self.global_limit, self._global.queue_limit if self._global is not None else 0),
+        }
+        stats = {
+            scope: {
+                "limit": limits[scope][0],
+                "queue_limit": limits[scope][1],
+                "in_flight": self.in_flight(scope),
+                "queued": self.queued(scope),
+                "max_queued": self._max_queued[scope],
+                "admitted": self._admitted[scope],
+                "rejected": self._rejected[scope],
+                "timed_out": self._timed_out[scope],
+            }
+            for scope in SCOPES
+        }
+        stats[SCOPE_SESSION]["sessions"] = len(self._sessions)
+        return stats
@@ -0,0 +1,964 @@
+"""
+Asyncio Unreal client for Unreal MCP.
+
+This module provides the connection used by the async MCP tools. Commands are
+sent over a small pool of keep-alive asyncio streams, so a slow command only
+occupies its own stream and never blocks the server's event loop.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from connection.batch import BATCH_COMMAND, BatchItem, batch_params
+from connection.cache import ResponseCache
+from connection.capture import TrafficRecorder
+from connection.codec import DEFAULT_CODEC_PREFERENCE, JSON_CODEC, available_codecs, negotiated_codec
+from connection.compression import Compressor
+from connection.errors import (
+    CommandError,
+    ConnectionClosedError,
+    HandshakeTimeoutError,
+    PoolTimeoutError,
+    ProtocolError,
+    UnavailableError,
+)
+from connection.framing import (
+    DEFAULT_FRAMING_PREFERENCE,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH_PREFIX,
+    RECEIVE_CHUNK_SIZE,
+    THREAD_OFFLOAD_SIZE,
+    CompressedFrame,
+    FrameProtocol,
+    negotiated_compression,
+    negotiated_framing,
+)
+from connection.multiplex import MultiplexedStream
+from connection.paging import check_page_version, listing_params
+from connection.resilience import AdaptiveTimeouts, CircuitBreaker, EditorQueue, QueuedCommand, RetryPolicy
+from connection.scene import SceneMirror
+from connection.scheduler import CommandScheduler, QueueTimeoutError
+from observability import KIND_CLIENT, KIND_INTERNAL, NO_SPAN, CommandMetrics, CommandTimer, Tracer, payload
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# Errors that mean a pooled stream died while idle and the command never ran
+_STALE_STREAM_ERRORS = (ConnectionClosedError, BrokenPipeError, ConnectionResetError)
+
+class StreamConnection(asyncio.BufferedProtocol):
+    """A connection to Unreal owned by an AsyncUnrealConnection.
+
+    The event loop reads straight into free space in the stream's FrameProtocol
+    buffer, and messages are split off as they complete, so a read makes no
+    intermediate bytes object.
+    """
+
+    __slots__ = ("transport", "protocol", "codec", "created_at", "last_used", "uses", "first_byte_at",
+                 "_received", "_message_start", "_eof", "_error", "_waiter", "_paused", "_drain_waiter", "_closed")
+
+    def __init__(self):
+        self.transport: Optional[asyncio.Transport] = None
+        self.protocol = FrameProtocol(FRAMING_LEGACY)
+        self.codec = JSON_CODEC
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+        # perf_counter() when the first chunk of the last message returned by receive started arriving
+        self.first_byte_at = 0.0
+        # Messages not returned by receive yet, with the time their first chunk arrived
+        self._received: Deque[Tuple[Union[bytes, CompressedFrame], float]] = deque()
+        self._message_start = 0.0
+        self._eof = False
+        self._error: Optional[BaseException] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._closed = asyncio.get_running_loop().create_future()
+
+    @property
+    def reused(self) -> bool:
+        """Whether the stream sat idle in the pool before this checkout."""
+        return self.last_used != self.created_at
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the stream can be reused without a round trip."""
+        return not (self.transport.is_closing() or self._eof or self._received)
+
+    # asyncio.BufferedProtocol callbacks
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.protocol.get_buffer(RECEIVE_CHUNK_SIZE)
+
+    def buffer_updated(self, nbytes: int):
+        now = time.perf_counter()
+        if not self.protocol.buffered:
+            self._message_start = now
+        try:
+            messages = self.protocol.buffer_updated(nbytes, inflate=False)
+        except ProtocolError as e:
+            # Raised from receive; the stream can't be read any further
+            self._error = e
+            self.transport.abort()
+            return
+        for message in messages:
+            self._received.append((message, self._message_start))
+            # Bytes left over belong to a message that started in this read
+            self._message_start = now
+        self._wake()
+
+    def eof_received(self):
+        self._eof = True
+        self._wake()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._eof = True
+        if exc is not None and self._error is None:
+            self._error = exc
+        self._wake()
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_exception(ConnectionResetError("Connection lost"))
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def send(self, payload: bytes, command: Optional[str] = None) -> int:
+        """Frame and write one message; ``command`` picks its compression level.
+
+        Payloads from THREAD_OFFLOAD_SIZE bytes are compressed on a worker thread.
+
+        Returns:
+            The size of the frame written
+        """
+        if self.protocol.compressor is not None and len(payload) >= THREAD_OFFLOAD_SIZE:
+            frame = await asyncio.to_thread(self.protocol.encode, payload, command)
+        else:
+            frame = self.protocol.encode(payload, command)
+        if self._closed.done():
+            raise ConnectionResetError("Connection lost")
+        self.transport.write(frame)
+        if self._paused:
+            # Wait for the transport's buffer to drain, like StreamWriter.drain
+            self._drain_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._drain_waiter
+            finally:
+                self._drain_waiter = None
+        return len(frame)
+
+    async def receive(self) -> bytes:
+        """Read one message using the stream's framing.
+
+        Frames inflating to THREAD_OFFLOAD_SIZE bytes or more are inflated on a worker thread.
+        """
+        while not self._received:
+            if self._error is not None:
+                raise self._error
+            if self._eof:
+                if not self.protocol.buffered:
+                    raise ConnectionClosedError("Connection closed before receiving data")
+                raise ConnectionError("Connection closed before a complete message was received")
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        message, self.first_byte_at = self._received.popleft()
+        if isinstance(message, CompressedFrame):
+            if message.size >= THREAD_OFFLOAD_SIZE:
+                message = await asyncio.to_thread(self.protocol.inflate, message)
+            else:
+                message = self.protocol.inflate(message)
+        return message
+
+    def close(self):
+        """Close the underlying transport, ignoring errors."""
+        try:
+            self.transport.close()
+        except (OSError, RuntimeError):
+            pass
+
+    async def wait_closed(self):
+        """Wait until the transport has closed."""
+        await self._closed
+
+
+class AsyncUnrealConnection:
+    """Asyncio connection to an Unreal Engine instance.
+
+    Up to ``max_size`` commands run concurrently, each on its own stream;
+    further commands wait for a stream to be released. Streams idle for longer
+    than ``idle_timeout`` are closed, but never below ``min_size``.
+
+    If the plugin agrees to ``multiplex`` in the handshake, commands are instead
+    pipelined over a single stream, up to ``max_in_flight`` at once, and their
+    responses are matched by request id.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        min_size: int = 1,
+        max_size: int = 4,
+        idle_timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        acquire_timeout: Optional[float] = 30.0,
+        response_timeout: float = 5.0,
+        framing: Sequence[str] = DEFAULT_FRAMING_PREFERENCE,
+        codecs: Sequence[str] = DEFAULT_CODEC_PREFERENCE,
+        compression: Optional[Compressor] = None,
+        multiplex: bool = True,
+        max_in_flight: int = 32,
+        cache: Optional[ResponseCache] = None,
+        scene: Optional[SceneMirror] = None,
+        metrics: Optional[CommandMetrics] = None,
+        tracer: Optional[Tracer] = None,
+        capture: Optional[TrafficRecorder] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[AdaptiveTimeouts] = None,
+        retry: Optional[RetryPolicy] = None,
+        scheduler: Optional[CommandScheduler] = None,
+    ):
+        """Initialize the connection.
+
+        Args:
+            host: Host the Unreal plugin listens on
+            port: Port the Unreal plugin listens on
+            min_size: Streams kept open while idle
+            max_size: Most streams open at once, and so most commands in flight
+            idle_timeout: Seconds after which an idle stream above ``min_size`` is closed
+            connect_timeout: Seconds allowed to open a stream and run the handshake
+            acquire_timeout: Seconds a command may wait for a free stream, None to wait forever
+            response_timeout: Seconds allowed for Unreal to answer a command, unless ``timeouts`` is set
+            framing: Framing modes to offer in the ping handshake, most preferred first.
+                     An empty sequence skips the handshake and keeps legacy framing.
+            codecs: Binary codecs to offer in the handshake, most preferred first. Codecs
+                    whose package is not installed are skipped; JSON is the fallback.
+            compression: Offer to compress frames above its threshold in both directions
+            multiplex: Offer to pipeline commands over one stream with request ids
+            max_in_flight: Most pipelined commands awaiting a response at once
+            cache: Optional cache for idempotent actor queries, invalidated by mutating commands
+            scene: Optional mirror of the level's actors that answers find_actors_by_name locally
+            metrics: Optional phase latency histograms and counters for the commands sent
+            tracer: Optional tracer recording a span per command, its phases and cache lookups
+            capture: Optional recorder writing each command sent and its response to a capture file
+            breaker: Optional circuit breaker failing commands fast while Unreal is unreachable
+            timeouts: Optional per-command response timeouts adapted to observed latency
+            retry: Optional policy retrying idempotent reads after connection failures
+            scheduler: Optional scheduler limiting the commands outstanding on Unreal and ordering them by priority
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        self.host = host
+        self.port = port
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self.response_timeout = response_timeout
+        self.framing = tuple(framing)
+        self.codecs = tuple(available_codecs(codecs))
+        self.compression = compression
+        self.multiplex = multiplex
+        self.max_in_flight = max_in_flight
+        self.cache = cache
+        self.scene = scene
+        self.metrics = metrics
+        self.tracer = tracer
+        self.capture = capture
+        self.breaker = breaker
+        self.timeouts = timeouts
+        self.retry = retry
+        self.scheduler = scheduler
+        # Set once a plugin answers the handshake without capabilities
+        self._legacy_only = False
+        # Set once a plugin agrees to echo request ids
+        self._multiplex_supported = False
+        self._mux: Optional[MultiplexedStream] = None
+        # Set when a stream fails to connect, cleared once one connects
+        self._connect_failed = False
+        # Commands sent and not yet answered, in the order the editor runs them
+        self._queue = EditorQueue()
+
+        self._idle: List[StreamConnection] = []
+        self._in_use = 0
+        self._closed = False
+        # Created lazily so the connection binds to the loop that first uses it
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._mux_lock: Optional[asyncio.Lock] = None
+        self._scene_lock: Optional[asyncio.Lock] = None
+
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._evicted = 0
+        # Streams lost to errors and not yet replaced, to tell reconnects from pool growth
+        self._lost = 0
+        self._reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        """Whether at least one stream is currently open."""
+        return self.size > 0
+
+    @property
+    def size(self) -> int:
+        """Number of streams currently open (idle, in use and multiplexed)."""
+        multiplexed = 1 if self._mux is not None and not self._mux.closed else 0
+        return len(self._idle) + self._in_use + multiplexed
+
+    @property
+    def reachable(self) -> bool:
+        """Whether the last attempt to open a stream got through, even if the handshake then timed out."""
+        return not self._connect_failed
+
+    @property
+    def outstanding(self) -> int:
+        """Number of commands sent to Unreal and not yet answered or given up on."""
+        return self._queue.depth
+
+    @property
+    def multiplexed(self) -> bool:
+        """Whether commands are pipelined over a single stream."""
+        return self.multiplex and self._multiplex_supported
+
+    def _span(self, name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = KIND_INTERNAL):
+        """Start a span under the current one, or a no-op span if tracing is off."""
+        return self.tracer.span(name, attributes, kind) if self.tracer is not None else NO_SPAN
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        return self._slots
+
+    async def connect(self) -> bool:
+        """Make sure at least one stream (``min_size`` if larger) is open."""
+        try:
+            while not self._closed and self.size < max(self.min_size, 1):
+                if self.breaker is not None and not self.breaker.allow():
+                    logger.warning(f"Not connecting to Unreal, circuit breaker open for another "
+                                   f"{self.breaker.retry_after():.1f}s")
+                    return False
+                # Count the stream while it opens so concurrent callers don't open more
+                self._in_use += 1
+                try:
+                    conn = await self._open_stream()
+                finally:
+                    self._in_use -= 1
+                self._idle.append(conn)
+                if self.breaker is not None:
+                    self.breaker.record_success()
+            return not self._closed
+        except HandshakeTimeoutError as e:
+            # Connected, so Unreal is up; its game thread is busy
+            logger.warning(f"Connected to Unreal, but it is busy: {e}")
+            self._reachable()
+            return False
+        except Exception as e:
+            logger.error(f"Failed to connect to Unreal: {e}")
+            self._connection_failed()
+            return False
+
+    async def disconnect(self):
+        """Close every idle stream. Streams in use are closed when released."""
+        while self._idle:
+            self._idle.pop().close()
+            self._discarded += 1
+
+    async def _open_stream(self) -> StreamConnection:
+        """Open a stream to the editor and negotiate its framing."""
+        with self._span("unreal.open_stream"):
+            logger.info(f"Connecting to Unreal at {self.host}:{self.port}...")
+            try:
+                transport, conn = await asyncio.wait_for(
+                    asyncio.get_running_loop().create_connection(StreamConnection, self.host, self.port),
+                    self.connect_timeout,
+                )
+            except (OSError, asyncio.TimeoutError):
+                self._connect_failed = True
+                raise
+            self._connect_failed = False
+
+            sock = transport.get_extra_info("socket")
+            if sock is not None:
+                # Set socket options for better stability
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            logger.info("Connected to Unreal Engine")
+            try:
+                # The plugin answers the handshake on the game thread, behind the commands already sent
+                await self._queue.turn().response(self._negotiate(conn), self.connect_timeout)
+            except asyncio.TimeoutError:
+                conn.close()
+                raise HandshakeTimeoutError(f"Unreal did not answer the handshake within {self.connect_timeout}s")
+            except BaseException:
+                conn.close()
+                raise
+        self._created += 1
+        reconnect = self._lost > 0
+        if reconnect:
+            self._lost -= 1
+            self._reconnects += 1
+        if self.metrics is not None:
+            self.metrics.connection_opened(reconnect)
+        return conn
+
+    async def _negotiate(self, conn: StreamConnection):
+        """Agree on a framing mode for a newly opened stream.
+
+        Older plugins answer the ping without capabilities; the stream then
+        stays in legacy mode and later streams skip the handshake.
+        """
+        if not self.framing or self._legacy_only:
+            return
+
+        capabilities: Dict[str, Any] = {"framing": list(self.framing)}
+        if self.codecs and FRAMING_LENGTH_PREFIX in self.framing:
+            capabilities["codec"] = list(self.codecs)
+        if self.compression is not None and FRAMING_LENGTH_PREFIX in self.framing:
+            capabilities["compression"] = [self.compression.algorithm]
+            capabilities["compression_threshold"] = self.compression.threshold
+        if self.multiplex:
+            capabilities["multiplex"] = True
+        handshake = {"type": "ping", "params": {"capabilities": capabilities}}
+        await conn.send(JSON_CODEC.encode(handshake))
+        response = JSON_CODEC.decode(await conn.receive())
+
+        if "capabilities" not in (response.get("result") or {}):
+            logger.info("Unreal did not negotiate capabilities, using legacy framing")
+            self._legacy_only = True
+            return
+
+        conn.protocol.switch(negotiated_framing(response, self.framing))
+        codec = negotiated_codec(response, self.codecs)
+        if codec.binary and conn.protocol.mode != FRAMING_LENGTH_PREFIX:
+            raise ConnectionError(f"Unreal accepted the {codec.name} codec without length_prefix framing")
+        conn.codec = codec
+        if negotiated_compression(response, self.compression, conn.protocol.mode):
+            conn.protocol.compressor = self.compression
+        logger.info(f"Negotiated {conn.protocol.mode} framing and {codec.name} codec with Unreal"
+                    f"{', compressing frames' if conn.protocol.compressor else ''}")
+        if self.multiplex and response["result"]["capabilities"].get("multiplex") is True:
+            if not self._multiplex_supported:
+                logger.info("Unreal echoes request ids, pipelining commands over one connection")
+            self._multiplex_supported = True
+
+    def _evict_idle(self, now: float):
+        """Close streams idle for too long, oldest first."""
+        while self._idle and self.size > self.min_size:
+            oldest = self._idle[0]
+            if now - oldest.last_used < self.idle_timeout:
+                break
+            self._idle.pop(0).close()
+            self._evicted += 1
+            logger.debug(f"Evicted idle Unreal connection after {now - oldest.last_used:.1f}s")
+
+    async def acquire(self) -> StreamConnection:
+        """Wait for a free slot and return a healthy stream, opening one if needed.
+
+        Raises:
+            PoolTimeoutError: If every stream stays busy for ``acquire_timeout`` seconds
+            OSError: If a new stream could not be connected
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            await asyncio.wait_for(self._semaphore().acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(f"No Unreal connection available after {self.acquire_timeout}s")
+
+        self._in_use += 1
+        try:
+            self._evict_idle(time.monotonic())
+            return self._pop_idle() or await self._open_stream()
+        except BaseException:
+            self._in_use -= 1
+            self._semaphore().release()
+            raise
+
+    def _pop_idle(self) -> Optional[StreamConnection]:
+        """Take the most recently used healthy idle stream, if there is one."""
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.healthy:
+                self._reused += 1
+                return conn
+            logger.debug("Discarding stale Unreal connection")
+            conn.close()
+            self._discarded += 1
+            self._lost += 1
+        return None
+
+    def release(self, conn: StreamConnection, discard: bool = False):
+        """Return a stream to the pool, or close it if ``discard`` is set."""
+        self._in_use -= 1
+        if discard or self._closed:
+            conn.close()
+            self._discarded += 1
+            if not self._closed:
+                self._lost += 1
+        else:
+            conn.uses += 1
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        self._semaphore().release()
+
+    async def send_command(self, command: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """Send a command to Unreal Engine and await the response."""
+        with self._span("unreal.send_command", {"unreal.command": command}) as span:
+            if self.scene is not None and command == "find_actors_by_name":
+                with self._span("unreal.scene_lookup") as lookup:
+                    found = await self._find_in_scene(params)
+                    lookup.set_attribute("unreal.scene.hit", found is not None)
+                if found is not None:
+                    return found
+
+            cached, generation = None, None
+            if self.cache is not None:
+                with self._span("unreal.cache_lookup") as lookup:
+                    cached, generation = self.cache.before_send(command, params)
+                    lookup.set_attribute("unreal.cache.hit", cached is not None)
+            if cached is not None:
+                logger.info(f"Serving {command} from cache")
+                return cached
+
+            if self.scene is not None and command == "get_actors_in_level" and not params and self.scene.version:
+                response = await self._list_actors_from_delta()
+                observed = True
+            else:
+                response = await self._request(command, params)
+                observed = False
+            if response is None:
+                span.set_error("No response from Unreal")
+                return None
+
+            with self._span("unreal.postprocess"):
+                if self.cache is not None:
+                    self.cache.after_send(command, params, response, generation)
+                if self.scene is not None and not observed:
+                    self.scene.observe(command, params, response)
+            return response
+
+    async def _request(self, command: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Send one command, bypassing the cache and scene mirror, and normalize its response."""
+        command_obj = {
+            "type": command,
+            "params": params or {}
+        }
+        with self._span("unreal.request", {"unreal.command": command}, KIND_CLIENT) as span:
+            if span.recording:
+                # Lets the plugin log the trace id and report its game thread timing
+                command_obj["traceparent"] = span.traceparent
+            logger.info("Sending command: %s", payload(command_obj))
+
+            timer = CommandTimer(self.metrics, command, span) if self.metrics is not None or span.recording else None
+            sent_at = time.perf_counter()
+            response = await self._send(command_obj, timer)
+            if self.capture is not None:
+                self.capture.record(command, params, response, sent_at, time.perf_counter() - sent_at)
+            if timer is not None:
+                timer.finish(error=response is None or response.get("status") == "error" or response.get("success") is False)
+                span.set_attribute("unreal.bytes_sent", timer.bytes_sent)
+                span.set_attribute("unreal.bytes_received", timer.bytes_received)
+            if response is None:
+                span.set_error("No response from Unreal")
+                return None
+            timing = response.pop("timing", None) if span.recording else None
+            if isinstance(timing, dict):
+                for key in ("queue_ms", "execute_ms"):
+                    if key in timing:
+                        span.set_attribute(f"unreal.game_thread.{key}", timing[key])
+
+            logger.info("Complete response from Unreal: %s", payload(response))
+
+            # Check for both error formats: {"status": "error", ...} and {"success": false, ...}
+            if response.get("status") == "error":
+                error_message = response.get("error") or response.get("message", "Unknown Unreal error")
+                logger.error(f"Unreal error (status=error): {error_message}")
+                if "error" not in response:
+                    response["error"] = error_message
+                span.set_error(error_message)
+            elif response.get("success") is False:
+                error_message = response.get("error") or response.get("message", "Unknown Unreal error")
+                logger.error(f"Unreal error (success=false): {error_message}")
+                response = {
+                    "status": "error",
+                    "error": error_message
+                }
+                span.set_error(error_message)
+            return response
+
+    async def _list_actors_from_delta(self) -> Optional[Dict[str, Any]]:
+        """List the level by merging the actors changed since the mirror's version into it."""
+        params = {"since": self.scene.version}
+        response = await self._request("get_actors_in_level", params)
+        if response is None or response.get("status") != "success":
+            return response
+        self.scene.observe("get_actors_in_level", params, response)
+        return {
+            "status": "success",
+            "result": {"actors": self.scene.actors(), "version": self.scene.version},
+        }
+
+    async def _find_in_scene(self, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Answer a name search from the scene mirror, seeding it first if needed.
+
+        Returns None if the mirror could not be seeded, so the search goes to Unreal.
+        """
+        pattern = (params or {}).get("pattern")
+        if not isinstance(pattern, str):
+            return None
+        if not self.scene.fresh:
+            if self._scene_lock is None:
+                self._scene_lock = asyncio.Lock()
+            async with self._scene_lock:
+                if not self.scene.fresh:
+                    response = await self.send_command("get_actors_in_level")
+                    if not self.scene.fresh and response and response.get("status") == "success":
+                        # Served from the cache, so observe() never saw it
+                        result = response.get("result") or {}
+                        self.scene.seed(result.get("actors") or [], result.get("version"))
+            if not self.scene.fresh:
+                return None
+        logger.info(f"Serving find_actors_by_name '{pattern}' from scene mirror")
+        return {"status": "success", "result": {"actors": self.scene.find(pattern)}}
+
+    async def send_batch(self, commands: Iterable[BatchItem], stop_on_error: bool = False) -> Optional[Dict[str, Any]]:
+        """Run several commands in one round trip.
+
+        Args:
+            commands: Sub-commands in order, as {"type", "params"} dicts or (type, params) pairs
+            stop_on_error: Skip the remaining sub-commands after the first failure
+
+        Returns:
+            The batch response; ``result.results`` holds one status envelope per
+            sub-command that ran, and ``result.skipped`` counts those that did not
+        """
+        return await self.send_command(BATCH_COMMAND, batch_params(commands, stop_on_error))
+
+    async def ping(self, timeout: float) -> Dict[str, Any]:
+        """Ping Unreal directly, for health checks.
+
+        The ping bypasses the cache, scheduler, circuit breaker, retries and
+        adaptive timeouts, and isn't queued behind other commands, so it
+        neither waits for nor counts toward any of them.
+
+        Raises:
+            UnavailableError: If no stream could be acquired or opened
+            asyncio.TimeoutError: If Unreal did not answer within ``timeout`` seconds
+            ConnectionError: If the stream failed before the answer arrived
+        """
+        command_obj = {"type": "ping", "params": {}}
+        if self.multiplexed:
+            try:
+                stream = await self._multiplexed_stream()
+            except Exception as e:
+                raise UnavailableError(str(e)) from e
+            return await stream.request(command_obj, timeout)
+
+        try:
+            conn = await self.acquire()
+        except Exception as e:
+            raise UnavailableError(str(e)) from e
+        try:
+            await conn.send(conn.codec.encode(command_obj), "ping")
+            response_data = await asyncio.wait_for(conn.receive(), timeout)
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+        return conn.codec.decode(response_data)
+
+    async def iter_actor_pages(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        class_filter: Optional[str] = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream the level's actors one page at a time.
+
+        Pages are offsets into the live listing, so every page must come from
+        the level version of the first one, or actors spawned or deleted in
+        between would be skipped or returned twice.
+
+        Args:
+            fields: Actor fields to return besides the name, None for all
+            class_filter: Only actors of this class or its subclasses
+            page_size: Actors requested per round trip
+
+        Raises:
+            ConnectionError: If Unreal could not be reached for a page
+            CommandError: If Unreal answered a page with an error
+            ListingChangedError: If the level changed between two pages
+        """
+        params = listing_params(fields, class_filter, limit=page_size)
+        version = None
+        while True:
+            response = await self.send_command("get_actors_in_level", params)
+            if not response:
+                raise ConnectionError("No response from Unreal Engine")
+            if response.get("status") != "success":
+                raise CommandError(response.get("error", "Unknown Unreal error"))
+            result = response.get("result") or {}
+            check_page_version(version, result)
+            version = result.get("version")
+            yield result.get("actors") or []
+            if result.get("next_offset") is None:
+                return
+            params = dict(params, offset=result["next_offset"])
+
+    def _connection_failed(self):
+        """Report a failure to connect to, or stay connected to, Unreal to the circuit breaker."""
+        if self.breaker is not None and self.breaker.record_failure() and self.metrics is not None:
+            self.metrics.breaker_opened.inc()
+
+    async def _send(self, command_obj: Dict[str, Any], timer: Optional[CommandTimer] = None) -> Optional[Dict[str, Any]]:
+        """Send one command once the circuit breaker and scheduler let it through.
+
+        Fails fast while the circuit breaker is open, then waits for a slot
+        from the scheduler. Connection failures are reported to the breaker,
+        and the latency of answered commands to the adaptive timeouts.
+        """
+        command = command_obj["type"]
+        if self.breaker is not None and not self.breaker.allow():
+            if self.metrics is not None:
+                self.metrics.rejections.inc(command)
+            return {
+                "status": "error",
+                "error": f"Unreal is unreachable, failing fast for {self.breaker.retry_after():.1f}s (circuit breaker open)"
+            }
+
+        if self.scheduler is None:
+            return await self._send_attempts(command_obj, timer)
+        try:
+            async with self.scheduler.slot(command):
+                if timer is not None:
+                    timer.lap("queue")
+                return await self._send_attempts(command_obj, timer)
+        except QueueTimeoutError as e:
+            logger.warning(str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    async def _send_attempts(self, command_obj: Dict[str, Any],
+                             timer: Optional[CommandTimer] = None) -> Optional[Dict[str, Any]]:
+        """Send one command, retrying idempotent reads after connection failures.
+
+        Only failing to connect, or Unreal resetting or closing the stream,
+        count toward the circuit breaker and are retried. A command that isn't
+        answered in time was taken by an editor that is busy, not gone, so
+        sending it again would only queue it behind itself.
+        """
+        command = command_obj["type"]
+        timeout = self.timeouts.timeout(command) if self.timeouts is not None else self.response_timeout
+        if self.metrics is not None and self.timeouts is not None:
+            self.metrics.timeout_seconds.set(timeout, command)
+        retries = self.retry.retries if self.retry is not None and self.retry.retryable(command) else 0
+
+        for attempt in range(retries + 1):
+            if attempt:
+                delay = self.retry.delay(attempt - 1)
+                logger.info(f"Retrying {command} in {delay * 1000:.0f} ms (retry {attempt} of {retries})")
+                await asyncio.sleep(delay)
+                if self.breaker is not None and not self.breaker.allow():
+                    break
+                if self.metrics is not None:
+                    self.metrics.retries.inc(command)
+
+            turn = self._queue.turn()
+            try:
+                if self.multiplexed:
+                    response = await self._send_multiplexed(command_obj, timeout, turn, timer)
+                else:
+                    response = await self._send_pooled(command_obj, timeout, turn, timer)
+            except UnavailableError as e:
+                if isinstance(e.__cause__, (PoolTimeoutError, HandshakeTimeoutError)):
+                    # Unreal is up but busy, and retrying would only queue again
+                    logger.warning(f"Unreal is busy, could not send {command}: {e}")
+                    self._reachable()
+                    return {
+                        "status": "error",
+                        "error": f"Unreal is busy: {e}"
+                    }
+                logger.error(f"Failed to connect to Unreal Engine for command: {e}")
+                response = None
+            except asyncio.TimeoutError:
+                if timer is not None:
+                    timer.timed_out = True
+                logger.warning(f"Timeout during receive after {timeout:.1f}s")
+                self._reachable()
+                return {
+                    "status": "error",
+                    "error": "Timeout receiving Unreal response"
+                }
+            except (ConnectionError, EOFError) as e:
+                logger.error(f"Connection to Unreal lost during {command}: {e}")
+                response = {
+                    "status": "error",
+                    "error": str(e)
+                }
+            except Exception as e:
+                logger.error(f"Error sending command: {e}")
+                self._reachable()
+                return {
+                    "status": "error",
+                    "error": str(e)
+                }
+            else:
+                self._reachable()
+                if self.timeouts is not None:
+                    self.timeouts.observe(command, time.perf_counter() - turn.started)
+                return response
+            self._connection_failed()
+        return response
+
+    def _reachable(self):
+        """Report to the circuit breaker that Unreal took a command, answered or not."""
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    async def _send_pooled(self, command_obj: Dict[str, Any], timeout: float, turn: QueuedCommand,
+                           timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        """Run one command on a stream of its own, strictly alternating request and response.
+
+        Raises:
+            UnavailableError: If no stream could be acquired or opened
+            asyncio.TimeoutError: If no response arrived within ``timeout`` seconds of the command's turn
+            Exception: If the command could not be sent or its response read or decoded
+        """
+        # A pooled stream may have been closed by Unreal while idle. If that
+        # happens before any response byte arrives, retry once on a new stream.
+        for attempt in range(2):
+            try:
+                conn = await self.acquire()
+            except Exception as e:
+                raise UnavailableError(str(e)) from e
+            if timer is not None:
+                timer.lap("connect")
+
+            try:
+                sent = await conn.send(conn.codec.encode(command_obj), command_obj["type"])
+                if timer is not None:
+                    timer.lap("send")
+                    timer.bytes_sent += sent
+                response_data = await turn.response(conn.receive(), timeout)
+                if timer is not None:
+                    timer.lap("ttfb", conn.first_byte_at)
+                    timer.lap("receive")
+                    timer.bytes_received += len(response_data)
+            except Exception as e:
+                self.release(conn, discard=True)
+                if attempt == 0 and conn.reused and isinstance(e, _STALE_STREAM_ERRORS):
+                    logger.warning(f"Pooled connection went stale ({e}), retrying on a new connection")
+                    continue
+                raise
+            except BaseException:
+                # Cancelled mid-command: the stream may hold a late response
+                self.release(conn, discard=True)
+                raise
+
+            self.release(conn)
+            break
+
+        logger.info(f"Received complete response ({len(response_data)} bytes)")
+        response = conn.codec.decode(response_data)
+        if timer is not None:
+            timer.lap("parse")
+        return response
+
+    async def _send_multiplexed(self, command_obj: Dict[str, Any], timeout: float, turn: QueuedCommand,
+                                timer: Optional[CommandTimer] = None) -> Dict[str, Any]:
+        """Pipeline one command over the shared multiplexed stream.
+
+        Raises:
+            UnavailableError: If the multiplexed stream could not be opened
+            asyncio.TimeoutError: If no response arrived within ``timeout`` seconds of the command's turn
+            ConnectionError: If the stream failed while the command was in flight
+        """
+        # The stream may close between commands; a command that was never sent
+        # is retried once on a new stream
+        for attempt in range(2):
+            try:
+                stream = await self._multiplexed_stream()
+            except Exception as e:
+                raise UnavailableError(str(e)) from e
+
+            try:
+                return await stream.request(command_obj, timeout, timer, turn)
+            except ConnectionClosedError as e:
+                if attempt == 0:
+                    logger.warning(f"Multiplexed connection closed ({e}), retrying on a new connection")
+                    continue
+                raise
+
+    async def _multiplexed_stream(self) -> MultiplexedStream:
+        """Return the shared multiplexed stream, replacing it if it has closed."""
+        if self._mux is not None and not self._mux.closed:
+            return self._mux
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if self._mux_lock is None:
+            self._mux_lock = asyncio.Lock()
+        async with self._mux_lock:
+            if self._mux is None or self._mux.closed:
+                if self._mux is not None:
+                    await self._mux.close()
+                    self._discarded += 1
+                    self._lost += 1
+                # Promote an idle stream from connect() before opening a new one
+                conn = self._pop_idle() or await self._open_stream()
+                self._mux = MultiplexedStream(conn, self.max_in_flight)
+        return self._mux
+
+    async def close(self):
+        """Close every stream and refuse further commands."""
+        self._closed = True
+        if self._mux is not None:
+            await self._mux.close()
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            await conn.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters for diagnostics."""
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self._created,
+            "reused": self._reused,
+            "discarded": self._discarded,
+            "evicted": self._evicted,
+            "reconnects": self._reconnects,
+            "multiplexed": self._mux.stats() if self._mux is not None else None,
+            "scene": self.scene.stats() if self.scene is not None else None,
+            "compression": self.compression.stats() if self.compression is not None else None,
+            "breaker": self.breaker.stats() if self.breaker is not None else None,
+            "timeouts": self.timeouts.stats() if self.timeouts is not None else None,
+            "scheduler": self.scheduler.stats() if self.scheduler is not None else None,
+        }
@@ -0,0 +1,41 @@
+"""
+Batch commands for Unreal MCP.
+
+A ``batch`` command carries an ordered list of sub-commands that the plugin
+runs back to back in a single game thread task, answering with one result per
+sub-command. This saves a round trip per step when building assets that take
+dozens of commands.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+BATCH_COMMAND = "batch"
+
+# A sub-command is either {"type": ..., "params": {...}} or a (type, params) pair
+BatchItem = Union[Mapping[str, Any], Tuple[str, Mapping[str, Any]]]
+
+
+def batch_params(commands: Iterable[BatchItem], stop_on_error: bool = False) -> Dict[str, Any]:
+    """Build the params of a ``batch`` command.
+
+    Raises:
+        ValueError: If a sub-command has no type or is itself a batch
+    """
+    items: List[Dict[str, Any]] = []
+    for index, item in enumerate(commands):
+        if isinstance(item, Mapping):
+            command = item.get("type") or item.get("command")
+            params = item.get("params") or {}
+        elif isinstance(item, Sequence) and not isinstance(item, str) and len(item) == 2:
+            command, params = item
+            params = params or {}
+        else:
+            raise ValueError(f"Batch command {index} must be a mapping or a (type, params) pair")
+
+        if not command or not isinstance(command, str):
+            raise ValueError(f"Batch command {index} is missing its 'type'")
+        if command == BATCH_COMMAND:
+            raise ValueError("Batches cannot be nested")
+        items.append({"type": command, "params": dict(params)})
+
+    return {"commands": items, "stop_on_error": stop_on_error}
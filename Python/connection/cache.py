@@ -0,0 +1,234 @@
+"""
+Response cache for Unreal MCP.
+
+This module memoizes idempotent actor queries so that repeated reads do not
+reach the editor's game thread. Commands sent through the same connection that
+change actors invalidate exactly the entries they can affect; anything else
+that might change the level clears the cache.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from connection.batch import BATCH_COMMAND
+from connection.codec import json_dumps
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# Read commands whose responses are cached, mapped to the param they depend on
+CACHEABLE_COMMANDS = {
+    "get_actors_in_level": None,
+    "find_actors_by_name": "pattern",
+    "get_actor_properties": "name",
+}
+
+# Commands that change a single actor, mapped to the param naming it
+ACTOR_MUTATIONS = {
+    "spawn_actor": "name",
+    "create_actor": "name",
+    "delete_actor": "name",
+    "set_actor_transform": "name",
+    "set_actor_property": "name",
+    "spawn_blueprint_actor": "actor_name",
+}
+
+# Commands that never change actors and leave the cache untouched. Every other
+# command (e.g. execute_python_script, compile_blueprint) clears it.
+READ_ONLY_COMMANDS = frozenset({
+    "ping",
+    "find_blueprint_nodes",
+    "focus_viewport",
+    "take_screenshot",
+}) | frozenset(CACHEABLE_COMMANDS)
+
+CacheKey = Tuple[str, bytes]
+
+
+class _Entry:
+    __slots__ = ("response", "expires_at", "subject")
+
+    def __init__(self, response: Dict[str, Any], expires_at: float, subject: Optional[str]):
+        self.response = response
+        self.expires_at = expires_at
+        # Lower-cased actor name or search pattern the response depends on
+        self.subject = subject
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of successful read responses with TTL expiry.
+
+    Cached responses are returned as-is, not copied; callers must not modify
+    them.
+
+    Reads that were in flight while an invalidation happened are not stored,
+    since their response may predate the change. Clients call ``before_send``
+    and ``after_send`` around every command.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: Most responses kept; the least recently used is evicted first
+            ttl: Seconds a response stays valid, guarding against edits made
+                 directly in the editor
+            clock: Monotonic time source
+        """
+        if max_entries < 1:
+            raise ValueError(f"Invalid cache size: {max_entries}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def cacheable(command: str) -> bool:
+        """Whether responses to ``command`` can be cached."""
+        return command in CACHEABLE_COMMANDS
+
+    @staticmethod
+    def _key(command: str, params: Optional[Dict[str, Any]]) -> CacheKey:
+        return command, json_dumps(params or {}, sort_keys=True)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation."""
+        return self._generation
+
+    def get(self, command: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a read, or None on a miss."""
+        key = self._key(command, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.response
+
+    def put(self, command: str, params: Optional[Dict[str, Any]], response: Dict[str, Any], generation: int):
+        """Store a successful read response received while ``generation`` was current."""
+        if response.get("status") != "success" or not self.cacheable(command):
+            return
+        subject_param = CACHEABLE_COMMANDS[command]
+        subject = str((params or {}).get(subject_param, "")).lower() if subject_param else None
+
+        key = self._key(command, params)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _Entry(response, self._clock() + self.ttl, subject)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def before_send(self, command: str, params: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """Look up a read, or invalidate what any other command may change.
+
+        Returns:
+            ``(cached response, None)`` on a hit, ``(None, generation)`` on a
+            miss, and ``(None, None)`` for commands that are not cached
+        """
+        if not self.cacheable(command):
+            self.invalidate(command, params)
+            return None, None
+        cached = self.get(command, params)
+        if cached is not None:
+            return cached, None
+        return None, self._generation
+
+    def after_send(self, command: str, params: Optional[Dict[str, Any]], response: Dict[str, Any],
+                   generation: Optional[int]):
+        """Store a read response, or invalidate again once a mutation has run.
+
+        The second invalidation drops reads that were answered while the
+        mutation was still in flight and cached the old state.
+        """
+        if generation is not None:
+            self.put(command, params, response, generation)
+        else:
+            self.invalidate(command, params)
+
+    def invalidate(self, command: str, params: Optional[Dict[str, Any]]) -> int:
+        """Drop the entries ``command`` may have made stale.
+
+        Returns:
+            The number of entries removed
+        """
+        params = params or {}
+        if command in READ_ONLY_COMMANDS:
+            return 0
+        if command == BATCH_COMMAND:
+            removed = 0
+            for item in params.get("commands") or []:
+                if isinstance(item, dict):
+                    removed += self.invalidate(item.get("type", ""), item.get("params"))
+            return removed
+        if command in ACTOR_MUTATIONS:
+            name = params.get(ACTOR_MUTATIONS[command])
+            if isinstance(name, str):
+                return self._invalidate_actor(name)
+        return self.clear()
+
+    def _invalidate_actor(self, name: str) -> int:
+        """Drop entries that can include the actor called ``name``."""
+        name = name.lower()
+        with self._lock:
+            self._generation += 1
+            stale = []
+            for key, entry in self._entries.items():
+                command = key[0]
+                if command == "get_actors_in_level":
+                    stale.append(key)
+                elif command == "find_actors_by_name" and entry.subject in name:
+                    # The plugin matches names with a case-insensitive Contains
+                    stale.append(key)
+                elif command == "get_actor_properties" and entry.subject == name:
+                    stale.append(key)
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached response(s) for actor '{name}'")
+        return len(stale)
+
+    def clear(self) -> int:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            removed = len(self._entries)
+            self._entries.clear()
+            self._invalidations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for diagnostics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
@@ -0,0 +1,157 @@
+"""
+Traffic capture for Unreal MCP.
+
+A ``TrafficRecorder`` attached to a connection writes every command sent to
+Unreal and the response that came back to a capture file, with the time it
+was sent and how long the round trip took. ``ReplayEditor`` in
+``fake_editor.py`` serves a capture back as a stand-in editor, and
+``scripts/bench/bench_replay.py`` re-runs it against the current connection
+layer, so a real session can be replayed to compare builds without Unreal.
+
+A capture is JSON lines: a header, then one exchange per line. Paths ending
+in ``.gz`` are gzip-compressed. Exchanges are encoded on the request path,
+so later changes to the response don't leak into the capture, and written by
+a background thread.
+"""
+
+import gzip
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from connection.codec import json_dumps, json_loads
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+CAPTURE_FORMAT = "unreal-mcp-capture"
+CAPTURE_VERSION = 1
+
+# Encoded exchanges waiting for the writer before new ones are dropped
+DEFAULT_QUEUE_SIZE = 10000
+
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode) if path.endswith(".gz") else open(path, mode)
+
+
+class TrafficRecorder:
+    """Appends request/response pairs to a capture file from a background thread.
+
+    If the writer falls behind by more than ``queue_size`` exchanges, new ones
+    are dropped and counted.
+    """
+
+    def __init__(self, path: str, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.path = path
+        self._started = time.perf_counter()
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(queue_size)
+        self._stats_lock = threading.Lock()
+        self.recorded = 0
+        self.dropped = 0
+        self._file = _open(path, "wb")
+        self._file.write(json_dumps({
+            "format": CAPTURE_FORMAT,
+            "version": CAPTURE_VERSION,
+            "started": time.time(),
+        }) + b"\n")
+        self._thread = threading.Thread(target=self._run, name="UnrealMCPTrafficRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, command: str, params: Optional[Dict[str, Any]], response: Optional[Dict[str, Any]],
+               sent_at: float, elapsed: float):
+        """Queue one exchange.
+
+        Args:
+            command: Command type
+            params: Command parameters as sent
+            response: Response as received, before normalization, None if there was none
+            sent_at: perf_counter() when the command was sent
+            elapsed: Seconds until the response was decoded
+        """
+        exchange = {
+            "t": round(sent_at - self._started, 6),
+            "command": command,
+            "params": params or {},
+            "response": response,
+            "elapsed": round(elapsed, 6),
+        }
+        try:
+            line = json_dumps(exchange) + b"\n"
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not capturing {command}, its exchange is not JSON serializable: {e}")
+            line = None
+        if line is not None:
+            try:
+                self._queue.put_nowait(line)
+                return
+            except queue.Full:
+                pass
+        with self._stats_lock:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                break
+            lines = [line]
+            stop = False
+            while True:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    stop = True
+                    break
+                lines.append(line)
+            self._write(lines)
+            if stop:
+                break
+        self._file.close()
+
+    def _write(self, lines):
+        try:
+            self._file.write(b"".join(lines))
+            self._file.flush()
+        except OSError as e:
+            logger.error(f"Failed to capture {len(lines)} exchange(s): {e}")
+            return
+        with self._stats_lock:
+            self.recorded += len(lines)
+
+    def close(self):
+        """Write the exchanges still queued and close the file."""
+        if self._thread.is_alive():
+            # Wait for room rather than losing the sentinel when the queue is full
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return capture counters for diagnostics."""
+        with self._stats_lock:
+            return {
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "backlog": self._queue.qsize(),
+            }
+
+
+def read_capture(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the exchanges of a capture file in the order they were recorded.
+
+    Raises:
+        ValueError: If the file is not a capture, or is from an unknown version
+    """
+    with _open(path, "rb") as capture:
+        header = json_loads(capture.readline() or b"{}")
+        if header.get("format") != CAPTURE_FORMAT:
+            raise ValueError(f"{path} is not an Unreal MCP capture")
+        if header.get("version") != CAPTURE_VERSION:
+            raise ValueError(f"Unsupported capture version {header.get('version')} in {path}")
+        for line in capture:
+            if line.strip():
+                yield json_loads(line)
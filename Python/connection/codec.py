@@ -0,0 +1,173 @@
+"""
+Wire codecs for Unreal MCP.
+
+This module defines how messages are encoded inside a frame. Every connection
+starts with JSON and can switch to a binary encoding (CBOR or MessagePack)
+that was agreed on in the ``ping`` capability handshake. Binary codecs need
+``length_prefix`` framing, since their payloads may contain any byte.
+
+The binary codecs rely on optional packages (``cbor2``, ``msgpack``) and are
+only offered when the package is installed; JSON is always available.
+
+Every JSON document the server reads or writes goes through ``json_dumps`` and
+``json_loads``, which use ``orjson`` when it is installed and the standard
+library otherwise.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from connection.errors import ProtocolError
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+CODEC_JSON = "json"
+CODEC_CBOR = "cbor"
+CODEC_MSGPACK = "msgpack"
+
+# Codecs offered in the ping handshake, most preferred first; JSON is the implicit fallback
+DEFAULT_CODEC_PREFERENCE = (CODEC_CBOR, CODEC_MSGPACK)
+
+# Library behind json_dumps and json_loads
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_SORTED_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def json_dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Serialize ``value`` as compact UTF-8 JSON.
+
+    Values orjson can't serialize, such as integers over 64 bits, fall back to
+    the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=_ORJSON_SORTED_OPTIONS if sort_keys else _ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(value, sort_keys=sort_keys, separators=(",", ":")).encode('utf-8')
+
+
+def json_loads(document: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse a JSON document.
+
+    orjson rejects ``NaN`` and ``Infinity``, which the standard library
+    accepts, so documents it fails on are retried with the latter.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(document)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(document, memoryview):
+        document = document.tobytes()
+    return json.loads(document)
+
+
+class JsonCodec:
+    """UTF-8 JSON, the encoding every connection starts with."""
+
+    name = CODEC_JSON
+    binary = False
+
+    @staticmethod
+    def encode(message: Any) -> bytes:
+        return json_dumps(message)
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        return json_loads(payload)
+
+
+class CborCodec:
+    """CBOR (RFC 8949), which the plugin reads and writes with FCborReader/FCborWriter."""
+
+    name = CODEC_CBOR
+    binary = True
+
+    @staticmethod
+    def encode(message: Any) -> bytes:
+        return cbor2.dumps(message)
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        return cbor2.loads(payload)
+
+
+class MsgpackCodec:
+    """MessagePack, for servers other than the plugin that support it."""
+
+    name = CODEC_MSGPACK
+    binary = True
+
+    @staticmethod
+    def encode(message: Any) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+JSON_CODEC = JsonCodec()
+
+# Codecs whose package is installed
+CODECS: Dict[str, Any] = {CODEC_JSON: JSON_CODEC}
+if cbor2 is not None:
+    CODECS[CODEC_CBOR] = CborCodec()
+if msgpack is not None:
+    CODECS[CODEC_MSGPACK] = MsgpackCodec()
+
+
+def get_codec(name: str):
+    """Return the codec called ``name``.
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Codec '{name}' is not available; installed codecs are {sorted(CODECS)}")
+    return codec
+
+
+def available_codecs(preference: Sequence[str]) -> List[str]:
+    """Return the codecs in ``preference`` that can be used here, in order."""
+    return [name for name in preference if name in CODECS and name != CODEC_JSON]
+
+
+def negotiated_codec(response: Optional[dict], offered: Sequence[str]):
+    """Return the codec a ping response accepted, or JSON if it named none.
+
+    Raises:
+        ProtocolError: If Unreal accepted a codec that wasn't offered. Unreal encodes
+            with it from the next message on, so falling back to JSON here would
+            leave every later message on the stream unreadable.
+    """
+    capabilities = ((response or {}).get("result") or {}).get("capabilities") or {}
+    name = capabilities.get("codec", CODEC_JSON)
+    if name != CODEC_JSON and (name not in offered or name not in CODECS):
+        raise ProtocolError(f"Unreal accepted unoffered codec {name!r}")
+    return CODECS[name]
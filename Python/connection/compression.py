@@ -0,0 +1,170 @@
+"""
+Frame compression for Unreal MCP.
+
+With ``length_prefix`` framing, a peer may zlib-compress a frame whose
+payload is at least the threshold agreed on in the ``ping`` capability
+handshake. Compressed frames set the top bit of the length header and start
+with the 4-byte big-endian size of the uncompressed payload:
+
+    [0x80000000 | 4 + len(data)] [len(payload)] [data]
+
+Payloads that don't shrink are sent uncompressed.
+"""
+
+import logging
+import threading
+import time
+import zlib
+from typing import Any, Dict, Mapping, Optional
+
+from connection.errors import ProtocolError
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+COMPRESSION_ZLIB = "zlib"
+
+# Payload size from which frames are compressed
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+# zlib level used for commands without their own level
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+class Compressor:
+    """Compresses large frames and keeps ratio and timing counters.
+
+    One compressor is shared by every connection of a client, so its
+    counters cover the whole client. Thread-safe.
+    """
+
+    algorithm = COMPRESSION_ZLIB
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        command_levels: Optional[Mapping[str, int]] = None,
+        metrics=None,
+    ):
+        """
+        Args:
+            threshold: Smallest payload, in bytes, that is compressed in either direction
+            level: zlib level, 1 (fastest) to 9 (smallest)
+            command_levels: Levels for requests of particular commands, e.g. a high
+                            level for execute_python_script scripts sent over a slow link
+            metrics: Optional CommandMetrics recording frames, bytes and time in each direction
+        """
+        if threshold < 1:
+            raise ValueError(f"Invalid compression threshold: {threshold}")
+        command_levels = dict(command_levels or {})
+        for command, command_level in [("default", level), *command_levels.items()]:
+            if not 0 <= command_level <= 9:
+                raise ValueError(f"Invalid compression level for {command}: {command_level}")
+        self.threshold = threshold
+        self.level = level
+        self.command_levels = command_levels
+        self.metrics = metrics
+        self._lock = threading.Lock()
+
+        self._compressed = 0
+        self._incompressible = 0
+        self._raw_out = 0
+        self._wire_out = 0
+        self._compress_time = 0.0
+        self._decompressed = 0
+        self._raw_in = 0
+        self._wire_in = 0
+        self._decompress_time = 0.0
+
+    def level_for(self, command: Optional[str]) -> int:
+        """Return the zlib level used for requests of ``command``."""
+        return self.command_levels.get(command, self.level) if command else self.level
+
+    def compress(self, payload: bytes, command: Optional[str] = None) -> Optional[bytes]:
+        """Return the compressed payload, or None if it should be sent as-is."""
+        if len(payload) < self.threshold:
+            return None
+        level = self.level_for(command)
+        if level == 0:
+            return None
+
+        start = time.perf_counter()
+        data = zlib.compress(payload, level)
+        elapsed = time.perf_counter() - start
+        shrunk = len(data) < len(payload)
+
+        with self._lock:
+            self._compress_time += elapsed
+            if shrunk:
+                self._compressed += 1
+                self._raw_out += len(payload)
+                self._wire_out += len(data)
+            else:
+                self._incompressible += 1
+        if self.metrics is not None:
+            self.metrics.frame_compressed(len(payload), len(data), elapsed)
+        return data if shrunk else None
+
+    def decompress(self, data: bytes, size: int, max_size: int) -> bytes:
+        """Inflate a frame that announced an uncompressed ``size``.
+
+        Raises:
+            ProtocolError: If the size is over ``max_size`` or doesn't match the data
+        """
+        if size > max_size:
+            raise ProtocolError(f"Compressed frame inflates to {size} bytes, over the {max_size} byte limit")
+
+        start = time.perf_counter()
+        try:
+            inflater = zlib.decompressobj()
+            payload = inflater.decompress(data, size)
+        except zlib.error as e:
+            raise ProtocolError(f"Corrupt compressed frame: {e}")
+        elapsed = time.perf_counter() - start
+        if len(payload) != size or inflater.unconsumed_tail:
+            raise ProtocolError(f"Compressed frame announced {size} bytes but inflated differently")
+
+        with self._lock:
+            self._decompress_time += elapsed
+            self._decompressed += 1
+            self._raw_in += size
+            self._wire_in += len(data)
+        if self.metrics is not None:
+            self.metrics.frame_inflated(size, len(data), elapsed)
+        return payload
+
+    def stats(self) -> Dict[str, Any]:
+        """Return compression counters for diagnostics."""
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "frames_compressed": self._compressed,
+                "frames_incompressible": self._incompressible,
+                "bytes_out_raw": self._raw_out,
+                "bytes_out_wire": self._wire_out,
+                "ratio_out": self._wire_out / self._raw_out if self._raw_out else 1.0,
+                "compress_seconds": self._compress_time,
+                "frames_decompressed": self._decompressed,
+                "bytes_in_raw": self._raw_in,
+                "bytes_in_wire": self._wire_in,
+                "ratio_in": self._wire_in / self._raw_in if self._raw_in else 1.0,
+                "decompress_seconds": self._decompress_time,
+            }
+
+
+def parse_command_levels(spec: str) -> Dict[str, int]:
+    """Parse ``"command=level,..."`` as used by UNREAL_COMPRESSION_LEVELS.
+
+    Raises:
+        ValueError: If an entry is not ``command=level``
+    """
+    levels = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        command, separator, level = entry.partition("=")
+        if not separator or not command.strip():
+            raise ValueError(f"Invalid compression level entry '{entry}', expected command=level")
+        levels[command.strip()] = int(level)
+    return levels
@@ -0,0 +1,201 @@
+"""
+Incremental JSON stream decoder for Unreal MCP.
+
+Legacy framing has no length header: a response ends when its top-level JSON
+object closes. This module finds that point in a single pass over the bytes,
+tracking bracket depth and string state across chunks, so the response is
+parsed exactly once instead of after every ``recv``.
+"""
+
+import re
+from typing import Any, Optional
+
+from connection.codec import json_loads
+from connection.errors import ProtocolError
+
+# Regex building blocks. Each is an unrolled loop, so matching stays linear
+# even when a pattern fails at the end of a partially received chunk.
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_FLAT_BODY = rb'[^"{}\[\]]*(?:' + _STRING + rb'[^"{}\[\]]*)*'
+_FLAT_CONTAINER = rb'(?:\[' + _FLAT_BODY + rb'\]|\{' + _FLAT_BODY + rb'\})'
+
+# Everything that leaves the nesting depth unchanged: scalars, complete strings and
+# arrays/objects that hold no further containers (e.g. transform arrays). Scanning
+# stops at the next bracket that changes depth or at the quote of an unfinished string.
+_SKIP = re.compile(_FLAT_BODY + rb'(?:' + _FLAT_CONTAINER + _FLAT_BODY + rb')*', re.DOTALL)
+# The body of a string, stopping at its closing quote or at a dangling backslash
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+
+_QUOTE = ord('"')
+_OPENERS = (ord('{'), ord('['))
+
+
+class JsonStreamDecoder:
+    """Accumulates bytes into a reusable buffer until one JSON value is complete.
+
+    Bytes are scanned at most a small constant number of times, so the cost of
+    receiving a response grows linearly with its size. Data can be pushed with
+    ``feed``, or received straight into the buffer: ``get_buffer`` returns its
+    free space to read into and ``buffer_updated`` scans the bytes read, as an
+    ``asyncio.BufferedProtocol`` does.
+    """
+
+    def __init__(self, initial_capacity: int = 64 * 1024, retain_capacity: int = 1024 * 1024,
+                 max_size: Optional[int] = None):
+        """
+        Args:
+            initial_capacity: Starting buffer size in bytes
+            retain_capacity: Buffers grown beyond this are shrunk back on reset
+            max_size: Largest message accepted before raising ProtocolError, None for no limit
+        """
+        self.initial_capacity = initial_capacity
+        self.retain_capacity = retain_capacity
+        self.max_size = max_size
+        self._buffer = bytearray(initial_capacity)
+        self._size = 0
+        self._reset_state()
+
+    def _reset_state(self):
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+        self._start = -1
+        self._end = -1
+
+    @property
+    def complete(self) -> bool:
+        """Whether a full JSON value has been buffered."""
+        return self._end >= 0
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes currently held in the buffer."""
+        return self._size
+
+    def reset(self):
+        """Drop all buffered data, keeping the buffer for reuse."""
+        self._size = 0
+        self._reset_state()
+        if len(self._buffer) > self.retain_capacity:
+            self._buffer = bytearray(self.initial_capacity)
+
+    def _reserve(self, count: int):
+        """Make room for ``count`` more bytes after the buffered data."""
+        free = len(self._buffer) - self._size
+        if free < count:
+            self._buffer += bytes(max(len(self._buffer), count - free))
+
+    def feed(self, data: bytes) -> bool:
+        """Append received bytes and return whether a value is now complete."""
+        with self.get_buffer(len(data)) as view:
+            view[:len(data)] = data
+        return self.buffer_updated(len(data))
+
+    def get_buffer(self, size_hint: int = 64 * 1024) -> memoryview:
+        """Return the free space after the buffered data, at least ``size_hint`` bytes of it.
+
+        The buffer must not be resized while the view is held, so release it
+        before the next call to ``get_buffer`` or ``feed``.
+        """
+        self._reserve(max(size_hint, 1))
+        return memoryview(self._buffer)[self._size:]
+
+    def buffer_updated(self, count: int) -> bool:
+        """Scan ``count`` bytes written into the last ``get_buffer`` view and return whether a value is complete.
+
+        Raises:
+            ProtocolError: If the bytes are not JSON, or exceed ``max_size`` without completing a value
+        """
+        self._size += count
+        self._advance()
+        if not self.complete and self.max_size is not None and self._size > self.max_size:
+            raise ProtocolError(f"Buffered {self._size} bytes without a complete message")
+        return self.complete
+
+    def take(self) -> bytes:
+        """Remove the complete value from the buffer and return its bytes.
+
+        Bytes received after the value stay buffered and are scanned as the
+        start of the next message.
+        """
+        if not self.complete:
+            raise ProtocolError("No complete JSON value buffered")
+        message = bytes(self._buffer[self._start:self._end])
+        remaining = self._size - self._end
+        if remaining:
+            self._buffer[:remaining] = self._buffer[self._end:self._size]
+            self._size = remaining
+            self._reset_state()
+            self._advance()
+        else:
+            self.reset()
+        return message
+
+    def take_all(self) -> bytes:
+        """Remove and return every buffered byte, complete or not."""
+        data = bytes(self._buffer[:self._size])
+        self.reset()
+        return data
+
+    def decode(self) -> Any:
+        """Take the complete value and parse it."""
+        return json_loads(self.take())
+
+    def _advance(self):
+        """Scan bytes received since the last call, stopping at the end of the value."""
+        if self._end >= 0:
+            return
+
+        buffer = self._buffer
+        pos = self._scan
+        end = self._size
+
+        if self._in_string:
+            pos = _STRING_BODY.match(buffer, pos, end).end()
+            if pos >= end or buffer[pos] != _QUOTE:
+                # Still inside the string; resume here once more data arrives
+                self._scan = pos
+                return
+            self._in_string = False
+            pos += 1
+
+        depth = self._depth
+        skip = _SKIP.match
+        while pos < end:
+            if depth == 0:
+                pos = _WHITESPACE.match(buffer, pos, end).end()
+                if pos >= end:
+                    break
+                if buffer[pos] not in _OPENERS:
+                    raise ProtocolError("Expected a JSON object or array")
+                self._start = pos
+                depth = 1
+                pos += 1
+                continue
+
+            pos = skip(buffer, pos, end).end()
+            if pos >= end:
+                break
+            token = buffer[pos]
+
+            if token == _QUOTE:
+                # A string the skip pattern could not close: wait for the rest
+                pos = _STRING_BODY.match(buffer, pos + 1, end).end()
+                if pos >= end or buffer[pos] != _QUOTE:
+                    self._in_string = True
+                    break
+                pos += 1
+                continue
+
+            pos += 1
+            if token in _OPENERS:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self._end = pos
+                    break
+
+        self._depth = depth
+        self._scan = pos
@@ -0,0 +1,502 @@
+"""
+Editor instances for Unreal MCP.
+
+The plugin runs every command on the game thread, one at a time, so one
+editor caps throughput. ``EditorPool`` spreads commands over several
+editors: each command goes to the ready editor with the fewest commands
+outstanding, ties going to the one with the lowest recent latency. Every
+editor has its own AsyncUnrealConnection (streams, cache, scene mirror and
+circuit breaker) and its own HealthMonitor.
+
+With session affinity, the commands of an MCP client session all go to one
+editor, so agents building separate scenes don't see or queue behind each
+other. A session is bound on its first command to an editor no other session
+holds if there is one, or else the one holding the fewest sessions. It keeps
+that editor until it ends, unless connecting to the editor fails while
+another is reachable. A busy editor, or one whose health check or commands
+time out, is never given up. When a session does move, its next command
+fails with an error saying so instead of running against another level. An
+ended session frees its editor for the next one.
+
+Editors are listed as ``host:port,...``, or in a file with one ``host:port``
+per line that is re-read whenever it changes.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from connection.admission import AdmissionLimiter, BusyError
+from connection.async_client import AsyncUnrealConnection
+from connection.batch import BATCH_COMMAND, BatchItem, batch_params
+from connection.health import HealthMonitor
+from connection.resilience import STATE_CLOSED, STATE_OPEN
+from connection.scheduler import current_session
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+DEFAULT_PORT = 55557
+
+# Weight of the newest latency in an editor's moving average
+LATENCY_SMOOTHING = 0.2
+
+Address = Tuple[str, int]
+
+
+def parse_editors(spec: str) -> List[Address]:
+    """Parse ``"host:port,..."`` (or one per line, ``#`` starting a comment) into addresses.
+
+    A missing port defaults to 55557. Duplicates are dropped.
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    addresses: List[Address] = []
+    for line in spec.splitlines():
+        for entry in line.split("#", 1)[0].split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            host, separator, port = entry.rpartition(":")
+            if not separator:
+                host, port = entry, str(DEFAULT_PORT)
+            host = host.strip("[]")
+            if not host or not port.isdigit() or not 0 < int(port) < 65536:
+                raise ValueError(f"Invalid editor entry '{entry}', expected host:port")
+            address = (host, int(port))
+            if address not in addresses:
+                addresses.append(address)
+    return addresses
+
+
+def read_editors_file(path: str) -> List[Address]:
+    """Read the editors listed in ``path``, one ``host:port`` per line.
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If an entry is malformed
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_editors(f.read())
+
+
+class EditorInstance:
+    """One editor, its connection and health, and the commands outstanding on it."""
+
+    def __init__(self, host: str, port: int, connection: AsyncUnrealConnection, monitor: HealthMonitor):
+        self.host = host
+        self.port = port
+        self.name = f"{host}:{port}"
+        self.connection = connection
+        self.monitor = monitor
+        self.outstanding = 0
+        # Set while no command is outstanding, so a removed editor can be closed as soon as it drains
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.commands = 0
+        # Sessions bound to this editor
+        self.sessions = 0
+        # Moving average of successful command latencies, None until one is seen
+        self.latency: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the last health check reached the editor and its breaker lets commands through."""
+        breaker = self.connection.breaker
+        return self.monitor.ready and (breaker is None or breaker.state != STATE_OPEN)
+
+    @property
+    def reachable(self) -> bool:
+        """Whether the last attempt to connect to the editor got through and its breaker is not open.
+
+        Unlike ``ready``, this stays true while the editor is busy or slow to
+        answer: the breaker only opens on failed connects and dropped streams.
+        """
+        return self.connection.reachable and self.breaker_state != STATE_OPEN
+
+    @property
+    def breaker_state(self) -> int:
+        breaker = self.connection.breaker
+        return breaker.state if breaker is not None else STATE_CLOSED
+
+    async def send(self, call: Callable[[AsyncUnrealConnection], Awaitable[Optional[Dict[str, Any]]]]):
+        """Run ``call`` on this editor's connection, counting it as outstanding."""
+        self.outstanding += 1
+        self.drained.clear()
+        self.commands += 1
+        started = time.perf_counter()
+        try:
+            response = await call(self.connection)
+        finally:
+            self.outstanding -= 1
+            if not self.outstanding:
+                self.drained.set()
+        if response is not None and response.get("status") != "error":
+            elapsed = time.perf_counter() - started
+            self.latency = elapsed if self.latency is None else (
+                LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * self.latency)
+        return response
+
+    def status(self) -> Dict[str, Any]:
+        """Return health, load and connection counters."""
+        status = self.monitor.status()
+        status.update({
+            "ready": self.ready,
+            "reachable": self.reachable,
+            "outstanding": self.outstanding,
+            "sessions": self.sessions,
+            "commands": self.commands,
+            "latency_ms": round(self.latency * 1000, 3) if self.latency is not None else None,
+            "pool": self.connection.stats(),
+        })
+        return status
+
+
+class EditorPool:
+    """Routes commands over several editors by session, or by least outstanding commands.
+
+    Offers the ``send_command``/``send_batch``/``connect``/``close`` interface
+    of AsyncUnrealConnection, so tools don't need to know how many editors
+    there are.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str, int], AsyncUnrealConnection],
+        editors: Sequence[Address] = (),
+        path: Optional[str] = None,
+        health_interval: float = 5.0,
+        health_timeout: float = 5.0,
+        reload_interval: float = 5.0,
+        retire_timeout: Optional[float] = 300.0,
+        affinity: bool = True,
+        limiter: Optional[AdmissionLimiter] = None,
+        metrics=None,
+    ):
+        """
+        Args:
+            factory: Creates the connection to an editor from its host and port
+            editors: Editors to start with
+            path: Optional file listing the editors, re-read every ``reload_interval`` seconds
+                  when it changes. Editors in it replace ``editors`` once it is read.
+            health_interval: Seconds between health checks of each editor, 0 to only check when asked
+            health_timeout: Seconds a health check may take before it fails
+            reload_interval: Seconds between checks of ``path`` for changes
+            retire_timeout: Seconds a removed editor may take to finish its outstanding commands
+                            before it is closed anyway, None to wait for them
+            affinity: Send the commands of a session to one editor instead of routing each command
+            limiter: Optional AdmissionLimiter capping the commands in flight per session and overall
+            metrics: Optional CommandMetrics reporting each editor's health and load
+        """
+        self.factory = factory
+        self.path = path
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.reload_interval = reload_interval
+        self.retire_timeout = retire_timeout
+        self.affinity = affinity
+        self.limiter = limiter
+        self.metrics = metrics
+        self._instances: Dict[str, EditorInstance] = {}
+        # Editor name each session is bound to
+        self._bindings: Dict[str, str] = {}
+        self.rebinds = 0
+        self._started = False
+        self._reload_task: Optional[asyncio.Task] = None
+        self._retiring: Set[asyncio.Task] = set()
+        # (mtime_ns, size) of the editors file when it was last read
+        self._file_version: Optional[Tuple[int, int]] = None
+        self.reloads = 0
+
+        listed = self._read_file() if path else None
+        if listed is not None:
+            editors = listed
+        for host, port in editors:
+            self._add(host, port)
+
+    @property
+    def instances(self) -> List[EditorInstance]:
+        return list(self._instances.values())
+
+    @property
+    def size(self) -> int:
+        """Number of streams open across every editor."""
+        return sum(instance.connection.size for instance in self._instances.values())
+
+    @property
+    def running(self) -> bool:
+        """Whether health checks run in the background."""
+        return any(instance.monitor.running for instance in self._instances.values())
+
+    @property
+    def ready(self) -> bool:
+        """Whether at least one editor is ready."""
+        return any(instance.ready for instance in self._instances.values())
+
+    @property
+    def live(self) -> bool:
+        """Whether health checks and file reloads still run on schedule."""
+        if self._reload_task is not None and self._reload_task.done():
+            return False
+        return all(instance.monitor.live for instance in self._instances.values())
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Duration of the slowest last successful health check among ready editors."""
+        latencies = [instance.monitor.latency for instance in self._instances.values()
+                     if instance.ready and instance.monitor.latency is not None]
+        return max(latencies) if latencies else None
+
+    @property
+    def breaker_state(self) -> int:
+        """The most severe circuit breaker state of any editor."""
+        return max((instance.breaker_state for instance in self._instances.values()), default=STATE_CLOSED)
+
+    def _add(self, host: str, port: int) -> EditorInstance:
+        connection = self.factory(host, port)
+        instance = EditorInstance(host, port, connection,
+                                  HealthMonitor(connection, self.health_interval, self.health_timeout))
+        self._instances[instance.name] = instance
+        if self.metrics is not None:
+            self.metrics.editor_added(instance)
+        logger.info(f"Added Unreal editor {instance.name}")
+        return instance
+
+    def _remove(self, name: str) -> EditorInstance:
+        instance = self._instances.pop(name)
+        if self.metrics is not None:
+            self.metrics.editor_removed(instance)
+        logger.info(f"Removed Unreal editor {name}, closing it after {instance.outstanding} outstanding command(s)")
+        return instance
+
+    async def _retire(self, instance: EditorInstance):
+        """Stop checking a removed editor and close it once its outstanding commands are done."""
+        await instance.monitor.stop()
+        try:
+            await asyncio.wait_for(instance.drained.wait(), self.retire_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Closing removed Unreal editor {instance.name} with {instance.outstanding} "
+                           f"command(s) still outstanding after {self.retire_timeout}s")
+        await instance.connection.close()
+
+    async def update(self, editors: Iterable[Address]):
+        """Route to ``editors`` from now on, warming up new ones and draining removed ones."""
+        wanted = {f"{host}:{port}": (host, port) for host, port in editors}
+        for name in [name for name in self._instances if name not in wanted]:
+            task = asyncio.create_task(self._retire(self._remove(name)))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+        added = [self._add(host, port) for name, (host, port) in wanted.items() if name not in self._instances]
+        if self._started and added:
+            await asyncio.gather(*(instance.monitor.start() for instance in added))
+
+    def _read_file(self) -> Optional[List[Address]]:
+        """Read the editors file if it changed since it was last read; None if it didn't or can't be read."""
+        try:
+            stat = os.stat(self.path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            if version == self._file_version:
+                return None
+            self._file_version = version
+            return read_editors_file(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read Unreal editors from {self.path}, keeping the current ones: {e}")
+            return None
+
+    async def _watch(self):
+        # Like HealthMonitor._run, also ends once stop() dropped the task, in case a cancellation was swallowed
+        while self._reload_task is asyncio.current_task():
+            await asyncio.sleep(self.reload_interval)
+            editors = self._read_file()
+            if editors is not None:
+                self.reloads += 1
+                logger.info(f"Reloaded {len(editors)} Unreal editor(s) from {self.path}")
+                await self.update(editors)
+
+    async def start(self):
+        """Warm up every editor, then check their health and watch the editors file in the background."""
+        self._started = True
+        await asyncio.gather(*(instance.monitor.start() for instance in self._instances.values()))
+        if self.path and self.reload_interval > 0 and self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._watch(), name="UnrealMCPEditorReload")
+
+    async def stop(self):
+        """Stop health checks and file reloads."""
+        self._started = False
+        task, self._reload_task = self._reload_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.gather(*(instance.monitor.stop() for instance in self._instances.values()))
+
+    async def check(self) -> bool:
+        """Check every editor once; returns whether any is ready."""
+        await asyncio.gather(*(instance.monitor.check() for instance in self._instances.values()))
+        return self.ready
+
+    @staticmethod
+    def _least_loaded(instances: List[EditorInstance]) -> Optional[EditorInstance]:
+        """Return the ready editor with the fewest outstanding commands, or any editor if none is ready."""
+        candidates = [instance for instance in instances if instance.ready] or instances
+        if not candidates:
+            return None
+        return min(candidates, key=lambda instance: (instance.outstanding, instance.latency or 0.0))
+
+    def pick(self) -> Optional[EditorInstance]:
+        """Return the editor for the next command: the current session's, or the least loaded one."""
+        return self._pick()[0]
+
+    def _pick(self) -> Tuple[Optional[EditorInstance], Optional[str]]:
+        """Return the editor for the next command, and the editor its session just moved from, if it did."""
+        session = current_session.get() if self.affinity else None
+        if session is None:
+            return self._least_loaded(list(self._instances.values())), None
+        return self._session_editor(session)
+
+    def _session_editor(self, session: str) -> Tuple[Optional[EditorInstance], Optional[str]]:
+        """Return the editor ``session`` is bound to, binding it first if needed.
+
+        A bound session only moves when its editor can't be connected to and
+        another editor can; the name of the editor it left is returned with
+        the new one.
+        """
+        bound = self._instances.get(self._bindings.get(session, ""))
+        instances = list(self._instances.values())
+        if bound is not None and (bound.reachable or not any(instance.reachable for instance in instances)):
+            return bound, None
+
+        # Prefer editors no session holds, then those holding the fewest
+        candidates = ([instance for instance in instances if instance.ready]
+                      or [instance for instance in instances if instance.reachable] or instances)
+        if not candidates:
+            return None, None
+        fewest = min(instance.sessions for instance in candidates)
+        target = self._least_loaded([instance for instance in candidates if instance.sessions == fewest])
+        if bound is not None:
+            bound.sessions -= 1
+        moved_from = self._bindings.get(session)
+        if moved_from is not None:
+            self.rebinds += 1
+            logger.warning(f"Editor {moved_from} of session {session} is unreachable, "
+                           f"moving the session to {target.name}")
+        else:
+            logger.info(f"Bound session {session} to editor {target.name}")
+        target.sessions += 1
+        self._bindings[session] = target.name
+        return target, moved_from
+
+    @contextmanager
+    def session(self, session: Optional[str] = None) -> Iterator[str]:
+        """Route the commands sent within this context as one session, and free its editor at the end."""
+        session = session or uuid.uuid4().hex
+        token = current_session.set(session)
+        try:
+            yield session
+        finally:
+            current_session.reset(token)
+            self.end_session(session)
+
+    def end_session(self, session: str):
+        """Unbind a session, so its editor can be given to the next one."""
+        name = self._bindings.pop(session, None)
+        instance = self._instances.get(name or "")
+        if instance is not None:
+            instance.sessions -= 1
+            logger.info(f"Session {session} ended, editor {name} now holds {instance.sessions} session(s)")
+
+    async def connect(self) -> bool:
+        """Make sure at least one editor has an open stream."""
+        instances = list(self._instances.values())
+        if any(instance.connection.connected for instance in instances):
+            return True
+        results = await asyncio.gather(*(instance.connection.connect() for instance in instances))
+        return any(results)
+
+    async def send_command(self, command: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """Send a command to the least loaded editor and await the response.
+
+        With a limiter, a command over the in-flight limits waits for a slot, or gets a
+        busy error with ``"busy": True`` and a ``retry_after`` hint in seconds when its
+        queue is full.
+        """
+        if self.limiter is None:
+            return await self._route(command, params)
+        try:
+            async with self.limiter.admit():
+                return await self._route(command, params)
+        except BusyError as e:
+            return e.response()
+
+    async def _route(self, command: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Send a command to the editor ``pick`` chooses.
+
+        A command whose session was just moved to another editor is not sent:
+        that editor holds a different level, so the session gets an error
+        telling it to look at the scene again first.
+        """
+        instance, moved_from = self._pick()
+        if instance is None:
+            return {
+                "status": "error",
+                "error": "No Unreal editor configured"
+            }
+        if moved_from is not None:
+            return {
+                "status": "error",
+                "error": f"Unreal editor {moved_from} is unreachable, so this session moved to editor "
+                         f"{instance.name}, which holds a different level. {command} was not sent; "
+                         f"read the scene again before continuing.",
+                "rebound": True,
+                "editor": instance.name,
+            }
+        if self.metrics is not None:
+            self.metrics.editor_commands.inc(instance.name)
+        return await instance.send(lambda connection: connection.send_command(command, params))
+
+    async def send_batch(self, commands: Iterable[BatchItem], stop_on_error: bool = False) -> Optional[Dict[str, Any]]:
+        """Run several commands in one round trip on the least loaded editor."""
+        return await self.send_command(BATCH_COMMAND, batch_params(commands, stop_on_error))
+
+    async def close(self):
+        """Stop monitoring and close every editor's connection."""
+        await self.stop()
+        await asyncio.gather(*(instance.connection.close() for instance in self._instances.values()))
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    def status(self) -> Dict[str, Any]:
+        """Return overall readiness and liveness, and the status of each editor."""
+        return {
+            "ready": self.ready,
+            "live": self.live,
+            "sessions": len(self._bindings),
+            "admission": self.limiter.stats() if self.limiter is not None else None,
+            "editors": {name: instance.status() for name, instance in self._instances.items()},
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return each editor's load and connection counters."""
+        return {
+            "reloads": self.reloads,
+            "sessions": len(self._bindings),
+            "rebinds": self.rebinds,
+            "admission": self.limiter.stats() if self.limiter is not None else None,
+            "editors": {
+                name: {
+                    "outstanding": instance.outstanding,
+                    "sessions": instance.sessions,
+                    "commands": instance.commands,
+                    "latency": instance.latency,
+                    "connection": instance.connection.stats(),
+                }
+                for name, instance in self._instances.items()
+            },
+        }
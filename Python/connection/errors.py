@@ -0,0 +1,27 @@
+"""
+Errors raised by the Unreal MCP connection layer.
+"""
+
+
+class ProtocolError(Exception):
+    """Raised when bytes on the wire do not follow the negotiated framing."""
+
+
+class ConnectionClosedError(ConnectionError):
+    """Raised when Unreal closes the socket before sending any response data."""
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection became available in time."""
+
+
+class HandshakeTimeoutError(TimeoutError):
+    """Raised when Unreal accepted a connection but did not answer the handshake in time."""
+
+
+class UnavailableError(ConnectionError):
+    """Raised when no stream to Unreal could be acquired or opened, so a command was never sent."""
+
+
+class CommandError(Exception):
+    """Raised when Unreal answers a command with an error response."""
@@ -0,0 +1,254 @@
+"""
+Message framing for Unreal MCP.
+
+This module defines how messages are delimited on a socket to the Unreal
+plugin. Every connection starts in legacy mode (bare JSON documents) and can
+switch to an explicit framing after a ``ping`` capability handshake.
+"""
+
+import logging
+import struct
+from typing import List, Optional, Union
+
+from connection.compression import Compressor
+from connection.decoder import JsonStreamDecoder
+from connection.errors import ProtocolError
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# Bare JSON documents; a message is complete when it parses
+FRAMING_LEGACY = "legacy"
+# 4-byte big-endian payload length followed by the payload
+FRAMING_LENGTH_PREFIX = "length_prefix"
+# One JSON document per line
+FRAMING_NDJSON = "ndjson"
+
+FRAMING_MODES = (FRAMING_LEGACY, FRAMING_LENGTH_PREFIX, FRAMING_NDJSON)
+
+# Modes offered in the ping handshake, most preferred first
+DEFAULT_FRAMING_PREFERENCE = (FRAMING_LENGTH_PREFIX, FRAMING_NDJSON)
+
+# Largest frame accepted; matches MaxMessageSize in the plugin
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_LENGTH_HEADER = struct.Struct(">I")
+
+# Bytes a receive buffer is sized for, and the capacity it is shrunk back to after a larger frame
+RECEIVE_CHUNK_SIZE = 64 * 1024
+RETAIN_CAPACITY = 1024 * 1024
+
+# Set in the length header of a compressed frame, see connection.compression
+COMPRESSED_FLAG = 0x80000000
+
+# Payload size from which async clients compress and inflate frames on a worker
+# thread, so a multi-megabyte frame doesn't stall every other session
+THREAD_OFFLOAD_SIZE = 256 * 1024
+
+
+class CompressedFrame:
+    """A compressed frame split off the stream, not inflated yet."""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, data: bytes):
+        if len(data) < _LENGTH_HEADER.size:
+            raise ProtocolError("Compressed frame is missing its size")
+        self.data = data
+        # Size of the payload once inflated, as announced by the frame
+        (self.size,) = _LENGTH_HEADER.unpack_from(data)
+
+
+class FrameProtocol:
+    """Frames outgoing messages and splits incoming bytes for one socket.
+
+    Incoming data is pushed with ``feed`` as it arrives, or received in place:
+    ``get_buffer`` returns free space in the receive buffer and
+    ``buffer_updated`` splits off the messages the bytes read into it complete.
+    """
+
+    def __init__(self, mode: str = FRAMING_LEGACY):
+        if mode not in FRAMING_MODES:
+            raise ValueError(f"Unknown framing mode: {mode}")
+        self.mode = mode
+        # Set once the peer agreed to compression; only used with length_prefix framing
+        self.compressor: Optional[Compressor] = None
+        # Bytes of length_prefix and ndjson messages are _buffer[_start:_size]
+        self._buffer = bytearray(RECEIVE_CHUNK_SIZE)
+        self._start = 0
+        self._size = 0
+        # Where the search for the next newline resumes with ndjson framing
+        self._scan = 0
+        # Legacy messages are delimited by scanning the JSON itself
+        self._decoder = JsonStreamDecoder(max_size=MAX_FRAME_SIZE)
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes not yet returned as a message."""
+        return self._size - self._start + self._decoder.buffered
+
+    def encode(self, payload: bytes, command: Optional[str] = None) -> bytes:
+        """Wrap an encoded message for the wire.
+
+        ``command`` picks the compression level, if compression was negotiated.
+        """
+        if self.mode == FRAMING_LENGTH_PREFIX:
+            if len(payload) > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Frame of {len(payload)} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+            compressed = self.compressor.compress(payload, command) if self.compressor is not None else None
+            if compressed is not None:
+                header = _LENGTH_HEADER.pack(COMPRESSED_FLAG | (_LENGTH_HEADER.size + len(compressed)))
+                return header + _LENGTH_HEADER.pack(len(payload)) + compressed
+            return _LENGTH_HEADER.pack(len(payload)) + payload
+        if self.mode == FRAMING_NDJSON:
+            return payload + b"\n"
+        return payload
+
+    def feed(self, data: bytes, inflate: bool = True) -> List[Union[bytes, CompressedFrame]]:
+        """Buffer received bytes and return every message they complete.
+
+        With ``inflate`` False, compressed frames are returned as CompressedFrame
+        for the caller to ``inflate`` where it suits it.
+        """
+        with self.get_buffer(len(data)) as view:
+            view[:len(data)] = data
+        return self.buffer_updated(len(data), inflate)
+
+    def get_buffer(self, size_hint: int = RECEIVE_CHUNK_SIZE) -> memoryview:
+        """Return free space in the receive buffer to read at least ``size_hint`` bytes into.
+
+        With length_prefix framing, the space also fits the rest of a frame whose
+        header has arrived, so a large frame is read without growing the buffer
+        chunk by chunk. Release the view before calling ``get_buffer`` or ``feed`` again.
+        """
+        size_hint = max(size_hint, 1)
+        if self.mode == FRAMING_LEGACY:
+            return self._decoder.get_buffer(size_hint)
+
+        buffer = self._buffer
+        remaining = self._size - self._start
+        if self._start:
+            if remaining:
+                buffer[:remaining] = buffer[self._start:self._size]
+            elif len(buffer) > RETAIN_CAPACITY:
+                # Don't hold on to the memory of a large frame once it was taken
+                buffer = self._buffer = bytearray(RECEIVE_CHUNK_SIZE)
+            self._scan = max(self._scan - self._start, 0)
+            self._start, self._size = 0, remaining
+
+        needed = size_hint
+        if self.mode == FRAMING_LENGTH_PREFIX and remaining >= _LENGTH_HEADER.size:
+            (header,) = _LENGTH_HEADER.unpack_from(buffer)
+            needed = max(needed, _LENGTH_HEADER.size + min(header & ~COMPRESSED_FLAG, MAX_FRAME_SIZE) - remaining)
+        free = len(buffer) - self._size
+        if free < needed:
+            buffer += bytes(max(len(buffer), needed - free))
+        return memoryview(buffer)[self._size:]
+
+    def buffer_updated(self, count: int, inflate: bool = True) -> List[Union[bytes, CompressedFrame]]:
+        """Take ``count`` bytes written into the last ``get_buffer`` view and return every message they complete.
+
+        With ``inflate`` False, compressed frames are returned as CompressedFrame
+        for the caller to ``inflate`` where it suits it.
+
+        Raises:
+            ProtocolError: If the bytes break the framing or a message exceeds MAX_FRAME_SIZE
+        """
+        if self.mode == FRAMING_LEGACY:
+            messages = []
+            self._decoder.buffer_updated(count)
+            while self._decoder.complete:
+                messages.append(self._decoder.take())
+            return messages
+
+        self._size += count
+        messages = []
+        while True:
+            message = self._next_message()
+            if message is None:
+                break
+            if inflate and isinstance(message, CompressedFrame):
+                message = self.inflate(message)
+            messages.append(message)
+        if self._size - self._start > MAX_FRAME_SIZE:
+            raise ProtocolError(f"Buffered {self._size - self._start} bytes without a complete message")
+        return messages
+
+    def switch(self, mode: str):
+        """Change framing mode, carrying over bytes already buffered."""
+        if mode not in FRAMING_MODES:
+            raise ValueError(f"Unknown framing mode: {mode}")
+        if mode == self.mode:
+            return
+        carried = self._decoder.take_all() if self.mode == FRAMING_LEGACY and self._decoder.buffered else b""
+        self.mode = mode
+        if carried:
+            with self.get_buffer(len(carried)) as view:
+                view[:len(carried)] = carried
+            self._size += len(carried)
+
+    def _next_message(self) -> Optional[Union[bytes, CompressedFrame]]:
+        """Pop one complete length-prefixed or newline-delimited message, if there is one."""
+        buffer = self._buffer
+        start = self._start
+        if self.mode == FRAMING_LENGTH_PREFIX:
+            if self._size - start < _LENGTH_HEADER.size:
+                return None
+            (header,) = _LENGTH_HEADER.unpack_from(buffer, start)
+            length = header & ~COMPRESSED_FLAG
+            if length > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+            end = start + _LENGTH_HEADER.size + length
+            if self._size < end:
+                return None
+            message = bytes(buffer[start + _LENGTH_HEADER.size:end])
+            self._start = end
+            return CompressedFrame(message) if header & COMPRESSED_FLAG else message
+
+        newline = buffer.find(b"\n", max(start, self._scan), self._size)
+        if newline < 0:
+            self._scan = self._size
+            return None
+        message = bytes(buffer[start:newline])
+        self._start = self._scan = newline + 1
+        return message
+
+    def inflate(self, frame: CompressedFrame) -> bytes:
+        """Return the payload of a compressed frame."""
+        if self.compressor is None:
+            raise ProtocolError("Received a compressed frame without negotiating compression")
+        return self.compressor.decompress(memoryview(frame.data)[_LENGTH_HEADER.size:], frame.size, MAX_FRAME_SIZE)
+
+
+def negotiated_compression(response: Optional[dict], compressor: Optional[Compressor], mode: str) -> bool:
+    """Return whether a ping response accepted the offered compression.
+
+    Raises:
+        ProtocolError: If Unreal accepted an algorithm that wasn't offered, or
+            compression without length_prefix framing. Unreal compresses its large
+            frames from then on, which this end could not read.
+    """
+    capabilities = ((response or {}).get("result") or {}).get("capabilities") or {}
+    accepted = capabilities.get("compression")
+    if accepted is None:
+        return False
+    if compressor is None or accepted != compressor.algorithm:
+        raise ProtocolError(f"Unreal accepted unoffered compression {accepted!r}")
+    if mode != FRAMING_LENGTH_PREFIX:
+        raise ProtocolError(f"Unreal accepted {accepted!r} compression with {mode} framing")
+    return True
+
+
+def negotiated_framing(response: Optional[dict], offered) -> str:
+    """Return the framing mode a ping response accepted, or legacy if it named none.
+
+    Raises:
+        ProtocolError: If Unreal accepted a mode that wasn't offered. Unreal has
+            already switched the stream to it, so falling back to legacy here would
+            leave the two ends reading each other's frames differently.
+    """
+    capabilities = ((response or {}).get("result") or {}).get("capabilities") or {}
+    mode = capabilities.get("framing", FRAMING_LEGACY)
+    if mode != FRAMING_LEGACY and mode not in offered:
+        raise ProtocolError(f"Unreal accepted unoffered framing {mode!r}")
+    return mode
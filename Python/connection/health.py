@@ -0,0 +1,196 @@
+"""
+Health monitoring for Unreal MCP.
+
+``HealthMonitor`` warms the connection up when the server starts, so the
+first tool call doesn't pay for connecting and negotiating, and then pings
+Unreal in the background. Each check tops the pool back up to ``min_size``,
+so streams lost while the editor was down are reopened before a tool call
+needs them. When the editor comes back after an outage, the read cache and
+scene mirror are dropped, since the level may have changed or been reloaded.
+
+The ping goes straight to the editor with a fixed timeout, past the
+scheduler, circuit breaker, retries and adaptive timeouts. The plugin answers
+it on the game thread, behind any command already running there, so a ping
+that isn't answered while commands are outstanding means the editor is busy,
+and the check still counts as ready.
+
+- ready: the last check reached Unreal, or found it busy with our commands
+- live: the server's event loop is still running checks on schedule
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from connection.async_client import AsyncUnrealConnection
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+
+class HealthMonitor:
+    """Pings Unreal every ``interval`` seconds and keeps the pool filled."""
+
+    def __init__(self, connection: AsyncUnrealConnection, interval: float = 5.0, timeout: float = 5.0):
+        """
+        Args:
+            connection: Connection to warm up, check and refill
+            interval: Seconds between checks, 0 to only check when asked
+            timeout: Seconds a check may take before it counts as failed
+        """
+        self.connection = connection
+        self.interval = interval
+        self.timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+        self._ready = False
+        # monotonic() of the last check started and the last one that reached Unreal
+        self._last_check = 0.0
+        self._last_ok = 0.0
+        self._latency: Optional[float] = None
+        self._last_error: Optional[str] = None
+        # Whether the last check found the editor busy with outstanding commands
+        self._busy = False
+        self._failures = 0
+        self.checks = 0
+        self.failed = 0
+        self.recoveries = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the last check reached Unreal or found it busy."""
+        return self._ready
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Seconds the last successful check took, None before one succeeded."""
+        return self._latency
+
+    @property
+    def running(self) -> bool:
+        """Whether checks run in the background."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def live(self) -> bool:
+        """Whether checks still run on schedule; always true without a background task."""
+        if self._task is None:
+            return True
+        if self._task.done():
+            return False
+        # A check may take up to timeout, and starts interval after the previous one ended
+        return time.monotonic() - self._last_check <= 2 * self.interval + self.timeout
+
+    async def start(self):
+        """Run the first check, then keep checking in the background if ``interval`` is set."""
+        if await self.check():
+            logger.info(f"Warmed up {self.connection.size} connection(s) to Unreal "
+                        f"in {self._latency * 1000:.1f} ms")
+        else:
+            logger.warning(f"Unreal not reachable at startup: {self._last_error}")
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="UnrealMCPHealthMonitor")
+
+    async def stop(self):
+        """Stop the background checks."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        # Also ends once stop() dropped the task: on Python 3.11, wait_for swallows a
+        # cancellation that arrives as the ping completes, and the check then returns
+        while self._task is asyncio.current_task():
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                # Keep monitoring; a bug in one check must not stop liveness reporting
+                logger.error(f"Health check failed unexpectedly: {e}")
+
+    async def check(self) -> bool:
+        """Refill the pool and ping Unreal once.
+
+        Returns:
+            Whether Unreal answered, or is busy with commands outstanding on it
+        """
+        self._last_check = started = time.monotonic()
+        self.checks += 1
+        busy = False
+        try:
+            error = await asyncio.wait_for(self._probe(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"No answer within {self.timeout:.1f}s"
+            # The ping queued behind commands still running on the game thread
+            busy = self.connection.outstanding > 0
+
+        self._busy = busy
+        if error is None or busy:
+            if error is None:
+                self._latency = time.monotonic() - started
+            else:
+                logger.info(f"Unreal is busy with {self.connection.outstanding} command(s), "
+                            f"health ping not answered within {self.timeout:.1f}s")
+            self._last_ok = time.monotonic()
+            self._last_error = None
+            if not self._ready:
+                self._recovered()
+            self._failures = 0
+            self._ready = True
+            return True
+
+        self.failed += 1
+        self._failures += 1
+        self._last_error = error
+        if self._ready:
+            logger.warning(f"Unreal health check failed: {error}")
+        self._ready = False
+        return False
+
+    async def _probe(self) -> Optional[str]:
+        """Return None if Unreal answered a ping, or why it didn't."""
+        if not await self.connection.connect():
+            return "Could not connect to Unreal"
+        try:
+            response = await self.connection.ping(self.timeout)
+        except asyncio.TimeoutError:
+            raise
+        except (ConnectionError, OSError) as e:
+            return f"Ping failed: {e}"
+        if response.get("status") == "error":
+            return response.get("error") or "Ping failed"
+        return None
+
+    def _recovered(self):
+        """Drop state that may be stale after Unreal was unreachable."""
+        if self.checks == 1:
+            return
+        self.recoveries += 1
+        logger.info(f"Unreal is reachable again after {self._failures} failed check(s), "
+                    f"pool refilled to {self.connection.size} connection(s)")
+        if self.connection.cache is not None:
+            self.connection.cache.clear()
+        if self.connection.scene is not None:
+            self.connection.scene.invalidate()
+
+    def status(self) -> Dict[str, Any]:
+        """Return readiness, liveness and the last check's outcome."""
+        now = time.monotonic()
+        return {
+            "ready": self.ready,
+            "busy": self._busy,
+            "live": self.live,
+            "unreal": f"{self.connection.host}:{self.connection.port}",
+            "last_check_age": round(now - self._last_check, 3) if self._last_check else None,
+            "last_ok_age": round(now - self._last_ok, 3) if self._last_ok else None,
+            "latency_ms": round(self._latency * 1000, 3) if self._latency is not None else None,
+            "last_error": self._last_error,
+            "consecutive_failures": self._failures,
+            "checks": self.checks,
+            "failed": self.failed,
+            "recoveries": self.recoveries,
+        }
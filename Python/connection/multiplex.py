@@ -0,0 +1,156 @@
+"""
+Response demultiplexing for Unreal MCP.
+
+When the plugin agrees to ``multiplex`` in the ping handshake, every request
+carries an ``id`` that the plugin echoes in its response. Many commands can
+then be in flight on one stream, and responses are matched to requests by id
+in whatever order they arrive.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from connection.errors import ConnectionClosedError
+from observability import detach
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+
+class MultiplexedStream:
+    """Pipelines requests over one stream and routes responses by id.
+
+    A background task reads every response and resolves the future of the
+    matching request. A request that times out only forgets its id, so a late
+    response is dropped instead of being taken for the answer to another
+    command, and the stream stays usable.
+    """
+
+    def __init__(self, conn, max_in_flight: int = 32):
+        """
+        Args:
+            conn: A negotiated StreamConnection; the multiplexer takes ownership of it
+            max_in_flight: Most requests awaiting a response at once
+        """
+        self.conn = conn
+        self.max_in_flight = max_in_flight
+        self._ids = itertools.count(1)
+        self._waiters: Dict[int, asyncio.Future] = {}
+        # First byte, received and parsed times and size of responses not yet picked up by their request
+        self._timings: Dict[int, Tuple[float, float, float, int]] = {}
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._error: Optional[BaseException] = None
+        self._sent = 0
+        self._late = 0
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream has failed or been closed."""
+        return self._error is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._waiters)
+
+    async def request(self, command_obj: Dict[str, Any], timeout: Optional[float], timer=None,
+                      turn=None) -> Dict[str, Any]:
+        """Send one command and await its parsed response.
+
+        ``timer`` is an optional CommandTimer that gets the command's phase timings.
+        ``turn`` is an optional QueuedCommand; ``timeout`` then starts once the
+        commands queued ahead of it on the editor are done.
+
+        Raises:
+            ConnectionClosedError: If the stream was already closed, so the command was never sent
+            ConnectionError: If the stream failed while the command was in flight
+            asyncio.TimeoutError: If no response arrived within ``timeout`` seconds
+        """
+        async with self._slots:
+            if self._error is not None:
+                raise ConnectionClosedError(f"Multiplexed stream closed: {self._error}")
+
+            if timer is not None:
+                timer.lap("connect")
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[request_id] = future
+            try:
+                sent = await self.conn.send(self.conn.codec.encode(dict(command_obj, id=request_id)), command_obj["type"])
+                self._sent += 1
+                if timer is not None:
+                    timer.lap("send")
+                    timer.bytes_sent += sent
+                if turn is not None:
+                    response = await turn.response(future, timeout)
+                else:
+                    response = await asyncio.wait_for(future, timeout)
+                timings = self._timings.get(request_id)
+                if timer is not None and timings is not None:
+                    first_byte_at, received_at, parsed_at, size = timings
+                    timer.lap("ttfb", first_byte_at)
+                    timer.lap("receive", received_at)
+                    timer.lap("parse", parsed_at)
+                    timer.bytes_received += size
+                return response
+            finally:
+                self._waiters.pop(request_id, None)
+                self._timings.pop(request_id, None)
+
+    async def _read_loop(self):
+        """Resolve pending requests as their responses arrive."""
+        # The task was created by whichever command opened the stream
+        detach()
+        try:
+            while True:
+                data = await self.conn.receive()
+                received_at = time.perf_counter()
+                response = self.conn.codec.decode(data)
+                request_id = response.pop("id", None)
+                future = self._waiters.get(request_id)
+                if future is None:
+                    # The request timed out or was cancelled before its response arrived
+                    self._late += 1
+                    logger.warning(f"Dropping response for unknown request id {request_id}")
+                    continue
+                if not future.done():
+                    self._timings[request_id] = (self.conn.first_byte_at, received_at, time.perf_counter(), len(data))
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            self._fail(ConnectionClosedError("Multiplexed stream closed"))
+            raise
+        except Exception as e:
+            self._fail(e)
+
+    def _fail(self, error: BaseException):
+        """Mark the stream dead and fail every request still in flight."""
+        if self._error is None:
+            self._error = error
+            if self._waiters:
+                logger.warning(f"Unreal connection lost with {len(self._waiters)} command(s) in flight: {error}")
+        self.conn.close()
+        # The commands were sent, so they may have run: never report them as stale
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"Connection lost while awaiting response: {error}"))
+
+    async def close(self):
+        """Stop the reader task and close the stream."""
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+        await self.conn.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return multiplexer counters for diagnostics."""
+        return {
+            "in_flight": len(self._waiters),
+            "sent": self._sent,
+            "late_responses": self._late,
+        }
@@ -0,0 +1,105 @@
+"""
+Paged actor listings for Unreal MCP.
+
+``get_actors_in_level`` accepts ``fields``, ``class_filter``, ``offset`` and
+``limit`` params and answers with the ``total`` number of matching actors and
+a ``next_offset`` while more remain. Tools hand the next page out as an opaque
+cursor so that agents don't have to repeat the filters.
+
+Pages are offsets into the live listing, so a page taken after an actor was
+spawned or deleted would skip or repeat actors. The cursor therefore carries
+the level ``version`` of the page it follows, and a later page taken at
+another version fails with ``ListingChangedError`` instead.
+"""
+
+import base64
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from connection.codec import json_dumps, json_loads
+
+# Fields of an actor record that can be projected
+ACTOR_FIELDS = ("name", "class", "label", "location", "rotation", "scale")
+
+# Listing params carried over from one page to the next
+_CURSOR_PARAMS = ("fields", "class_filter", "offset", "limit")
+
+
+class ListingChangedError(Exception):
+    """Raised when the level changed between two pages of one listing."""
+
+
+def listing_params(
+    fields: Optional[Sequence[str]] = None,
+    class_filter: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Build the params of a ``get_actors_in_level`` page.
+
+    Raises:
+        ValueError: If a field is unknown or the offset or limit is negative
+    """
+    params: Dict[str, Any] = {}
+    if fields:
+        unknown = [field for field in fields if field not in ACTOR_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown actor field(s) {unknown}, expected some of {list(ACTOR_FIELDS)}")
+        params["fields"] = list(fields)
+    if class_filter:
+        params["class_filter"] = class_filter
+    if offset < 0:
+        raise ValueError(f"Invalid offset: {offset}")
+    if offset:
+        params["offset"] = offset
+    if limit is not None:
+        if limit < 1:
+            raise ValueError(f"Invalid limit: {limit}")
+        params["limit"] = limit
+    return params
+
+
+def encode_cursor(params: Dict[str, Any], next_offset: int, version: Optional[str] = None) -> str:
+    """Return a cursor for the page after the one requested with ``params``.
+
+    Args:
+        params: Params of the page just returned
+        next_offset: ``next_offset`` of that page
+        version: Level ``version`` of that page, if the plugin reports one
+    """
+    state = {key: params[key] for key in _CURSOR_PARAMS if key in params}
+    state["offset"] = next_offset
+    if version is not None:
+        state["version"] = version
+    payload = json_dumps(state)
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Return the listing params a cursor stands for, and the level version its pages were taken at.
+
+    Raises:
+        ValueError: If the cursor was not produced by ``encode_cursor``
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json_loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(state, dict) or not isinstance(state.get("offset"), int):
+        raise ValueError("Invalid cursor")
+    version = state.get("version")
+    if version is not None and not isinstance(version, str):
+        raise ValueError("Invalid cursor")
+    return {key: state[key] for key in _CURSOR_PARAMS if key in state}, version
+
+
+def check_page_version(expected: Optional[str], result: Dict[str, Any]):
+    """Check that a page was taken at the level version of the pages before it.
+
+    Raises:
+        ListingChangedError: If the level changed since ``expected``
+    """
+    version = result.get("version")
+    if expected is not None and version is not None and version != expected:
+        raise ListingChangedError(f"The level changed while it was being listed (version {expected}, now "
+                                  f"{version}); list it again from the first page")
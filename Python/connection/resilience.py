@@ -0,0 +1,330 @@
+"""
+Failure handling for Unreal MCP.
+
+- ``CircuitBreaker`` fails commands fast while the editor is unreachable,
+  instead of letting each one wait out the connect or response timeout.
+- ``AdaptiveTimeouts`` derives each command's response timeout from its
+  observed latency, so long-running commands aren't cut off at a fixed
+  timeout and quick ones don't wait for it when the editor hangs.
+- ``RetryPolicy`` retries idempotent reads after connection failures, with
+  jittered exponential backoff.
+- ``EditorQueue`` tracks the commands outstanding on an editor in the order
+  they were sent, so a command's response timeout only starts once the
+  editor gets to it.
+
+Only connection failures count: failing to connect, or the editor resetting
+or closing the stream. A command the editor answers with an error shows the
+editor is up, and one it doesn't answer in time was still taken, so the
+editor is busy rather than gone.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from connection.cache import READ_ONLY_COMMANDS
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# Circuit breaker states, also the value of the unreal_circuit_breaker_state gauge
+STATE_CLOSED = 0
+STATE_HALF_OPEN = 1
+STATE_OPEN = 2
+
+_STATE_NAMES = {STATE_CLOSED: "closed", STATE_HALF_OPEN: "half_open", STATE_OPEN: "open"}
+
+
+def parse_command_timeouts(spec: str) -> Dict[str, float]:
+    """Parse ``"command=seconds,..."`` as used by UNREAL_TIMEOUT_OVERRIDES.
+
+    Raises:
+        ValueError: If an entry is malformed or a timeout is not positive
+    """
+    timeouts = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        command, separator, seconds = entry.partition("=")
+        if not separator or not command.strip():
+            raise ValueError(f"Invalid timeout entry '{entry}', expected command=seconds")
+        value = float(seconds)
+        if value <= 0:
+            raise ValueError(f"Invalid timeout for {command.strip()}: {value}")
+        timeouts[command.strip()] = value
+    return timeouts
+
+
+class CircuitBreaker:
+    """Opens after consecutive connection failures and fails commands fast until the editor is back.
+
+    After ``reset_timeout`` seconds open, the breaker goes half-open and lets
+    one probe command through: its success closes the breaker, its failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        """
+        Args:
+            failure_threshold: Consecutive connection failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before letting a probe through
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"Invalid failure threshold: {failure_threshold}")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # monotonic() when the half-open probe was let through, 0 if none is in flight
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> int:
+        """The current state, with an expired open state reported as half-open."""
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return STATE_HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through, 0 if it is closed."""
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return 0.0
+            started = self._probe_started if self._state == STATE_HALF_OPEN else self._opened_at
+            return max(started + self.reset_timeout - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a command may be sent now; a command allowed must report its outcome."""
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            now = time.monotonic()
+            if self._state == STATE_OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = STATE_HALF_OPEN
+                logger.info("Circuit breaker half-open, probing Unreal")
+            elif self._probe_started and now - self._probe_started < self.reset_timeout:
+                # One probe at a time; a probe that never reported is replaced after reset_timeout
+                self.rejected += 1
+                return False
+            self._probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info("Circuit breaker closed, Unreal is reachable again")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._probe_started = 0.0
+
+    def record_failure(self) -> bool:
+        """Count a connection failure.
+
+        Returns:
+            True if it opened the breaker
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == STATE_OPEN:
+                return False
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = 0.0
+                self.opened += 1
+                logger.warning(f"Circuit breaker open after {self._failures} connection failure(s), "
+                               f"failing commands fast for {self.reset_timeout:.1f}s")
+                return True
+            return False
+
+    def stats(self):
+        """Return breaker state and counters for diagnostics."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": _STATE_NAMES[state],
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class AdaptiveTimeouts:
+    """Response timeouts per command, from a percentile of recent latencies.
+
+    A command's timeout is ``multiplier`` times the ``percentile`` of its last
+    ``window`` successful latencies, clamped to [``minimum``, ``maximum``].
+    Until ``min_samples`` latencies are seen, ``default`` applies. Commands in
+    ``overrides`` always get their fixed timeout.
+    """
+
+    def __init__(
+        self,
+        default: float = 5.0,
+        minimum: float = 1.0,
+        maximum: float = 120.0,
+        multiplier: float = 3.0,
+        percentile: float = 0.99,
+        window: int = 256,
+        min_samples: int = 20,
+        overrides: Optional[Dict[str, float]] = None,
+    ):
+        if not 0.0 < percentile <= 1.0:
+            raise ValueError(f"Invalid percentile: {percentile}")
+        if minimum > maximum:
+            raise ValueError(f"Invalid timeout bounds: minimum={minimum}, maximum={maximum}")
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.overrides = dict(overrides or {})
+        self._samples: Dict[str, Deque[float]] = {}
+        # Timeouts computed since the command's last observation
+        self._timeouts: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, command: str, seconds: float):
+        """Record the latency of a command that got its response."""
+        with self._lock:
+            samples = self._samples.get(command)
+            if samples is None:
+                samples = self._samples[command] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._timeouts.pop(command, None)
+
+    def timeout(self, command: str) -> float:
+        """Return the response timeout for ``command``, in seconds."""
+        override = self.overrides.get(command)
+        if override is not None:
+            return override
+        with self._lock:
+            timeout = self._timeouts.get(command)
+            if timeout is None:
+                timeout = self._timeouts[command] = self._compute(self._samples.get(command) or ())
+            return timeout
+
+    def _compute(self, samples: Iterable[float]) -> float:
+        ordered = sorted(samples)
+        if len(ordered) < self.min_samples:
+            return self.default
+        value = ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+        return min(max(value * self.multiplier, self.minimum), self.maximum)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the current timeout of every command seen or overridden."""
+        with self._lock:
+            commands = set(self._samples)
+        return {command: self.timeout(command) for command in sorted(commands | set(self.overrides))}
+
+
+class RetryPolicy:
+    """Retries idempotent reads after connection failures, with full-jitter exponential backoff."""
+
+    def __init__(self, retries: int = 2, base_delay: float = 0.05, max_delay: float = 1.0,
+                 commands: Iterable[str] = READ_ONLY_COMMANDS, rng: Optional[random.Random] = None):
+        """
+        Args:
+            retries: Retries after the first attempt
+            base_delay: Backoff cap of the first retry, in seconds, doubled for each further retry
+            max_delay: Largest backoff cap, in seconds
+            commands: Commands that are safe to send again
+            rng: Random source for the jitter
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.commands = frozenset(commands)
+        self._rng = rng or random.Random()
+
+    def retryable(self, command: str) -> bool:
+        return command in self.commands
+
+    def delay(self, attempt: int) -> float:
+        """Return the backoff before retry number ``attempt`` (from 0), in seconds."""
+        return self._rng.uniform(0.0, min(self.base_delay * (2 ** attempt), self.max_delay))
+
+
+class QueuedCommand:
+    """One command's place in an EditorQueue, taken when it is sent."""
+
+    __slots__ = ("queue", "started")
+
+    def __init__(self, queue: "EditorQueue"):
+        self.queue = queue
+        # perf_counter() when the response timeout last started, None until then
+        self.started: Optional[float] = None
+
+    async def response(self, awaitable: Awaitable[Any], timeout: Optional[float]) -> Any:
+        """Await the response of a command just sent, allowing it ``timeout`` seconds from its turn.
+
+        The command stays in the queue until it is answered or given up on.
+
+        Raises:
+            asyncio.TimeoutError: If it did not complete within ``timeout`` seconds of its turn
+        """
+        task = asyncio.ensure_future(awaitable)
+        with self.queue.enter() as ahead:
+            try:
+                pending = [future for future in ahead if not future.done()]
+                while pending and not task.done():
+                    await asyncio.wait([task, *pending], return_when=asyncio.FIRST_COMPLETED)
+                    pending = [future for future in pending if not future.done()]
+            except BaseException:
+                task.cancel()
+                raise
+            self.started = time.perf_counter()
+            return await asyncio.wait_for(task, timeout)
+
+
+class EditorQueue:
+    """The commands outstanding on one editor, in the order they were sent.
+
+    The plugin runs commands one at a time on the game thread, so a command
+    sent behind an 8s ``execute_python_script`` waits 8s before it even starts.
+    Timing it from when it was sent would cut it off, and retry it, while the
+    editor is merely busy. A command's response timeout instead starts once
+    every command sent before it has been answered or given up on.
+    """
+
+    def __init__(self):
+        # Insertion ordered; resolved when the command leaves the queue
+        self._outstanding: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+
+    @property
+    def depth(self) -> int:
+        """Number of commands sent and not yet answered or given up on."""
+        return len(self._outstanding)
+
+    def turn(self) -> QueuedCommand:
+        """Return a place in the queue for a command about to be sent."""
+        return QueuedCommand(self)
+
+    @contextmanager
+    def enter(self) -> Iterator[List[asyncio.Future]]:
+        """Queue a command for as long as the context lasts, yielding the futures of those ahead."""
+        ahead = list(self._outstanding.values())
+        key = next(self._ids)
+        done = self._outstanding[key] = asyncio.get_running_loop().create_future()
+        try:
+            yield ahead
+        finally:
+            del self._outstanding[key]
+            done.set_result(None)
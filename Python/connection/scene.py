@@ -0,0 +1,215 @@
+"""
+Scene mirror for Unreal MCP.
+
+This module keeps an in-memory copy of the level's actor records so that name
+searches can be answered without a round trip to the editor. The mirror is
+seeded from one ``get_actors_in_level`` response and then kept current from
+the responses to actor mutations sent through the same connection. Plugins
+that version the level let it catch up on other changes with a delta listing.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from connection.batch import BATCH_COMMAND
+from connection.cache import ACTOR_MUTATIONS, READ_ONLY_COMMANDS
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# Length of the substrings indexed for name search
+NGRAM_SIZE = 3
+
+# Mutations whose result is the changed actor's record
+_RECORD_RESULTS = frozenset({"spawn_actor", "create_actor", "spawn_blueprint_actor", "set_actor_transform"})
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SceneMirror:
+    """Actor records of the current level with an n-gram index over their names.
+
+    Name search matches like the plugin's ``FString::Contains``: a
+    case-insensitive substring match on the actor name. Results keep the
+    order in which the editor listed the actors.
+
+    The mirror only sees changes made through this connection, so it is
+    re-seeded after ``max_age`` seconds and after any command that may change
+    actors in ways the mirror can't follow (e.g. ``execute_python_script``).
+    If the plugin returned a level ``version`` with the last listing, the
+    re-seed only fetches the actors changed since then.
+    Not thread-safe; use it from one event loop.
+    """
+
+    def __init__(self, max_age: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_age: Seconds after seeding before the mirror must be re-seeded
+            clock: Monotonic time source
+        """
+        self.max_age = max_age
+        self._clock = clock
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lowered: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._next_order = 0
+        self._seeded_at: Optional[float] = None
+        # Level version token of the last listing, for delta queries
+        self.version: Optional[str] = None
+
+        self._searches = 0
+        self._seeds = 0
+        self._deltas = 0
+        self._updates = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the mirror is seeded and young enough to answer searches."""
+        return self._seeded_at is not None and self._clock() - self._seeded_at < self.max_age
+
+    def invalidate(self):
+        """Require a re-seed before the next search."""
+        self._seeded_at = None
+
+    def seed(self, actors: Iterable[Dict[str, Any]], version: Optional[str] = None):
+        """Replace every record with a full actor listing taken at ``version``."""
+        self._records.clear()
+        self._lowered.clear()
+        self._order.clear()
+        self._index.clear()
+        self._next_order = 0
+        for actor in actors:
+            self._upsert(actor)
+        self._seeded_at = self._clock()
+        self.version = version
+        self._seeds += 1
+        logger.info(f"Scene mirror seeded with {len(self._records)} actors")
+
+    def apply_delta(self, actors: Iterable[Dict[str, Any]], removed: Iterable[str], version: Optional[str]):
+        """Merge the actors changed and removed since ``self.version``."""
+        # Removals first: an actor deleted and spawned again under its old name appears in both
+        for name in removed:
+            self._remove(name)
+        changed = 0
+        for actor in actors:
+            self._upsert(actor)
+            changed += 1
+        self._seeded_at = self._clock()
+        self.version = version
+        self._deltas += 1
+        logger.debug(f"Scene mirror merged a delta of {changed} changed actor(s) at version {version}")
+
+    def _upsert(self, actor: Dict[str, Any]):
+        name = actor.get("name") if isinstance(actor, dict) else None
+        if not isinstance(name, str):
+            return
+        if name not in self._records:
+            lowered = name.lower()
+            self._lowered[name] = lowered
+            self._order[name] = self._next_order
+            self._next_order += 1
+            for gram in _ngrams(lowered):
+                self._index[gram].add(name)
+        self._records[name] = actor
+
+    def _remove(self, name: str):
+        if self._records.pop(name, None) is None:
+            return
+        lowered = self._lowered.pop(name)
+        del self._order[name]
+        for gram in _ngrams(lowered):
+            names = self._index.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._index[gram]
+
+    def actors(self) -> List[Dict[str, Any]]:
+        """Return every record, in listing order."""
+        return list(self._records.values())
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the record of the actor called ``name``, if mirrored."""
+        return self._records.get(name)
+
+    def find(self, pattern: str) -> List[Dict[str, Any]]:
+        """Return the records whose names contain ``pattern``, ignoring case."""
+        self._searches += 1
+        pattern = pattern.lower()
+        if len(pattern) < NGRAM_SIZE:
+            candidates: Iterable[str] = self._records
+        else:
+            postings = sorted((self._index.get(gram, ()) for gram in _ngrams(pattern)), key=len)
+            if not postings or not postings[0]:
+                return []
+            candidates = set(postings[0]).intersection(*postings[1:])
+        lowered = self._lowered
+        matches = [name for name in candidates if pattern in lowered[name]]
+        if candidates is not self._records:
+            matches.sort(key=self._order.__getitem__)
+        return [self._records[name] for name in matches]
+
+    def observe(self, command: str, params: Optional[Dict[str, Any]], response: Optional[Dict[str, Any]]):
+        """Apply the effect of a command's response to the mirror."""
+        params = params or {}
+        if command in READ_ONLY_COMMANDS and command != "get_actors_in_level":
+            return
+
+        if command == BATCH_COMMAND:
+            items = params.get("commands") or []
+            results = (((response or {}).get("result") or {}).get("results")) or []
+            for index, item in enumerate(items):
+                if isinstance(item, dict):
+                    item_response = results[index] if index < len(results) else None
+                    self.observe(item.get("type", ""), item.get("params"), item_response)
+            return
+
+        if not response or response.get("status") != "success":
+            # A failed mutation may still have changed something; a failed read changes nothing
+            if command not in READ_ONLY_COMMANDS:
+                self.invalidate()
+            return
+        result = response.get("result") or {}
+
+        if command == "get_actors_in_level":
+            # Only plain and delta listings cover the whole level; filtered ones are ignored
+            if set(params) <= {"since"} and isinstance(result.get("actors"), list):
+                if result.get("delta"):
+                    self.apply_delta(result["actors"], result.get("removed") or [], result.get("version"))
+                else:
+                    self.seed(result["actors"], result.get("version"))
+            return
+
+        if command in _RECORD_RESULTS:
+            self._upsert(result)
+        elif command == "set_actor_property":
+            self._upsert(result.get("actor_details") or {})
+        elif command == "delete_actor":
+            deleted = (result.get("deleted_actor") or {}).get("name") or params.get(ACTOR_MUTATIONS[command])
+            if isinstance(deleted, str):
+                self._remove(deleted)
+        else:
+            # execute_python_script, blueprint compiles and the like may change any actor
+            self.invalidate()
+            return
+        self._updates += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return mirror counters for diagnostics."""
+        return {
+            "actors": len(self._records),
+            "fresh": self.fresh,
+            "searches": self._searches,
+            "seeds": self._seeds,
+            "deltas": self._deltas,
+            "updates": self._updates,
+            "ngrams": len(self._index),
+        }
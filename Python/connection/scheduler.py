@@ -0,0 +1,250 @@
+"""
+Command scheduling for Unreal MCP.
+
+The plugin runs commands one at a time on the editor's game thread, in the
+order they arrive, so a read sent behind a long script waits for the whole
+script. ``CommandScheduler`` holds commands on the Python side and lets at
+most ``slots`` of them be outstanding on an editor, handing free slots out by
+priority class:
+
+- ``interactive``: reads such as ``ping`` or ``get_actor_properties``
+- ``mutation``: commands that change the level or assets
+- ``script``: long-running commands such as ``execute_python_script``
+
+Within a class, the sessions with commands waiting take turns, so one agent
+queueing many commands doesn't hold back the others. Mutations and scripts
+are sent one at a time: while one is outstanding, the others wait here
+rather than on the game thread, and a read that arrives meanwhile is sent
+ahead of them. Reads still pipeline up to ``slots``. A read does wait for
+the mutation or script already sent, since the plugin can't reorder what it
+has received: nothing here gets a read past a script that is already
+running. A command that waits longer than its class's budget fails instead
+of being sent late.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from connection.cache import READ_ONLY_COMMANDS
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# MCP client session the current command comes from, None outside of one
+current_session: ContextVar[Optional[str]] = ContextVar("unreal_mcp_session", default=None)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_MUTATION = 1
+PRIORITY_SCRIPT = 2
+
+PRIORITY_NAMES = ("interactive", "mutation", "script")
+
+# Commands that keep the game thread busy for seconds or more
+LONG_RUNNING_COMMANDS = frozenset({"execute_python_script"})
+
+# Seconds a command of each class may wait for a slot; mutations may queue behind a whole script
+DEFAULT_BUDGETS = {"interactive": 5.0, "mutation": 300.0, "script": 300.0}
+
+
+class QueueTimeoutError(TimeoutError):
+    """Raised when a command waits longer than its class's budget for a slot."""
+
+
+def parse_command_priorities(spec: str) -> Dict[str, int]:
+    """Parse ``"command=class,..."`` as used by UNREAL_COMMAND_PRIORITIES.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown class
+    """
+    priorities = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        command, separator, name = entry.partition("=")
+        if not separator or not command.strip():
+            raise ValueError(f"Invalid priority entry '{entry}', expected command=class")
+        if name.strip() not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority class '{name.strip()}', expected one of {', '.join(PRIORITY_NAMES)}")
+        priorities[command.strip()] = PRIORITY_NAMES.index(name.strip())
+    return priorities
+
+
+class _Waiter:
+    __slots__ = ("future", "session", "priority", "enqueued")
+
+    def __init__(self, future: asyncio.Future, session: str, priority: int):
+        self.future = future
+        self.session = session
+        self.priority = priority
+        self.enqueued = time.monotonic()
+
+
+class CommandScheduler:
+    """Hands out an editor's command slots by priority class, fairly across sessions."""
+
+    classes = PRIORITY_NAMES
+
+    def __init__(
+        self,
+        slots: int = 4,
+        budgets: Optional[Dict[str, float]] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        metrics=None,
+        name: str = "",
+    ):
+        """
+        Args:
+            slots: Most commands outstanding on the editor at once, of which at most one mutation or script
+            budgets: Seconds a command may wait for a slot, by class name; missing classes keep their default
+            priorities: Class of each command, overriding the default classification
+            metrics: Optional CommandMetrics recording queue waits and rejections
+            name: Editor the scheduler is for, labelling its metrics
+        """
+        if slots < 1:
+            raise ValueError(f"Invalid slot count: {slots}")
+        budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        unknown = set(budgets) - set(PRIORITY_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown priority class(es) {', '.join(sorted(unknown))} in queue budgets")
+        self.slots = slots
+        self.budgets = [budgets[name] for name in PRIORITY_NAMES]
+        self.priorities = dict(priorities or {})
+        self.metrics = metrics
+        self.name = name
+        # Per class, the waiting commands of each session, in the order sessions take turns
+        self._queues: List["OrderedDict[str, Deque[_Waiter]]"] = [OrderedDict() for _ in PRIORITY_NAMES]
+        self._queued = [0] * len(PRIORITY_NAMES)
+        self._running = [0] * len(PRIORITY_NAMES)
+        self._granted = [0] * len(PRIORITY_NAMES)
+        self._rejected = [0] * len(PRIORITY_NAMES)
+        self._max_wait = [0.0] * len(PRIORITY_NAMES)
+
+    def priority(self, command: str) -> int:
+        """Return the class of ``command``."""
+        priority = self.priorities.get(command)
+        if priority is not None:
+            return priority
+        if command in LONG_RUNNING_COMMANDS:
+            return PRIORITY_SCRIPT
+        if command in READ_ONLY_COMMANDS:
+            return PRIORITY_INTERACTIVE
+        return PRIORITY_MUTATION
+
+    def queued(self, priority: int) -> int:
+        """Number of commands of a class waiting for a slot."""
+        return self._queued[priority]
+
+    def running(self, priority: int) -> int:
+        """Number of commands of a class holding a slot."""
+        return self._running[priority]
+
+    @asynccontextmanager
+    async def slot(self, command: str) -> AsyncIterator[None]:
+        """Hold one of the editor's slots while ``command`` is sent and answered.
+
+        Raises:
+            QueueTimeoutError: If no slot was free within the command's budget
+        """
+        priority = self.priority(command)
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: int):
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), current_session.get() or "", priority)
+        queue = self._queues[priority].get(waiter.session)
+        if queue is None:
+            queue = self._queues[priority][waiter.session] = deque()
+        queue.append(waiter)
+        self._queued[priority] += 1
+        self._dispatch()
+        if waiter.future.done():
+            return
+
+        budget = self.budgets[priority]
+        try:
+            await asyncio.wait({waiter.future}, timeout=budget)
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                # Granted as the caller was cancelled: hand the slot on
+                self._release(priority)
+            else:
+                self._remove(waiter)
+            raise
+        if waiter.future.done():
+            return
+
+        self._remove(waiter)
+        self._rejected[priority] += 1
+        if self.metrics is not None:
+            self.metrics.scheduler_rejected.inc(PRIORITY_NAMES[priority])
+        raise QueueTimeoutError(f"Waited {budget:.1f}s for a slot on Unreal ({PRIORITY_NAMES[priority]} class) "
+                                f"behind {sum(self._running)} running and {sum(self._queued)} queued command(s)")
+
+    def _remove(self, waiter: _Waiter):
+        """Take a waiter that gave up out of its queue."""
+        sessions = self._queues[waiter.priority]
+        queue = sessions.get(waiter.session)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._queued[waiter.priority] -= 1
+            if not queue:
+                del sessions[waiter.session]
+
+    def _can_run(self, priority: int) -> bool:
+        """Whether a free slot may go to a command of this class."""
+        if priority == PRIORITY_INTERACTIVE:
+            return True
+        # One mutation or script at a time, so later reads only queue behind that one on the game thread
+        return self._running[PRIORITY_MUTATION] + self._running[PRIORITY_SCRIPT] == 0
+
+    def _dispatch(self):
+        """Grant free slots to waiting commands, highest class first."""
+        while sum(self._running) < self.slots:
+            for priority, sessions in enumerate(self._queues):
+                if sessions and self._can_run(priority):
+                    self._grant(sessions, priority)
+                    break
+            else:
+                return
+
+    def _grant(self, sessions: "OrderedDict[str, Deque[_Waiter]]", priority: int):
+        """Grant a slot to the next command of the session whose turn it is."""
+        session, queue = next(iter(sessions.items()))
+        waiter = queue.popleft()
+        if queue:
+            sessions.move_to_end(session)
+        else:
+            del sessions[session]
+        self._queued[priority] -= 1
+        self._running[priority] += 1
+        self._granted[priority] += 1
+        wait = time.monotonic() - waiter.enqueued
+        self._max_wait[priority] = max(self._max_wait[priority], wait)
+        if self.metrics is not None:
+            self.metrics.scheduler_wait.observe(wait, PRIORITY_NAMES[priority])
+        waiter.future.set_result(None)
+
+    def _release(self, priority: int):
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depths and counters per class."""
+        return {
+            name: {
+                "queued": self._queued[priority],
+                "running": self._running[priority],
+                "granted": self._granted[priority],
+                "rejected": self._rejected[priority],
+                "max_wait": round(self._max_wait[priority], 6),
+            }
+            for priority, name in enumerate(PRIORITY_NAMES)
+        }
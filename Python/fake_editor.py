@@ -0,0 +1,1114 @@
+"""
+Fake Unreal Editor for Unreal MCP.
+
+A local stand-in for the UnrealMCP plugin's TCP server. It speaks the same
+wire protocol as the plugin so that the connection layer and the tools can be
+exercised and benchmarked without a running editor.
+
+Commands run against an in-memory world: the level's actors, blueprints with
+their components, graph nodes, links and variables, input mappings, and
+scripted ``execute_python_script`` results. Responses are shaped like the
+plugin's. As in the plugin, commands execute one at a time on a single "game
+thread", optionally only at frame boundaries, and each command type can be
+given a latency and a game thread execution time.
+
+``ReplayEditor`` instead answers with the responses of a capture recorded by
+``connection.capture.TrafficRecorder``, paced like the original session.
+"""
+
+import logging
+import math
+import queue
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from connection.capture import read_capture
+from connection.codec import CODEC_CBOR, CODEC_MSGPACK, CODECS, JSON_CODEC, json_dumps
+from connection.compression import COMPRESSION_ZLIB, Compressor
+from connection.framing import FRAMING_LEGACY, FRAMING_LENGTH_PREFIX, FRAMING_NDJSON, FrameProtocol
+
+# Get logger
+logger = logging.getLogger("FakeUnrealEditor")
+
+# Removed actor names kept for deltas, as in FUnrealMCPEditorCommands
+MAX_REMOVED_ACTORS = 4096
+
+# Where FUnrealMCPBlueprintCommands creates blueprints
+BLUEPRINT_PATH = "/Game/Blueprints/"
+
+# Component classes add_component_to_blueprint can create, without the "Component" suffix
+COMPONENT_TYPES = frozenset({
+    "Scene", "StaticMesh", "SkeletalMesh", "Box", "Sphere", "Capsule", "PointLight", "SpotLight",
+    "DirectionalLight", "RectLight", "Camera", "SpringArm", "Audio", "Arrow", "Billboard",
+    "ParticleSystem", "Niagara", "Widget", "ProjectileMovement", "FloatingPawnMovement",
+    "CharacterMovement", "RotatingMovement", "TextRender", "Decal", "ChildActor",
+})
+
+# Variable types add_blueprint_variable supports, as in FUnrealMCPBlueprintNodeCommands
+VARIABLE_TYPES = frozenset({"Boolean", "Integer", "Int", "Float", "String", "Vector"})
+
+
+def _actor_record(name: str, actor_class: str, location=None, rotation=None, scale=None) -> Dict[str, Any]:
+    """Build an actor dict shaped like FUnrealMCPCommonUtils::ActorToJson."""
+    return {
+        "name": name,
+        "class": actor_class,
+        "label": name,
+        "location": [float(v) for v in (location or [0.0, 0.0, 0.0])],
+        "rotation": [float(v) for v in (rotation or [0.0, 0.0, 0.0])],
+        "scale": [float(v) for v in (scale or [1.0, 1.0, 1.0])],
+    }
+
+
+def _node_guid() -> str:
+    """Return a new node id, formatted like FGuid::ToString()."""
+    return uuid.uuid4().hex.upper()
+
+
+def parse_command_latencies(spec: str) -> Dict[str, float]:
+    """Parse ``"command=seconds,..."`` as used by --command-latency and --execution-time.
+
+    Raises:
+        ValueError: If an entry is not ``command=seconds``
+    """
+    latencies = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        command, separator, seconds = entry.partition("=")
+        if not separator or not command.strip():
+            raise ValueError(f"Invalid latency entry '{entry}', expected command=seconds")
+        latencies[command.strip()] = float(seconds)
+    return latencies
+
+
+class GameThread:
+    """Runs tasks one at a time on a single thread, like the editor's game thread.
+
+    With a ``frame_time``, queued tasks only start at the next frame boundary,
+    as work queued with AsyncTask(ENamedThreads::GameThread, ...) waits for the
+    editor's next tick. Tasks that overrun a frame delay the following one.
+    """
+
+    def __init__(self, frame_time: float = 0.0):
+        self.frame_time = frame_time
+        self._queue: "queue.Queue[Optional[Tuple[Future, Callable, tuple]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.frames = 0
+        self.tasks_run = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="FakeUnrealGameThread", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.running:
+            self._queue.put(None)
+            self._thread.join()
+
+    def submit(self, function: Callable, *args) -> Future:
+        """Queue ``function(*args)`` and return a future of its result."""
+        future: Future = Future()
+        self._queue.put((future, function, args))
+        return future
+
+    def call(self, function: Callable, *args) -> Any:
+        """Run ``function(*args)`` on the game thread and wait for its result.
+
+        Runs it directly if the thread is not running, or if this is the game thread.
+        """
+        if not self.running or threading.current_thread() is self._thread:
+            return function(*args)
+        return self.submit(function, *args).result()
+
+    def _loop(self):
+        started = time.perf_counter()
+        while True:
+            tasks = [self._queue.get()]
+            if self.frame_time > 0:
+                now = time.perf_counter()
+                next_frame = started + math.ceil((now - started) / self.frame_time) * self.frame_time
+                if next_frame > now:
+                    time.sleep(next_frame - now)
+            # Everything queued by the start of the frame runs in it
+            while True:
+                try:
+                    tasks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.frames += 1
+            stopping = False
+            for task in tasks:
+                if task is None:
+                    stopping = True
+                    continue
+                future, function, args = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(function(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+                self.tasks_run += 1
+            if stopping:
+                return
+
+
+class FakeUnrealEditor:
+    """Threaded TCP server that answers Unreal MCP commands from an in-memory world."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        command_latency: float = 0.0,
+        connect_latency: float = 0.0,
+        framing: Sequence[str] = (FRAMING_LENGTH_PREFIX, FRAMING_NDJSON),
+        codecs: Sequence[str] = (CODEC_CBOR, CODEC_MSGPACK),
+        multiplex: bool = True,
+        compression: bool = True,
+        workers: int = 8,
+        command_latencies: Optional[Mapping[str, float]] = None,
+        execution_times: Optional[Mapping[str, float]] = None,
+        frame_time: float = 0.0,
+    ):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free port
+            command_latency: Seconds to sleep before answering each command, off the game thread
+            connect_latency: Seconds to stall every new connection, emulating a remote handshake
+            framing: Framing modes accepted in the ping handshake; empty behaves like an old plugin
+            codecs: Binary codecs accepted with length_prefix framing, if their package is installed
+            multiplex: Accept pipelined commands with request ids, answering them out of order
+            compression: Accept zlib compression of large frames with length_prefix framing
+            workers: Threads answering pipelined commands
+            command_latencies: ``command_latency`` overrides by command type
+            execution_times: Seconds each command type keeps the game thread busy,
+                             e.g. {"compile_blueprint": 0.2}
+            frame_time: Seconds per editor frame; commands wait for the next frame to start
+                        running, 0 runs them as soon as the game thread is free
+        """
+        self.host = host
+        self.port = port
+        self.command_latency = command_latency
+        self.connect_latency = connect_latency
+        self.framing = tuple(framing)
+        self.codecs = tuple(name for name in codecs if name in CODECS)
+        self.multiplex = multiplex
+        self.compression = compression
+        self.workers = workers
+        self.command_latencies: Dict[str, float] = dict(command_latencies or {})
+        self.execution_times: Dict[str, float] = dict(execution_times or {})
+        self.game_thread = GameThread(frame_time)
+
+        # World state, only touched on the game thread once the editor is started
+        self.actors: Dict[str, Dict[str, Any]] = {}
+        # Properties set with set_actor_property, by actor
+        self.actor_properties: Dict[str, Dict[str, Any]] = {}
+        self.blueprints: Dict[str, Dict[str, Any]] = {}
+        self.input_mappings: List[Dict[str, Any]] = []
+        self.viewport: Dict[str, Any] = {"location": [0.0, 0.0, 0.0], "orientation": [0.0, 0.0, 0.0]}
+        # execute_python_script results by script, see set_python_result
+        self.python_results: Dict[str, Dict[str, Any]] = {}
+        self.python_scripts: List[str] = []
+        # Level change journal backing versioned get_actors_in_level queries
+        self._epoch = uuid.uuid4().hex
+        self._version = 0
+        # Version of each actor's last change, oldest first
+        self._actor_versions: Dict[str, int] = {}
+        self._removed: List[Tuple[int, str]] = []
+        self._oldest_delta_version = 0
+        self.connections_accepted = 0
+        self.commands_handled = 0
+
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "ping": self._handle_ping,
+            # Editor commands
+            "get_actors_in_level": self._handle_get_actors_in_level,
+            "find_actors_by_name": self._handle_find_actors_by_name,
+            "spawn_actor": self._handle_spawn_actor,
+            "create_actor": self._handle_spawn_actor,
+            "delete_actor": self._handle_delete_actor,
+            "set_actor_transform": self._handle_set_actor_transform,
+            "get_actor_properties": self._handle_get_actor_properties,
+            "set_actor_property": self._handle_set_actor_property,
+            "spawn_blueprint_actor": self._handle_spawn_blueprint_actor,
+            "focus_viewport": self._handle_focus_viewport,
+            "take_screenshot": self._handle_take_screenshot,
+            # Blueprint commands
+            "create_blueprint": self._handle_create_blueprint,
+            "add_component_to_blueprint": self._handle_add_component_to_blueprint,
+            "set_component_property": self._handle_set_component_property,
+            "set_physics_properties": self._handle_set_physics_properties,
+            "compile_blueprint": self._handle_compile_blueprint,
+            "set_blueprint_property": self._handle_set_blueprint_property,
+            "set_static_mesh_properties": self._handle_set_static_mesh_properties,
+            # Blueprint node commands
+            "connect_blueprint_nodes": self._handle_connect_blueprint_nodes,
+            "add_blueprint_get_self_component_reference": self._handle_add_component_reference_node,
+            "add_blueprint_self_reference": self._handle_add_self_reference_node,
+            "find_blueprint_nodes": self._handle_find_blueprint_nodes,
+            "add_blueprint_event_node": self._handle_add_event_node,
+            "add_blueprint_input_action_node": self._handle_add_input_action_node,
+            "add_blueprint_function_node": self._handle_add_function_node,
+            "add_blueprint_variable": self._handle_add_blueprint_variable,
+            # Project commands
+            "create_input_mapping": self._handle_create_input_mapping,
+            # Python
+            "execute_python_script": self._handle_execute_python_script,
+        }
+
+        self._listener: Optional[socket.socket] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self._clients: List[socket.socket] = []
+        self._running = False
+        self._lock = threading.Lock()
+
+    # Lifecycle
+
+    def start(self) -> Tuple[str, int]:
+        """Start listening in a background thread and return the bound address."""
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((self.host, self.port))
+        self._listener.listen(64)
+        self.port = self._listener.getsockname()[1]
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FakeUnrealWorker")
+        self.game_thread.start()
+
+        thread = threading.Thread(target=self._accept_loop, name="FakeUnrealEditor", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"Fake Unreal editor listening on {self.host}:{self.port}")
+        return self.host, self.port
+
+    def stop(self):
+        """Stop listening, close every client socket and wait for their threads."""
+        with self._lock:
+            self._running = False
+            threads, self._threads = self._threads, []
+            clients, self._clients = self._clients, []
+        # Shutting a socket down wakes a thread blocked in accept or recv on it; closing it doesn't
+        for sock in ([self._listener] if self._listener else []) + clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                sock.close()
+            except OSError:
+                pass
+        # Client threads hand pipelined commands to the executor, so they must be gone before it shuts down
+        for thread in threads:
+            thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        self.game_thread.stop()
+
+    def __enter__(self) -> "FakeUnrealEditor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Networking
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+            with self._lock:
+                if not self._running:
+                    client.close()
+                    break
+                self.connections_accepted += 1
+                self._clients.append(client)
+                thread = threading.Thread(target=self._serve_client, args=(client,), daemon=True)
+                self._threads.append(thread)
+            thread.start()
+
+    def _serve_client(self, client: socket.socket):
+        """Answer commands on one socket until the client disconnects."""
+        protocol = FrameProtocol(FRAMING_LEGACY)
+        codec = JSON_CODEC
+        send_lock = threading.Lock()
+        multiplexed = False
+        try:
+            if self.connect_latency:
+                time.sleep(self.connect_latency)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            while self._running:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+
+                for raw in protocol.feed(chunk):
+                    message = codec.decode(raw)
+                    command = message.get("type", "")
+                    params = message.get("params") or {}
+
+                    if multiplexed and "id" in message:
+                        # Pipelined commands run concurrently and may be answered out of order
+                        self._executor.submit(self._answer, client, protocol, codec, send_lock, message)
+                        continue
+
+                    response = self._respond(message)
+
+                    # Like the plugin, reply in the current framing and codec and switch afterwards
+                    next_mode, next_codec, next_compressor = protocol.mode, codec, protocol.compressor
+                    if command == "ping" and "capabilities" in params:
+                        next_mode, next_codec, next_compressor = self._negotiate(
+                            params["capabilities"], response, protocol.mode, codec, protocol.compressor)
+                        multiplexed = response.get("result", {}).get("capabilities", {}).get("multiplex", False)
+
+                    with send_lock:
+                        client.sendall(protocol.encode(codec.encode(response)))
+                    protocol.switch(next_mode)
+                    protocol.compressor = next_compressor
+                    codec = next_codec
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if client in self._clients:
+                    self._clients.remove(client)
+            try:
+                client.close()
+            except OSError:
+                pass
+
+    def _answer(self, client: socket.socket, protocol: FrameProtocol, codec, send_lock: threading.Lock,
+                message: Dict[str, Any]):
+        """Execute one pipelined command on a worker thread and send its response."""
+        response = self._respond(message)
+        try:
+            with send_lock:
+                client.sendall(protocol.encode(codec.encode(response)))
+        except OSError:
+            pass
+
+    def _negotiate(self, requested: Dict[str, Any], response: Dict[str, Any], current: str, codec,
+                   compressor: Optional[Compressor]) -> Tuple[str, Any, Optional[Compressor]]:
+        """Answer a capability handshake like FMCPServerRunnable::NegotiateCapabilities."""
+        if not self.framing or "result" not in response:
+            return current, codec, compressor
+
+        mode = FRAMING_LEGACY
+        for offered in requested.get("framing") or []:
+            if offered in self.framing:
+                mode = offered
+                break
+        accepted = {"framing": mode}
+        # Binary payloads can only be delimited by a length prefix
+        if mode == FRAMING_LENGTH_PREFIX:
+            for offered in requested.get("codec") or []:
+                if offered in self.codecs:
+                    codec = CODECS[offered]
+                    accepted["codec"] = offered
+                    break
+            compressor = None
+            threshold = requested.get("compression_threshold")
+            if (self.compression and COMPRESSION_ZLIB in (requested.get("compression") or [])
+                    and isinstance(threshold, int) and threshold > 0):
+                compressor = Compressor(threshold=threshold)
+                accepted["compression"] = COMPRESSION_ZLIB
+        if self.multiplex and requested.get("multiplex") is True:
+            accepted["multiplex"] = True
+        response["result"]["capabilities"] = accepted
+        return mode, codec, compressor if mode == FRAMING_LENGTH_PREFIX else None
+
+    # Command execution
+
+    def _respond(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a decoded request and build its response like FMCPServerRunnable::ProcessMessage.
+
+        The request id is echoed, and traced requests get the time spent
+        waiting for and executing on the game thread.
+        """
+        traced = "traceparent" in message
+        timing: Optional[Dict[str, float]] = {} if traced else None
+        response = self.execute(message.get("type", ""), message.get("params") or {}, timing)
+        if traced:
+            response = {"timing": timing, **response}
+        if "id" in message:
+            response = {"id": message["id"], **response}
+        return response
+
+    def execute(self, command: str, params: Dict[str, Any],
+                timing: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Run a command on the game thread and wrap the result like UUnrealMCPBridge::ExecuteCommand.
+
+        If ``timing`` is given, it gets the milliseconds spent waiting for the
+        game thread (``queue_ms``) and running on it (``execute_ms``).
+        """
+        latency = self.command_latencies.get(command, self.command_latency)
+        if latency:
+            time.sleep(latency)
+
+        queued_at = time.perf_counter()
+        response, started_at, finished_at = self.game_thread.call(self._execute_on_game_thread, command, params)
+        if timing is not None:
+            timing["queue_ms"] = (started_at - queued_at) * 1000
+            timing["execute_ms"] = (finished_at - started_at) * 1000
+        return response
+
+    def _execute_on_game_thread(self, command: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], float, float]:
+        started_at = time.perf_counter()
+        if command == "batch":
+            response = self._execute_batch(params)
+        else:
+            response = self._dispatch(command, params)
+        return response, started_at, time.perf_counter()
+
+    def _dispatch(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one command and wrap its result. Must run on the game thread."""
+        self.commands_handled += 1
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {"status": "error", "error": f"Unknown command: {command}"}
+        cost = self.execution_times.get(command)
+        if cost:
+            time.sleep(cost)
+        result = handler(params)
+
+        if result.get("success") is False:
+            return {"status": "error", "error": result.get("error", "")}
+        return {"status": "success", "result": result}
+
+    def _execute_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run sub-commands in order like UUnrealMCPBridge::ExecuteBatch. Must run on the game thread."""
+        commands = params.get("commands")
+        if not isinstance(commands, list):
+            return {"status": "error", "error": "Missing 'commands' parameter"}
+        stop_on_error = bool(params.get("stop_on_error", False))
+
+        self.commands_handled += 1
+        results = []
+        stopped = False
+        for item in commands:
+            if not isinstance(item, dict) or not isinstance(item.get("type"), str):
+                response = {"status": "error", "error": "Missing 'type' field in batch command"}
+            elif item["type"] == "batch":
+                response = {"status": "error", "error": "Batches cannot be nested"}
+            else:
+                response = self._dispatch(item["type"], item.get("params") or {})
+            results.append(response)
+            if response["status"] != "success" and stop_on_error:
+                stopped = True
+                break
+
+        succeeded = sum(1 for response in results if response["status"] == "success")
+        return {"status": "success", "result": {
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "skipped": len(commands) - len(results),
+            "stopped": stopped,
+        }}
+
+    @staticmethod
+    def _error(message: str) -> Dict[str, Any]:
+        return {"success": False, "error": message}
+
+    def populate(self, count: int, prefix: str = "Actor", actor_class: str = "StaticMeshActor"):
+        """Fill the level with ``count`` generated actors."""
+        self.game_thread.call(self._populate, count, prefix, actor_class)
+
+    def _populate(self, count: int, prefix: str, actor_class: str):
+        for index in range(count):
+            name = f"{prefix}_{index}"
+            self.actors[name] = _actor_record(name, actor_class, [float(index), 0.0, 0.0])
+            self._mark_changed(name)
+
+    def set_python_result(self, script: str, output: str = "", result: Any = None,
+                          error: Optional[str] = None, duration: float = 0.0):
+        """Script the answer to an ``execute_python_script`` command.
+
+        Args:
+            script: Script text the result applies to
+            output: Captured stdout returned as ``output``
+            result: Value returned as ``result``, if not None
+            error: Fail the command with this message instead
+            duration: Seconds the script keeps the game thread busy
+        """
+        self.python_results[script] = {"output": output, "result": result, "error": error, "duration": duration}
+
+    def _mark_changed(self, name: str):
+        self._version += 1
+        # Reinserted so the journal stays ordered by version
+        self._actor_versions.pop(name, None)
+        self._actor_versions[name] = self._version
+
+    def _mark_removed(self, name: str):
+        self._version += 1
+        self._actor_versions.pop(name, None)
+        self.actor_properties.pop(name, None)
+        self._removed.append((self._version, name))
+        if len(self._removed) > MAX_REMOVED_ACTORS:
+            excess = len(self._removed) - MAX_REMOVED_ACTORS
+            self._oldest_delta_version = self._removed[excess - 1][0]
+            del self._removed[:excess]
+
+    def _changed_since(self, since: int) -> List[Dict[str, Any]]:
+        """Return the actors changed after ``since``, oldest change first, walking only the newer journal entries."""
+        changed = []
+        for name in reversed(self._actor_versions):
+            if self._actor_versions[name] <= since:
+                break
+            changed.append(self.actors[name])
+        changed.reverse()
+        return changed
+
+    def _parse_version(self, token: Any) -> Optional[int]:
+        """Return the version in a token from this journal, or None if it can't be answered with a delta."""
+        if not isinstance(token, str):
+            return None
+        epoch, _, version = token.partition(":")
+        if epoch != self._epoch or not version.isdigit():
+            return None
+        version = int(version)
+        if not self._oldest_delta_version <= version <= self._version:
+            return None
+        return version
+
+    def _handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"message": "pong"}
+
+    # Editor commands
+
+    def _handle_get_actors_in_level(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        since = self._parse_version(params.get("since"))
+        actors = self.actors.values() if since is None else self._changed_since(since)
+        class_filter = params.get("class_filter")
+        if class_filter:
+            # Generated actors have no class hierarchy, so only the exact class matches
+            actors = [actor for actor in actors if actor["class"] == class_filter]
+        actors = list(actors)
+
+        offset = max(int(params.get("offset", 0)), 0)
+        limit = params.get("limit")
+        page = actors[offset:] if limit is None or limit < 0 else actors[offset:offset + int(limit)]
+        fields = params.get("fields")
+        if fields:
+            page = [{key: value for key, value in actor.items() if key == "name" or key in fields} for actor in page]
+
+        result: Dict[str, Any] = {
+            "actors": page,
+            "version": f"{self._epoch}:{self._version}",
+            "delta": since is not None,
+            "total": len(actors),
+        }
+        if limit is not None and limit >= 0 and offset + limit < len(actors):
+            result["next_offset"] = offset + limit
+        if since is not None:
+            result["removed"] = [name for version, name in self._removed if version > since]
+        return result
+
+    def _handle_find_actors_by_name(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        pattern = params.get("pattern")
+        if pattern is None:
+            return self._error("Missing 'pattern' parameter")
+        # FString::Contains ignores case by default
+        pattern = pattern.lower()
+        return {"actors": [actor for name, actor in self.actors.items() if pattern in name.lower()]}
+
+    def _handle_spawn_actor(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if not name:
+            return self._error("Missing 'name' parameter")
+        if name in self.actors:
+            return self._error(f"Actor with name '{name}' already exists")
+        actor = _actor_record(name, params.get("type", "StaticMeshActor"),
+                              params.get("location"), params.get("rotation"), params.get("scale"))
+        self.actors[name] = actor
+        self._mark_changed(name)
+        return dict(actor)
+
+    def _handle_delete_actor(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if name not in self.actors:
+            return self._error(f"Actor not found: {name}")
+        self._mark_removed(name)
+        return {"deleted_actor": self.actors.pop(name)}
+
+    def _handle_set_actor_transform(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        actor = self.actors.get(params.get("name"))
+        if actor is None:
+            return self._error(f"Actor not found: {params.get('name')}")
+        # Records are replaced rather than changed, since earlier responses may still be being encoded
+        actor = dict(actor)
+        for key in ("location", "rotation", "scale"):
+            if params.get(key) is not None:
+                actor[key] = [float(v) for v in params[key]]
+        self.actors[actor["name"]] = actor
+        self._mark_changed(actor["name"])
+        return dict(actor)
+
+    def _handle_get_actor_properties(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        actor = self.actors.get(params.get("name"))
+        if actor is None:
+            return self._error(f"Actor not found: {params.get('name')}")
+        return {**actor, "properties": dict(self.actor_properties.get(actor["name"], {}))}
+
+    def _handle_set_actor_property(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if not name:
+            return self._error("Missing 'name' parameter")
+        actor = self.actors.get(name)
+        if actor is None:
+            return self._error(f"Actor not found: {name}")
+        property_name = params.get("property_name")
+        if not property_name:
+            return self._error("Missing 'property_name' parameter")
+        if "property_value" not in params:
+            return self._error("Missing 'property_value' parameter")
+        self.actor_properties.setdefault(name, {})[property_name] = params["property_value"]
+        self._mark_changed(name)
+        return {"actor": name, "property": property_name, "success": True, "actor_details": dict(actor)}
+
+    def _handle_spawn_blueprint_actor(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint_name = params.get("blueprint_name")
+        if not blueprint_name:
+            return self._error("Missing 'blueprint_name' parameter")
+        name = params.get("actor_name")
+        if not name:
+            return self._error("Missing 'actor_name' parameter")
+        if blueprint_name not in self.blueprints:
+            return self._error(f"Blueprint not found: {blueprint_name}")
+        if name in self.actors:
+            return self._error(f"Actor with name '{name}' already exists")
+        actor = _actor_record(name, f"{blueprint_name}_C", params.get("location"), params.get("rotation"))
+        self.actors[name] = actor
+        self._mark_changed(name)
+        return dict(actor)
+
+    def _handle_focus_viewport(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        target = params.get("target")
+        if target:
+            actor = self.actors.get(target)
+            if actor is None:
+                return self._error(f"Actor not found: {target}")
+            location = actor["location"]
+        elif params.get("location") is not None:
+            location = [float(v) for v in params["location"]]
+        else:
+            return self._error("Either 'target' or 'location' must be provided")
+        distance = float(params.get("distance", 1000.0))
+        self.viewport = {
+            "location": [location[0] - distance, location[1], location[2]],
+            "orientation": [float(v) for v in params.get("orientation") or self.viewport["orientation"]],
+        }
+        return {"success": True}
+
+    def _handle_take_screenshot(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        filepath = params.get("filepath")
+        if not filepath:
+            return self._error("Missing 'filepath' parameter")
+        if not filepath.endswith(".png"):
+            filepath += ".png"
+        return {"filepath": filepath}
+
+    # Blueprint commands
+
+    def _blueprint(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Return the blueprint named in ``params``, or the error to answer with."""
+        name = params.get("blueprint_name")
+        if not name:
+            return None, self._error("Missing 'blueprint_name' parameter")
+        blueprint = self.blueprints.get(name)
+        if blueprint is None:
+            return None, self._error(f"Blueprint not found: {name}")
+        return blueprint, None
+
+    def _component(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Return the blueprint component named in ``params``, or the error to answer with."""
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return None, error
+        name = params.get("component_name")
+        if not name:
+            return None, self._error("Missing 'component_name' parameter")
+        component = blueprint["components"].get(name)
+        if component is None:
+            return None, self._error(f"Component not found: {name}")
+        return component, None
+
+    def _handle_create_blueprint(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if not name:
+            return self._error("Missing 'name' parameter")
+        if name in self.blueprints:
+            return self._error(f"Blueprint already exists: {name}")
+        path = BLUEPRINT_PATH + name
+        self.blueprints[name] = {
+            "name": name,
+            "path": path,
+            "parent_class": params.get("parent_class") or "Actor",
+            "components": {},
+            "nodes": {},
+            "links": [],
+            "variables": {},
+            "properties": {},
+            "compiled": False,
+        }
+        return {"name": name, "path": path}
+
+    def _handle_add_component_to_blueprint(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        component_type = params.get("component_type")
+        if not component_type:
+            return self._error("Missing 'component_type' parameter")
+        name = params.get("component_name")
+        if not name:
+            return self._error("Missing 'component_name' parameter")
+        # Accepted with or without the "U" prefix and "Component" suffix
+        base = component_type[:-len("Component")] if component_type.endswith("Component") else component_type
+        if base not in COMPONENT_TYPES and base.startswith("U") and base[1:] in COMPONENT_TYPES:
+            base = base[1:]
+        if base not in COMPONENT_TYPES:
+            return self._error(f"Unknown component type: {component_type}")
+        blueprint["components"][name] = {
+            "type": base + "Component",
+            "location": [float(v) for v in params.get("location") or [0.0, 0.0, 0.0]],
+            "rotation": [float(v) for v in params.get("rotation") or [0.0, 0.0, 0.0]],
+            "scale": [float(v) for v in params.get("scale") or [1.0, 1.0, 1.0]],
+            "properties": {},
+        }
+        blueprint["compiled"] = False
+        return {"component_name": name, "component_type": component_type}
+
+    def _handle_set_component_property(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        component, error = self._component(params)
+        if error is not None:
+            return error
+        property_name = params.get("property_name")
+        if not property_name:
+            return self._error("Missing 'property_name' parameter")
+        if "property_value" not in params:
+            return self._error("Missing 'property_value' parameter")
+        component["properties"][property_name] = params["property_value"]
+        return {"component": params["component_name"], "property": property_name, "success": True}
+
+    def _handle_set_physics_properties(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        component, error = self._component(params)
+        if error is not None:
+            return error
+        for key in ("simulate_physics", "gravity_enabled", "mass", "linear_damping", "angular_damping"):
+            if key in params:
+                component["properties"][key] = params[key]
+        return {"component": params["component_name"]}
+
+    def _handle_set_static_mesh_properties(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        component, error = self._component(params)
+        if error is not None:
+            return error
+        if component["type"] != "StaticMeshComponent":
+            return self._error("Component is not a static mesh component")
+        for key in ("static_mesh", "material"):
+            if key in params:
+                component["properties"][key] = params[key]
+        return {"component": params["component_name"]}
+
+    def _handle_compile_blueprint(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        blueprint["compiled"] = True
+        return {"name": blueprint["name"], "compiled": True}
+
+    def _handle_set_blueprint_property(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        property_name = params.get("property_name")
+        if not property_name:
+            return self._error("Missing 'property_name' parameter")
+        if "property_value" not in params:
+            return self._error("Missing 'property_value' parameter")
+        blueprint["properties"][property_name] = params["property_value"]
+        return {"property": property_name, "success": True}
+
+    # Blueprint node commands
+
+    def _add_node(self, blueprint: Dict[str, Any], node_type: str, **fields: Any) -> Dict[str, Any]:
+        node_id = _node_guid()
+        blueprint["nodes"][node_id] = {"type": node_type, **fields}
+        blueprint["compiled"] = False
+        return {"node_id": node_id}
+
+    def _handle_add_event_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        event_name = params.get("event_name")
+        if not event_name:
+            return self._error("Missing 'event_name' parameter")
+        return self._add_node(blueprint, "Event", event_name=event_name, position=params.get("node_position"))
+
+    def _handle_add_input_action_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        action_name = params.get("action_name")
+        if not action_name:
+            return self._error("Missing 'action_name' parameter")
+        return self._add_node(blueprint, "InputAction", action_name=action_name,
+                              position=params.get("node_position"))
+
+    def _handle_add_function_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        function_name = params.get("function_name")
+        if not function_name:
+            return self._error("Missing 'function_name' parameter")
+        return self._add_node(blueprint, "Function", function_name=function_name, target=params.get("target"),
+                              params=params.get("params") or {}, position=params.get("node_position"))
+
+    def _handle_add_component_reference_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        component_name = params.get("component_name")
+        if not component_name:
+            return self._error("Missing 'component_name' parameter")
+        return self._add_node(blueprint, "ComponentReference", component_name=component_name,
+                              position=params.get("node_position"))
+
+    def _handle_add_self_reference_node(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        return self._add_node(blueprint, "Self", position=params.get("node_position"))
+
+    def _handle_connect_blueprint_nodes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        for key in ("source_node_id", "target_node_id", "source_pin", "target_pin"):
+            if not params.get(key):
+                return self._error(f"Missing '{key}' parameter")
+        source, target = params["source_node_id"], params["target_node_id"]
+        if source not in blueprint["nodes"] or target not in blueprint["nodes"]:
+            return self._error("Source or target node not found")
+        blueprint["links"].append((source, params["source_pin"], target, params["target_pin"]))
+        blueprint["compiled"] = False
+        return {"source_node_id": source, "target_node_id": target}
+
+    def _handle_find_blueprint_nodes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        node_type = params.get("node_type")
+        if not node_type:
+            return self._error("Missing 'node_type' parameter")
+        # Like the plugin, only event nodes can be searched for
+        if node_type != "Event":
+            return {"node_guids": []}
+        event_name = params.get("event_name")
+        if not event_name:
+            return self._error("Missing 'event_name' parameter for Event node search")
+        return {"node_guids": [node_id for node_id, node in blueprint["nodes"].items()
+                               if node["type"] == "Event" and node["event_name"] == event_name]}
+
+    def _handle_add_blueprint_variable(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        blueprint, error = self._blueprint(params)
+        if error is not None:
+            return error
+        name = params.get("variable_name")
+        if not name:
+            return self._error("Missing 'variable_name' parameter")
+        variable_type = params.get("variable_type")
+        if not variable_type:
+            return self._error("Missing 'variable_type' parameter")
+        if variable_type not in VARIABLE_TYPES:
+            return self._error(f"Unsupported variable type: {variable_type}")
+        blueprint["variables"][name] = {"type": variable_type, "is_exposed": bool(params.get("is_exposed", False))}
+        blueprint["compiled"] = False
+        return {"variable_name": name, "variable_type": variable_type}
+
+    # Project commands
+
+    def _handle_create_input_mapping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        action_name = params.get("action_name")
+        if not action_name:
+            return self._error("Missing 'action_name' parameter")
+        key = params.get("key")
+        if not key:
+            return self._error("Missing 'key' parameter")
+        self.input_mappings.append({
+            "action_name": action_name,
+            "key": key,
+            **{modifier: bool(params.get(modifier, False)) for modifier in ("shift", "ctrl", "alt", "cmd")},
+        })
+        return {"action_name": action_name, "key": key}
+
+    # Python
+
+    def _handle_execute_python_script(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        script = params.get("script")
+        if not script:
+            return self._error("Missing 'script' parameter")
+        self.python_scripts.append(script)
+        scripted = self.python_results.get(script)
+        if scripted is None:
+            return {"output": ""}
+        if scripted["duration"]:
+            time.sleep(scripted["duration"])
+        if scripted["error"] is not None:
+            return self._error(scripted["error"])
+        result = {"output": scripted["output"]}
+        if scripted["result"] is not None:
+            result["result"] = scripted["result"]
+        return result
+
+
+class ReplayEditor(FakeUnrealEditor):
+    """Stand-in editor that answers with the responses of a capture file.
+
+    Each command is answered with the next unused response recorded for the
+    same command and parameters, falling back to the last response recorded
+    for the command type. With ``pace`` set, each answer takes as long as it
+    did when captured (scaled by ``speed``): the plugin's reported execution
+    time on the game thread, and the rest of the round trip off it.
+    """
+
+    def __init__(self, path: str, pace: bool = True, speed: float = 1.0, **options):
+        """
+        Args:
+            path: Capture file written by a TrafficRecorder
+            pace: Answer after the recorded round trip time rather than at once
+            speed: Factor applied to recorded times, e.g. 0.5 to replay twice as fast
+            options: FakeUnrealEditor options, e.g. the framing and codecs to accept
+        """
+        super().__init__(**options)
+        self.pace = pace
+        self.speed = speed
+        self.exchanges: Dict[Tuple[str, bytes], Deque[Dict[str, Any]]] = {}
+        self._last_by_command: Dict[str, Dict[str, Any]] = {}
+        self._replay_lock = threading.Lock()
+        self.exchanges_loaded = 0
+        self.matched = 0
+        self.fallbacks = 0
+        self.misses = 0
+        for exchange in read_capture(path):
+            self.exchanges.setdefault(self._key(exchange["command"], exchange["params"]), deque()).append(exchange)
+            self._last_by_command[exchange["command"]] = exchange
+            self.exchanges_loaded += 1
+
+    @staticmethod
+    def _key(command: str, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        return command, json_dumps(params or {}, sort_keys=True)
+
+    def _take(self, command: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the recorded exchange answering a command, if any."""
+        with self._replay_lock:
+            recorded = self.exchanges.get(self._key(command, params))
+            if recorded:
+                self.matched += 1
+                # The last response keeps answering repeats beyond the recorded count
+                return recorded.popleft() if len(recorded) > 1 else recorded[0]
+            exchange = self._last_by_command.get(command)
+            if exchange is not None:
+                self.fallbacks += 1
+            elif command != "ping":
+                self.misses += 1
+            return exchange
+
+    def execute(self, command: str, params: Dict[str, Any],
+                timing: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        exchange = self._take(command, params)
+        if exchange is None:
+            if command == "ping":
+                return super().execute(command, params, timing)
+            return {"status": "error", "error": f"No recorded response for {command}"}
+
+        response = dict(exchange["response"] or {"status": "error", "error": "No response from Unreal"})
+        recorded_timing = response.pop("timing", None) or {}
+        on_game_thread = 0.0
+        if self.pace:
+            elapsed = exchange["elapsed"] * self.speed
+            on_game_thread = min(recorded_timing.get("execute_ms", 0.0) / 1000 * self.speed, elapsed)
+            time.sleep(elapsed - on_game_thread)
+
+        queued_at = time.perf_counter()
+        started_at, finished_at = self.game_thread.call(self._occupy_game_thread, on_game_thread)
+        if timing is not None:
+            timing["queue_ms"] = (started_at - queued_at) * 1000
+            timing["execute_ms"] = (finished_at - started_at) * 1000
+        return response
+
+    def _occupy_game_thread(self, seconds: float) -> Tuple[float, float]:
+        started_at = time.perf_counter()
+        self.commands_handled += 1
+        if seconds > 0:
+            time.sleep(seconds)
+        return started_at, time.perf_counter()
+
+    def stats(self) -> Dict[str, int]:
+        """Return how the commands received matched the capture."""
+        with self._replay_lock:
+            return {
+                "loaded": self.exchanges_loaded,
+                "matched": self.matched,
+                "fallbacks": self.fallbacks,
+                "misses": self.misses,
+            }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake Unreal editor for local testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=55557)
+    parser.add_argument("--actors", type=int, default=100, help="Number of generated actors")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-command latency in seconds")
+    parser.add_argument("--command-latency", type=parse_command_latencies, default={},
+                        help="Latency overrides by command, e.g. get_actors_in_level=0.05,ping=0")
+    parser.add_argument("--execution-time", type=parse_command_latencies, default={},
+                        help="Game thread time by command, e.g. compile_blueprint=0.2")
+    parser.add_argument("--frame-time", type=float, default=0.0,
+                        help="Seconds per editor frame, e.g. 0.016 for 60 fps; 0 runs commands immediately")
+    parser.add_argument("--replay", default="", help="Answer with the responses of this capture file instead")
+    parser.add_argument("--no-pace", action="store_true", help="With --replay, answer at once")
+    parser.add_argument("--speed", type=float, default=1.0, help="With --replay, factor applied to recorded times")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.replay:
+        editor = ReplayEditor(args.replay, pace=not args.no_pace, speed=args.speed, host=args.host, port=args.port,
+                              frame_time=args.frame_time)
+        logger.info(f"Replaying {editor.exchanges_loaded} exchanges from {args.replay}")
+    else:
+        editor = FakeUnrealEditor(args.host, args.port, command_latency=args.latency,
+                                  command_latencies=args.command_latency, execution_times=args.execution_time,
+                                  frame_time=args.frame_time)
+        editor.populate(args.actors)
+    editor.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        editor.stop()
+        if args.replay:
+            logger.info(f"Replay stats: {editor.stats()}")
@@ -0,0 +1,55 @@
+"""
+Observability for Unreal MCP.
+
+This package holds the logging pipeline, the metrics and the tracing of the
+MCP server.
+"""
+
+from observability.logs import Payload, configure_logging, parse_sampling, payload
+from observability.metrics import (
+    CONTENT_TYPE,
+    CommandMetrics,
+    CommandTimer,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from observability.tracing import (
+    KIND_CLIENT,
+    KIND_INTERNAL,
+    KIND_SERVER,
+    NO_SPAN,
+    JsonlSpanExporter,
+    Span,
+    Tracer,
+    current_span,
+    current_trace_id,
+    detach,
+    trace_tools,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "CommandMetrics",
+    "CommandTimer",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "JsonlSpanExporter",
+    "KIND_CLIENT",
+    "KIND_INTERNAL",
+    "KIND_SERVER",
+    "MetricsRegistry",
+    "NO_SPAN",
+    "Payload",
+    "Span",
+    "Tracer",
+    "configure_logging",
+    "current_span",
+    "current_trace_id",
+    "detach",
+    "parse_sampling",
+    "payload",
+    "trace_tools",
+]
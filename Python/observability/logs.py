@@ -0,0 +1,326 @@
+"""
+Logging pipeline for Unreal MCP.
+
+Tools and the connection layer log every request and response. Formatting
+and writing multi-megabyte scripts and actor listings on the request path
+would stall commands, so records only go onto a bounded queue there, and a
+``QueueListener`` thread formats them and writes them to a size-rotated file.
+
+Payloads are logged through ``payload()``, which defers rendering to the
+listener thread and truncates large values to a summary. Payloads can be
+sampled per logger and level, so that e.g. only 1% of INFO responses are
+written in full while their log lines are all kept.
+
+Records logged under a trace span carry its trace id, to correlate them with
+the exported spans.
+"""
+
+import logging
+import logging.handlers
+import queue
+import random
+import reprlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from observability.tracing import current_trace_id
+
+# Characters of a payload written before it is summarized
+DEFAULT_PAYLOAD_LIMIT = 2048
+
+# Records waiting for the listener before new ones are dropped
+DEFAULT_QUEUE_SIZE = 10000
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(trace)s%(message)s'
+
+# Summary of a payload over the limit: the first few items at each level
+_SUMMARY = reprlib.Repr()
+_SUMMARY.maxlevel = 4
+_SUMMARY.maxdict = 8
+_SUMMARY.maxlist = 4
+_SUMMARY.maxtuple = 4
+_SUMMARY.maxstring = 120
+_SUMMARY.maxother = 120
+
+# Bytes counted for a scalar when estimating a payload's size
+_SCALAR_SIZE = 8
+
+
+class Payload:
+    """A logged value that renders as its repr, truncated or summarized if large.
+
+    Rendering happens when the record is formatted, on the listener thread.
+    The value is frozen when the record is queued, so that later changes to
+    it don't show up in the log line.
+    """
+
+    __slots__ = ("value", "limit", "sampled", "_text")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit
+        # Cleared by PayloadSampler when the payload is not sampled
+        self.sampled = True
+        # Set by freeze when the value is rendered before the record is queued
+        self._text: Optional[str] = None
+
+    def freeze(self):
+        """Copy a mutable value, or render it now if it is too large to copy cheaply.
+
+        Both cost at most about ``limit`` characters of work, since only the
+        summary of a large value is rendered.
+        """
+        value = self.value
+        if not self.sampled or self._text is not None or isinstance(value, (str, bytes)):
+            return
+        limit = self.limit if self.limit is not None else _payload_limit
+        if isinstance(value, (dict, list, tuple, set, frozenset, bytearray)) and _fits(value, limit):
+            self.value = _copy(value)
+        else:
+            self._text = str(self)
+
+    def __str__(self) -> str:
+        if self._text is not None:
+            return self._text
+        value = self.value
+        if not self.sampled:
+            return f"<{type(value).__name__} payload not sampled>"
+        limit = self.limit if self.limit is not None else _payload_limit
+        if isinstance(value, (str, bytes, bytearray)):
+            if len(value) <= limit:
+                return str(value) if isinstance(value, str) else repr(value)
+            head = value[:limit]
+            return f"{head if isinstance(head, str) else repr(head)}... [truncated, {len(value)} total]"
+        if _fits(value, limit):
+            return repr(value)
+        return f"{_SUMMARY.repr(value)} [summarized, over {limit} chars]"
+
+
+def payload(value: Any, limit: Optional[int] = None) -> Payload:
+    """Wrap a request or response for logging.
+
+    Pass the result as a ``%s`` argument rather than formatting it into the
+    message, so nothing is rendered unless the record is written:
+
+        logger.info("Complete response from Unreal: %s", payload(response))
+    """
+    return Payload(value, limit)
+
+
+def _copy(value: Any) -> Any:
+    """Copy the containers of a small payload, keeping scalars as they are."""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value)(value)
+    if isinstance(value, bytearray):
+        return bytearray(value)
+    return value
+
+
+def _fits(value: Any, limit: int) -> bool:
+    """Whether ``value`` renders in about ``limit`` characters, without walking more of it."""
+    budget = limit
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            budget -= 2 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            budget -= 2 * len(item)
+            stack.extend(item)
+        elif isinstance(item, (str, bytes, bytearray)):
+            budget -= len(item) + 2
+        else:
+            budget -= _SCALAR_SIZE
+        if budget < 0:
+            return False
+    return True
+
+
+def parse_sampling(spec: str) -> Dict[Tuple[str, str], float]:
+    """Parse ``"logger:LEVEL=rate,..."`` as used by UNREAL_LOG_PAYLOAD_SAMPLING.
+
+    ``logger`` or ``LEVEL`` may be ``*``; a bare ``LEVEL=rate`` applies to every logger.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is not between 0 and 1
+    """
+    rates = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        target, separator, rate = entry.partition("=")
+        if not separator or not target.strip():
+            raise ValueError(f"Invalid payload sampling entry '{entry}', expected logger:LEVEL=rate")
+        name, _, level = target.strip().rpartition(":")
+        level = level.upper()
+        if level != "*" and not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level '{level}' in payload sampling entry '{entry}'")
+        value = float(rate)
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Invalid payload sampling rate in '{entry}', expected 0 to 1")
+        rates[(name or "*", level)] = value
+    return rates
+
+
+class PayloadSampler(logging.Filter):
+    """Keeps every record but only a sample of their payloads.
+
+    The rate of a record comes from the most specific entry matching its
+    logger (or one of the logger's parents) and level, falling back to ``*``.
+    Payloads that are not sampled render as a short placeholder.
+    """
+
+    def __init__(self, rates: Dict[Tuple[str, str], float], rng: Optional[random.Random] = None):
+        super().__init__()
+        self.rates = dict(rates)
+        self._rng = rng or random.Random()
+        self._resolved: Dict[Tuple[str, str], float] = {}
+
+    def rate(self, name: str, level: str) -> float:
+        """Return the share of payloads kept for records of logger ``name`` at ``level``."""
+        key = (name, level)
+        rate = self._resolved.get(key)
+        if rate is None:
+            rate = self._lookup(name, level)
+            self._resolved[key] = rate
+        return rate
+
+    def _lookup(self, name: str, level: str) -> float:
+        candidates = []
+        while name:
+            candidates.append(name)
+            name = name.rpartition(".")[0]
+        candidates.append("*")
+        for candidate in candidates:
+            for key in ((candidate, level), (candidate, "*")):
+                if key in self.rates:
+                    return self.rates[key]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        if not args or not isinstance(args, tuple):
+            return True
+        payloads = [arg for arg in args if isinstance(arg, Payload)]
+        if payloads:
+            rate = self.rate(record.name, record.levelname)
+            if rate < 1.0 and self._rng.random() >= rate:
+                for arg in payloads:
+                    arg.sampled = False
+        return True
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queues records without formatting them, dropping records when the queue is full.
+
+    The stock handler renders each message on the calling thread; this one
+    leaves that to the listener so that the request path only pays for a
+    queue put.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self._stats_lock = threading.Lock()
+        self.queued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Exceptions are rendered now, since their traceback objects hold frames alive
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        # Payloads are rendered on the listener thread; freeze them before the caller changes them
+        if isinstance(record.args, tuple):
+            for arg in record.args:
+                if isinstance(arg, Payload):
+                    arg.freeze()
+        # Read here, in the task that logged the record
+        trace_id = current_trace_id()
+        if trace_id is not None:
+            record.trace = f"[trace {trace_id}] "
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return
+        with self._stats_lock:
+            self.queued += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue counters for diagnostics."""
+        with self._stats_lock:
+            return {
+                "queued": self.queued,
+                "dropped": self.dropped,
+                "backlog": self.queue.qsize(),
+            }
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than failing to stop when the queue is full
+        self.queue.put(self._sentinel)
+
+
+_payload_limit = DEFAULT_PAYLOAD_LIMIT
+
+
+def configure_logging(
+    path: str,
+    level: int = logging.DEBUG,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    payload_limit: int = DEFAULT_PAYLOAD_LIMIT,
+    sampling: Optional[Dict[Tuple[str, str], float]] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Tuple[logging.handlers.QueueListener, BoundedQueueHandler]:
+    """Send root logging through a queue to a rotating file.
+
+    Args:
+        path: Log file
+        level: Root logger level
+        max_bytes: Size at which the file is rotated, 0 never rotates
+        backup_count: Rotated files kept
+        payload_limit: Characters of a payload written before it is summarized
+        sampling: Payload sampling rates by (logger, level), see parse_sampling
+        queue_size: Records buffered for the writer thread before new ones are dropped
+
+    Returns:
+        The started listener, to be stopped on shutdown, and the queue handler
+    """
+    global _payload_limit
+    _payload_limit = payload_limit
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, defaults={"trace": ""}))
+
+    queue_handler = BoundedQueueHandler(queue.Queue(queue_size))
+    if sampling:
+        queue_handler.addFilter(PayloadSampler(sampling))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = _QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener, queue_handler
@@ -0,0 +1,425 @@
+"""
+Metrics for Unreal MCP.
+
+A small in-process registry of counters, gauges and histograms, rendered in
+the Prometheus text exposition format at the server's ``/metrics`` route.
+
+``CommandMetrics`` holds the connection's metric families. Each command sent
+to Unreal is timed with a ``CommandTimer`` that splits its latency into
+phases:
+
+- ``queue`` - waiting for a slot from the command scheduler, if there is one
+- ``connect`` - waiting for a stream, opening and negotiating one if needed
+- ``send`` - encoding, framing and writing the request
+- ``ttfb`` - from the end of the send to the first byte of the response
+- ``receive`` - from the first byte to the complete response frame
+- ``parse`` - decoding the response
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from observability.tracing import NO_SPAN
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PHASES = ("queue", "connect", "send", "ttfb", "receive", "parse")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(label) for label in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Gauge(_Metric):
+    """A value per label set that can go up and down, or be read on demand."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float], *labels: str):
+        """Read the value from ``function`` whenever metrics are rendered."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def remove(self, *labels: str):
+        """Stop reporting a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values.pop(key, None)
+            self._functions.pop(key, None)
+
+    def value(self, *labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        return function() if function is not None else self._values.get(key, 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            values[key] = function()
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Per label set: bucket counts (not cumulative), sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * len(self.buckets), [0.0])
+            counts, total = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            total[0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _labels(self.labelnames, key, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_number(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """The metric families exposed together at one endpoint."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class CommandTimer:
+    """Phase timings of one command.
+
+    They are recorded into CommandMetrics when the command finishes, and each
+    phase is recorded as a child of ``span`` when it ends.
+    """
+
+    __slots__ = ("command", "phases", "bytes_sent", "bytes_received", "timed_out", "span", "_metrics", "_start", "_last")
+
+    def __init__(self, metrics: Optional["CommandMetrics"], command: str, span=NO_SPAN):
+        self.command = command
+        self.phases: Dict[str, float] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.timed_out = False
+        self.span = span
+        self._metrics = metrics
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, phase: str, now: Optional[float] = None) -> float:
+        """Close ``phase`` at ``now``, measured from the end of the previous phase."""
+        # A time from before the previous phase ended (e.g. a pipelined response
+        # that arrived early) closes the phase with zero length
+        now = max(time.perf_counter() if now is None else now, self._last)
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self.span.child(f"unreal.{phase}", self._last, now)
+        self._last = now
+        return now
+
+    def finish(self, error: bool = False):
+        """Record the command's phases, total latency and outcome."""
+        if self._metrics is not None:
+            self._metrics.record(self, time.perf_counter() - self._start, error)
+
+
+class CommandMetrics:
+    """Latency histograms and counters of the commands sent to Unreal."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.phase_seconds = registry.histogram(
+            "unreal_command_phase_seconds", "Time spent in each phase of a command sent to Unreal",
+            ("command", "phase"))
+        self.seconds = registry.histogram(
+            "unreal_command_seconds", "Latency of commands sent to Unreal", ("command",))
+        self.errors = registry.counter(
+            "unreal_command_errors_total", "Commands that failed, including timeouts", ("command",))
+        self.timeouts = registry.counter(
+            "unreal_command_timeouts_total", "Commands that got no response in time", ("command",))
+        self.bytes_sent = registry.counter(
+            "unreal_command_bytes_sent_total", "Bytes of command frames written to Unreal", ("command",))
+        self.bytes_received = registry.counter(
+            "unreal_command_bytes_received_total", "Bytes of response payloads read from Unreal", ("command",))
+        self.connections = registry.counter(
+            "unreal_connections_opened_total", "Streams opened to Unreal")
+        self.reconnects = registry.counter(
+            "unreal_reconnects_total", "Streams opened to replace ones lost to errors or timeouts")
+        self.retries = registry.counter(
+            "unreal_command_retries_total", "Idempotent reads sent again after a connection failure", ("command",))
+        self.timeout_seconds = registry.gauge(
+            "unreal_command_timeout_seconds", "Current adaptive response timeout", ("command",))
+        self.rejections = registry.counter(
+            "unreal_circuit_breaker_rejections_total", "Commands failed fast while the circuit breaker was open",
+            ("command",))
+        self.breaker_opened = registry.counter(
+            "unreal_circuit_breaker_opened_total", "Times the circuit breaker opened")
+        self.breaker_state = registry.gauge(
+            "unreal_circuit_breaker_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open")
+        self.ready = registry.gauge(
+            "unreal_ready", "1 if the last health check reached Unreal")
+        self.live = registry.gauge(
+            "unreal_live", "1 while health checks run on schedule")
+        self.health_check_seconds = registry.gauge(
+            "unreal_health_check_seconds", "Duration of the last successful health check")
+        self.scheduler_queued = registry.gauge(
+            "unreal_scheduler_queue_depth", "Commands waiting for a slot on the editor", ("editor", "priority"))
+        self.scheduler_running = registry.gauge(
+            "unreal_scheduler_running", "Commands holding a slot on the editor", ("editor", "priority"))
+        self.scheduler_wait = registry.histogram(
+            "unreal_scheduler_wait_seconds", "Time commands waited for a slot", ("priority",))
+        self.scheduler_rejected = registry.counter(
+            "unreal_scheduler_rejected_total", "Commands that waited longer than their queue budget", ("priority",))
+        self.compression_frames = registry.counter(
+            "unreal_compression_frames_total", "Frames compressed (out) or inflated (in)", ("direction",))
+        self.compression_incompressible = registry.counter(
+            "unreal_compression_incompressible_total", "Payloads over the threshold sent as-is because they didn't shrink")
+        self.compression_raw_bytes = registry.counter(
+            "unreal_compression_raw_bytes_total", "Uncompressed payload bytes of compressed frames", ("direction",))
+        self.compression_wire_bytes = registry.counter(
+            "unreal_compression_wire_bytes_total", "Bytes of compressed frames on the wire", ("direction",))
+        self.compression_seconds = registry.histogram(
+            "unreal_compression_seconds", "Time spent compressing or inflating one frame", ("direction",))
+        self.admission_in_flight = registry.gauge(
+            "unreal_admission_in_flight", "Commands holding an admission slot, summed over sessions", ("scope",))
+        self.admission_queued = registry.gauge(
+            "unreal_admission_queued", "Commands waiting for an admission slot", ("scope",))
+        self.admission_rejected = registry.counter(
+            "unreal_admission_rejected_total", "Commands turned away as busy because a queue was full or timed out",
+            ("scope",))
+        self.editor_ready = registry.gauge(
+            "unreal_editor_ready", "1 if the editor's last health check reached it and its breaker is not open",
+            ("editor",))
+        self.editor_outstanding = registry.gauge(
+            "unreal_editor_outstanding", "Commands sent to the editor and not yet answered", ("editor",))
+        self.editor_sessions = registry.gauge(
+            "unreal_editor_sessions", "MCP client sessions bound to the editor", ("editor",))
+        self.editor_latency = registry.gauge(
+            "unreal_editor_latency_seconds", "Moving average of the editor's successful command latency",
+            ("editor",))
+        self.editor_breaker_state = registry.gauge(
+            "unreal_editor_breaker_state", "Editor circuit breaker state: 0 closed, 1 half-open, 2 open",
+            ("editor",))
+        self.editor_commands = registry.counter(
+            "unreal_editor_commands_total", "Commands routed to the editor", ("editor",))
+
+    def start(self, command: str, span=NO_SPAN) -> CommandTimer:
+        """Start timing one command, recording its phases under ``span``."""
+        return CommandTimer(self, command, span)
+
+    def record(self, timer: CommandTimer, seconds: float, error: bool):
+        command = timer.command
+        for phase, phase_seconds in timer.phases.items():
+            self.phase_seconds.observe(phase_seconds, command, phase)
+        self.seconds.observe(seconds, command)
+        if error or timer.timed_out:
+            self.errors.inc(command)
+        if timer.timed_out:
+            self.timeouts.inc(command)
+        if timer.bytes_sent:
+            self.bytes_sent.inc(command, amount=timer.bytes_sent)
+        if timer.bytes_received:
+            self.bytes_received.inc(command, amount=timer.bytes_received)
+
+    def watch_breaker(self, breaker):
+        """Report a CircuitBreaker's state in unreal_circuit_breaker_state."""
+        self.breaker_state.set_function(lambda: breaker.state)
+
+    def watch_health(self, monitor):
+        """Report a HealthMonitor's readiness, liveness and check latency."""
+        self.ready.set_function(lambda: 1 if monitor.ready else 0)
+        self.live.set_function(lambda: 1 if monitor.live else 0)
+        self.health_check_seconds.set_function(lambda: monitor.latency or 0.0)
+
+    def watch_scheduler(self, scheduler):
+        """Report a CommandScheduler's queue depth and running commands per priority class."""
+        for priority, name in enumerate(scheduler.classes):
+            self.scheduler_queued.set_function(lambda priority=priority: scheduler.queued(priority),
+                                               scheduler.name, name)
+            self.scheduler_running.set_function(lambda priority=priority: scheduler.running(priority),
+                                                scheduler.name, name)
+
+    def watch_admission(self, limiter):
+        """Report an AdmissionLimiter's in-flight and queued commands per scope."""
+        for scope in limiter.scopes:
+            self.admission_in_flight.set_function(lambda scope=scope: limiter.in_flight(scope), scope)
+            self.admission_queued.set_function(lambda scope=scope: limiter.queued(scope), scope)
+            self.admission_rejected.inc(scope, amount=0)
+
+    def watch_editors(self, pool):
+        """Report an EditorPool's overall health, and its most severe breaker state."""
+        self.watch_health(pool)
+        self.breaker_state.set_function(lambda: pool.breaker_state)
+
+    def editor_added(self, instance):
+        """Report an EditorInstance's health, load and scheduler queues, labelled with its name."""
+        name = instance.name
+        self.editor_ready.set_function(lambda: 1 if instance.ready else 0, name)
+        self.editor_outstanding.set_function(lambda: instance.outstanding, name)
+        self.editor_sessions.set_function(lambda: instance.sessions, name)
+        self.editor_latency.set_function(lambda: instance.latency or 0.0, name)
+        self.editor_breaker_state.set_function(lambda: instance.breaker_state, name)
+        self.editor_commands.inc(name, amount=0)
+        if instance.connection.scheduler is not None:
+            self.watch_scheduler(instance.connection.scheduler)
+
+    def editor_removed(self, instance):
+        name = instance.name
+        for gauge in (self.editor_ready, self.editor_outstanding, self.editor_sessions, self.editor_latency,
+                      self.editor_breaker_state):
+            gauge.remove(name)
+        scheduler = instance.connection.scheduler
+        if scheduler is not None:
+            for priority in scheduler.classes:
+                self.scheduler_queued.remove(scheduler.name, priority)
+                self.scheduler_running.remove(scheduler.name, priority)
+
+    def connection_opened(self, reconnect: bool):
+        self.connections.inc()
+        if reconnect:
+            self.reconnects.inc()
+
+    def frame_compressed(self, raw_size: int, compressed_size: int, seconds: float):
+        self.compression_seconds.observe(seconds, "out")
+        if compressed_size >= raw_size:
+            self.compression_incompressible.inc()
+            return
+        self.compression_frames.inc("out")
+        self.compression_raw_bytes.inc("out", amount=raw_size)
+        self.compression_wire_bytes.inc("out", amount=compressed_size)
+
+    def frame_inflated(self, raw_size: int, compressed_size: int, seconds: float):
+        self.compression_seconds.observe(seconds, "in")
+        self.compression_frames.inc("in")
+        self.compression_raw_bytes.inc("in", amount=raw_size)
+        self.compression_wire_bytes.inc("in", amount=compressed_size)
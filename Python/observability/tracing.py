@@ -0,0 +1,337 @@
+"""
+Tracing for Unreal MCP.
+
+Lightweight spans that follow a tool call from the MCP layer down to the
+socket: the tool itself, cache and scene mirror lookups, each command sent
+to Unreal and its connect, send, ttfb, receive and parse phases, and the
+post-processing of the response.
+
+The current span is kept in a context variable, so spans started in the same
+task nest without being passed around. The trace id doubles as a
+correlation id: it is added to the log records written under the span, and
+sent to Unreal as a W3C ``traceparent`` with each command.
+
+Ended spans are queued and written by a background thread to a JSONL file,
+one OTLP/JSON ``ExportTraceServiceRequest`` per line, the format of the
+OpenTelemetry Collector's file exporter.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+_STATUS_ERROR = 2
+
+# Ended spans waiting for the exporter before new ones are dropped
+DEFAULT_QUEUE_SIZE = 10000
+
+# Spans written per line of the JSONL file
+DEFAULT_BATCH_SIZE = 512
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("unreal_mcp_span", default=None)
+
+
+def current_span() -> Optional["Span"]:
+    """Return the span of the running task, if any."""
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the trace id of the running task's span, if any."""
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+def detach():
+    """Start the running task outside of any trace.
+
+    Background tasks copy the context of the task that created them; call
+    this first thing in a long-lived task so that its logs and spans are not
+    attributed to that task's trace.
+    """
+    _current.set(None)
+
+
+class Span:
+    """A timed operation within a trace. Use as a context manager."""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start", "end_time",
+                 "attributes", "error", "_tracer", "_token")
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, kind: int, parent: Optional["Span"],
+                 attributes: Optional[Dict[str, Any]], start: Optional[float] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        # perf_counter() times, converted to Unix time on export
+        self.start = time.perf_counter() if start is None else start
+        self.end_time: Optional[float] = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        """The span's W3C trace context header value."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        """Mark the span as failed."""
+        self.error = message
+
+    def child(self, name: str, start: float, end: float, attributes: Optional[Dict[str, Any]] = None):
+        """Record an already finished child span between two perf_counter() times."""
+        span = Span(self._tracer, name, KIND_INTERNAL, self, attributes, start)
+        span.finish(end)
+
+    def finish(self, end: Optional[float] = None):
+        """End the span and queue it for export. Later calls are ignored."""
+        if self.end_time is None:
+            self.end_time = time.perf_counter() if end is None else end
+            self._tracer.exporter.export(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__
+        _current.reset(self._token)
+        self.finish()
+
+
+class _NoSpan:
+    """Stands in for a span when tracing is off."""
+
+    __slots__ = ()
+
+    recording = False
+    trace_id = None
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+    def child(self, name: str, start: float, end: float, attributes: Optional[Dict[str, Any]] = None):
+        pass
+
+    def finish(self, end: Optional[float] = None):
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class JsonlSpanExporter:
+    """Writes ended spans to a JSONL file from a background thread.
+
+    Spans are only queued on the request path; if the writer falls behind by
+    more than ``queue_size`` spans, new ones are dropped and counted.
+    """
+
+    def __init__(self, path: str, service_name: str = "unreal-mcp",
+                 queue_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        # Offset from perf_counter() to Unix time, in seconds
+        self._epoch_offset = time.time() - time.perf_counter()
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(queue_size)
+        self._stats_lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="UnrealMCPSpanExporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        """Queue an ended span, dropping it if the queue is full."""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            span = self._queue.get()
+            if span is None:
+                break
+            batch = [span]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is None:
+                    stop = True
+                    break
+                batch.append(span)
+            self._write(batch)
+            if stop:
+                break
+        self._file.close()
+
+    def _write(self, spans: List[Span]):
+        try:
+            self._file.write(json.dumps(self.to_otlp(spans), separators=(",", ":")) + "\n")
+            self._file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to export {len(spans)} span(s): {e}")
+            return
+        with self._stats_lock:
+            self.exported += len(spans)
+
+    def to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        """Shape spans as an OTLP/JSON ExportTraceServiceRequest."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "unreal-mcp"},
+                    "spans": [self._otlp_span(span) for span in spans],
+                }],
+            }],
+        }
+
+    def _otlp_span(self, span: Span) -> Dict[str, Any]:
+        shaped = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(int((span.start + self._epoch_offset) * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time + self._epoch_offset) * 1e9)),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": _STATUS_ERROR, "message": span.error} if span.error is not None else {},
+        }
+        if span.parent_id is not None:
+            shaped["parentSpanId"] = span.parent_id
+        return shaped
+
+    def shutdown(self):
+        """Write the spans still queued and close the file."""
+        if self._thread.is_alive():
+            # Wait for room rather than losing the sentinel when the queue is full
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return export counters for diagnostics."""
+        with self._stats_lock:
+            return {
+                "exported": self.exported,
+                "dropped": self.dropped,
+                "backlog": self._queue.qsize(),
+            }
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    shaped = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        shaped.append({"key": key, "value": typed})
+    return shaped
+
+
+class Tracer:
+    """Starts spans under the running task's current span."""
+
+    def __init__(self, exporter: JsonlSpanExporter):
+        self.exporter = exporter
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None, kind: int = KIND_INTERNAL) -> Span:
+        """Start a span, a child of the current one if any; enter it to make it current."""
+        return Span(self, name, kind, _current.get(), attributes)
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+def trace_tools(mcp, tracer: Tracer):
+    """Wrap every tool registered on ``mcp`` from now on in a span.
+
+    The span is named after the tool and is the root of the trace of the
+    call. Tools report failures as ``{"success": False, "message": ...}``,
+    which marks the span as failed.
+    """
+    register = mcp.tool
+
+    def tool(*args, **kwargs) -> Callable:
+        decorator = register(*args, **kwargs)
+
+        def wrap(fn: Callable) -> Callable:
+            return decorator(_traced_tool(fn, tracer))
+
+        return wrap
+
+    mcp.tool = tool
+
+
+def _traced_tool(fn: Callable, tracer: Tracer) -> Callable:
+    attributes = {"mcp.tool.name": fn.__name__}
+
+    # functools.wraps keeps the signature FastMCP builds the tool's schema from
+    @functools.wraps(fn)
+    async def traced(*args, **kwargs):
+        with tracer.span(f"tools/call {fn.__name__}", attributes, KIND_SERVER) as span:
+            request_id = _request_id(kwargs.get("ctx"))
+            if request_id is not None:
+                span.set_attribute("mcp.request.id", request_id)
+            result = await fn(*args, **kwargs)
+            if isinstance(result, dict) and result.get("success") is False:
+                span.set_error(str(result.get("message", "")))
+            return result
+
+    return traced
+
+
+def _request_id(ctx) -> Optional[str]:
+    """Return the MCP request id of a tool call's context, if it has one."""
+    try:
+        request_id = getattr(ctx, "request_id", None)
+    except ValueError:
+        # Context used outside of a request
+        return None
+    return str(request_id) if request_id is not None else None
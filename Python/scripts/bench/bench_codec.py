@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Benchmark the wire codecs on realistic Unreal MCP payloads.
+
+First encodes and decodes representative messages with every installed codec
+and reports their size and throughput: an actor listing (float-heavy
+transform arrays) and a component property map (nested objects of mixed
+types).
+
+Then lists the level of a local FakeUnrealEditor through AsyncUnrealConnection
+once per codec, to measure the end-to-end effect on round trips. Binary codecs
+need their optional package (cbor2, msgpack); missing ones are skipped.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from connection import AsyncUnrealConnection
+from connection.codec import CODEC_JSON, CODECS
+from fake_editor import FakeUnrealEditor
+
+
+def actor_listing(count: int) -> dict:
+    """Build a get_actors_in_level response with ``count`` actors at random transforms."""
+    rng = random.Random(0)
+    actors = []
+    for index in range(count):
+        actors.append({
+            "name": f"StaticMeshActor_{index}",
+            "class": "StaticMeshActor",
+            "label": f"SM_Rock_{index}",
+            "location": [rng.uniform(-1e4, 1e4) for _ in range(3)],
+            "rotation": [rng.uniform(-180, 180) for _ in range(3)],
+            "scale": [1.0, 1.0, rng.uniform(0.5, 2.0)],
+        })
+    return {"status": "success", "result": {"actors": actors}}
+
+
+def component_properties(count: int) -> dict:
+    """Build a response with ``count`` components, each with a typical property map."""
+    rng = random.Random(1)
+    components = {}
+    for index in range(count):
+        components[f"StaticMeshComponent_{index}"] = {
+            "class": "StaticMeshComponent",
+            "static_mesh": f"/Game/Meshes/SM_Prop_{index % 40}.SM_Prop_{index % 40}",
+            "relative_location": [rng.uniform(-500, 500) for _ in range(3)],
+            "relative_rotation": [rng.uniform(-180, 180) for _ in range(3)],
+            "relative_scale": [1.0, 1.0, 1.0],
+            "mobility": rng.choice(["Static", "Stationary", "Movable"]),
+            "simulate_physics": rng.random() < 0.2,
+            "mass_in_kg": rng.uniform(1, 500),
+            "collision_profile": "BlockAllDynamic",
+            "cast_shadow": True,
+            "materials": [f"/Game/Materials/M_{rng.randint(0, 99)}" for _ in range(rng.randint(1, 4))],
+        }
+    return {"status": "success", "result": {"blueprint": "BP_Level", "components": components}}
+
+
+def bench_payload(label: str, message: dict, min_time: float):
+    """Print encoded size and encode/decode throughput of ``message`` for every codec."""
+    json_size = len(CODECS[CODEC_JSON].encode(message))
+    print(f"\n{label} ({json_size / 1024:.1f} KB as JSON)")
+    print(f"{'codec':<10} {'size KB':>10} {'vs json':>8} {'encode MB/s':>12} {'decode MB/s':>12}")
+    for name, codec in CODECS.items():
+        payload = codec.encode(message)
+        encode_rate = _rate(lambda: codec.encode(message), len(payload), min_time)
+        decode_rate = _rate(lambda: codec.decode(payload), len(payload), min_time)
+        print(f"{name:<10} {len(payload) / 1024:>10.1f} {len(payload) / json_size:>8.2f} "
+              f"{encode_rate:>12.1f} {decode_rate:>12.1f}")
+
+
+def _rate(operation, size: int, min_time: float) -> float:
+    """Return the MB/s of ``operation`` over a payload of ``size`` bytes."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        operation()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return size * runs / elapsed / (1024 * 1024)
+
+
+async def bench_round_trips(actors: int, iterations: int):
+    """List the fake editor's level repeatedly with each codec and print latency stats."""
+    print(f"\n{iterations} x get_actors_in_level of {actors} actors through the fake editor")
+    with FakeUnrealEditor() as editor:
+        editor.populate(actors)
+        for name in CODECS:
+            codecs = () if name == CODEC_JSON else (name,)
+            unreal = AsyncUnrealConnection(editor.host, editor.port, codecs=codecs)
+            await unreal.connect()
+            latencies = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                response = await unreal.send_command("get_actors_in_level")
+                latencies.append(time.perf_counter() - start)
+                if not response or response.get("status") != "success":
+                    raise RuntimeError(f"Unexpected response: {response}")
+            await unreal.close()
+
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+            print(f"{name:<10} p50 {p50:>8.2f} ms   p95 {p95:>8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=5000, help="Actors in the listing payload")
+    parser.add_argument("--components", type=int, default=500, help="Components in the property map payload")
+    parser.add_argument("--iterations", type=int, default=50, help="Round trips per codec")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each operation")
+    args = parser.parse_args()
+
+    missing = {"cbor", "msgpack"} - set(CODECS)
+    if missing:
+        print(f"Skipping codecs whose package is not installed: {', '.join(sorted(missing))}")
+
+    bench_payload(f"Actor listing, {args.actors} actors", actor_listing(args.actors), args.min_time)
+    bench_payload(f"Component property map, {args.components} components",
+                  component_properties(args.components), args.min_time)
+    asyncio.run(bench_round_trips(args.actors, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
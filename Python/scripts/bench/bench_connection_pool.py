@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark pooled connections against connect-per-command.
+
+The legacy path reproduces the old behaviour of the server: get_unreal_connection()
+opens a socket, then send_command() closes it and opens another one before
+sending. The pooled path reuses keep-alive streams from AsyncUnrealConnection.
+
+Both run against a local FakeUnrealEditor. Use --connect-latency to emulate the
+handshake cost of a remote editor host.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from connection import AsyncUnrealConnection
+from fake_editor import FakeUnrealEditor
+
+
+def legacy_call(host: str, port: int, command: str, params: dict) -> dict:
+    """Send one command the way the server did before pooling: two handshakes."""
+    def open_socket():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(5)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.connect((host, port))
+        return sock
+
+    # get_unreal_connection() connected once...
+    open_socket().close()
+    # ...then send_command() reconnected before sending
+    sock = open_socket()
+    try:
+        sock.sendall(json.dumps({"type": command, "params": params}).encode("utf-8"))
+        chunks = []
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            try:
+                return json.loads(b"".join(chunks).decode("utf-8"))
+            except json.JSONDecodeError:
+                continue
+    finally:
+        sock.close()
+
+
+def check(response: dict):
+    if not response or response.get("status") != "success":
+        raise RuntimeError(f"Unexpected response: {response}")
+
+
+def report(label: str, latencies: list, iterations: int, wall: float):
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{label:<10} {iterations / wall:>10.1f} cmd/s   p50 {p50:>7.3f} ms   p95 {p95:>7.3f} ms")
+
+
+def run(label: str, call, iterations: int, concurrency: int):
+    """Run ``call`` ``iterations`` times over ``concurrency`` threads and print latency stats."""
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        check(call())
+        latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(iterations)))
+    report(label, latencies, iterations, time.perf_counter() - wall_start)
+
+
+async def run_async(label: str, call, iterations: int, concurrency: int):
+    """Await ``call`` ``iterations`` times from ``concurrency`` tasks and print latency stats."""
+    latencies = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            check(await call())
+            latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report(label, latencies, iterations, time.perf_counter() - wall_start)
+
+
+async def run_pooled(host: str, port: int, params: dict, args) -> dict:
+    unreal = AsyncUnrealConnection(host, port, min_size=1, max_size=args.pool_size)
+    await unreal.connect()
+    await run_async("pooled", lambda: unreal.send_command("get_actor_properties", params),
+                    args.iterations, args.concurrency)
+    stats = unreal.stats()
+    await unreal.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--connect-latency", type=float, default=0.0,
+                        help="Seconds the fake editor stalls each new connection")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    with FakeUnrealEditor(connect_latency=args.connect_latency) as editor:
+        editor.populate(10)
+        host, port = editor.host, editor.port
+        params = {"name": "Actor_1"}
+
+        print(f"{args.iterations} x get_actor_properties, concurrency {args.concurrency}, "
+              f"connect latency {args.connect_latency * 1000:.1f} ms")
+
+        run("legacy", lambda: legacy_call(host, port, "get_actor_properties", params),
+            args.iterations, args.concurrency)
+        legacy_connections = editor.connections_accepted
+
+        stats = asyncio.run(run_pooled(host, port, params, args))
+        print(f"connections opened: legacy {legacy_connections}, "
+              f"pooled {editor.connections_accepted - legacy_connections}")
+        print(f"pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Benchmark the JSON backends on the per-command JSON work of Unreal MCP.
+
+Each command costs the server a ``json_dumps`` of the request, a cache key
+(sorted ``json_dumps`` of the params) and a ``json_loads`` of the response.
+This times that work with the standard library and with orjson, for small
+actor commands and for large listings and property maps, and reports the CPU
+saved per command.
+
+Then sends the same commands through a local FakeUnrealEditor with each
+backend and compares the process CPU time per command end to end. orjson is
+optional; without it only the standard library is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_codec import actor_listing, component_properties
+from connection import AsyncUnrealConnection
+from connection import codec
+from connection.codec import json_dumps, json_loads
+from fake_editor import FakeUnrealEditor
+
+ORJSON = codec.orjson
+
+
+def use_backend(name: str):
+    """Switch json_dumps and json_loads to ``name`` ("json" or "orjson")."""
+    codec.orjson = ORJSON if name == "orjson" else None
+
+
+def backends():
+    return ["json", "orjson"] if ORJSON is not None else ["json"]
+
+
+def command_work(request: dict, response: bytes):
+    """The JSON work the server does for one command."""
+    json_dumps(request)
+    json_dumps(request.get("params") or {}, sort_keys=True)
+    json_loads(response)
+
+
+def _per_call(operation, min_time: float) -> float:
+    """Return the CPU seconds of one call of ``operation``."""
+    runs = 0
+    start = time.process_time()
+    while True:
+        operation()
+        runs += 1
+        elapsed = time.process_time() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def bench_commands(actors: int, components: int, min_time: float):
+    """Print the JSON CPU cost per command for each backend."""
+    use_backend("json")
+    small_actor = actor_listing(1)["result"]["actors"][0]
+    commands = [
+        ("set_actor_transform", {"type": "set_actor_transform",
+                                 "params": {"name": "Cube_1", "location": [0.0, 10.0, 20.0]}},
+         {"status": "success", "result": small_actor}),
+        (f"get_actors_in_level ({actors} actors)", {"type": "get_actors_in_level", "params": {}},
+         actor_listing(actors)),
+        (f"get_blueprint_components ({components} components)",
+         {"type": "get_blueprint_components", "params": {"blueprint_name": "BP_Level"}},
+         component_properties(components)),
+    ]
+
+    print(f"\n{'command':<44} {'backend':<8} {'us/command':>12} {'saved':>8}")
+    for label, request, response in commands:
+        payload = json_dumps(response)
+        baseline = None
+        for backend in backends():
+            use_backend(backend)
+            cost = _per_call(lambda: command_work(request, payload), min_time)
+            baseline = baseline or cost
+            saved = f"{(1 - cost / baseline) * 100:>7.0f}%" if backend != "json" else ""
+            print(f"{label:<44} {backend:<8} {cost * 1e6:>12.1f} {saved:>8}")
+    use_backend("orjson")
+
+
+async def bench_round_trips(actors: int, iterations: int):
+    """Send mixed commands through the fake editor and print the CPU time per command."""
+    print(f"\n{iterations} x (get_actors_in_level of {actors} actors + 10 small commands) through the fake editor")
+    with FakeUnrealEditor() as editor:
+        editor.populate(actors)
+        for backend in backends():
+            use_backend(backend)
+            # JSON on the wire, so the backend does all of the encoding
+            unreal = AsyncUnrealConnection(editor.host, editor.port, codecs=())
+            await unreal.connect()
+            commands = 0
+            start_cpu = time.process_time()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await unreal.send_command("get_actors_in_level")
+                for index in range(10):
+                    await unreal.send_command("set_actor_transform",
+                                              {"name": f"Actor_{index}", "location": [index, 0.0, 0.0]})
+                commands += 11
+            cpu = time.process_time() - start_cpu
+            wall = time.perf_counter() - start
+            await unreal.close()
+            # The fake editor runs in this process, so its JSON work is included
+            print(f"{backend:<8} {cpu / commands * 1e3:>8.3f} ms CPU/command   {wall / commands * 1e3:>8.3f} ms wall/command")
+    use_backend("orjson")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=5000, help="Actors in the listing payload")
+    parser.add_argument("--components", type=int, default=500, help="Components in the property map payload")
+    parser.add_argument("--iterations", type=int, default=20, help="Rounds of commands through the fake editor")
+    parser.add_argument("--min-time", type=float, default=0.5, help="CPU seconds spent timing each case")
+    args = parser.parse_args()
+
+    if ORJSON is None:
+        print("orjson is not installed; measuring the standard library only")
+
+    bench_commands(args.actors, args.components, args.min_time)
+    asyncio.run(bench_round_trips(args.actors, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
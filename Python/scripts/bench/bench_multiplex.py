@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark multiplexed commands against one-command-per-stream pooling.
+
+Fires many cheap get_actor_properties commands at once through
+AsyncUnrealConnection, first with multiplexing disabled (each command holds a
+pooled stream until its response arrives) and then with commands pipelined
+over a single stream and matched by request id.
+
+Both run against a local FakeUnrealEditor behind a relay that delays traffic
+by --rtt, emulating a remote editor host. The editor answers with --workers
+threads; the default of 1 matches the plugin, which runs commands one at a
+time on the game thread.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from connection import AsyncUnrealConnection
+from fake_editor import FakeUnrealEditor
+
+
+async def start_relay(target_host: str, target_port: int, rtt: float) -> asyncio.AbstractServer:
+    """Forward TCP traffic to the editor, delaying each direction by half of ``rtt``."""
+    delay = rtt / 2
+    loop = asyncio.get_running_loop()
+
+    async def pump(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                # Scheduled rather than awaited, so pipelined chunks overlap in flight
+                loop.call_later(delay, writer.write, chunk)
+        finally:
+            loop.call_later(delay, writer.close)
+
+    async def handle(client_reader, client_writer):
+        editor_reader, editor_writer = await asyncio.open_connection(target_host, target_port)
+        try:
+            await asyncio.gather(pump(client_reader, editor_writer), pump(editor_reader, client_writer))
+        except (asyncio.CancelledError, ConnectionError):
+            # The relay is shut down with the benchmark
+            pass
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run(label: str, unreal: AsyncUnrealConnection, iterations: int, concurrency: int):
+    """Send ``iterations`` commands from ``concurrency`` tasks and print latency stats."""
+    latencies = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for index in remaining:
+            start = time.perf_counter()
+            response = await unreal.send_command("get_actor_properties", {"name": f"Actor_{index % 10}"})
+            latencies.append(time.perf_counter() - start)
+            if not response or response.get("status") != "success":
+                raise RuntimeError(f"Unexpected response: {response}")
+
+    await unreal.connect()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{label:<12} {iterations / wall:>10.1f} cmd/s   p50 {p50:>8.3f} ms   p95 {p95:>8.3f} ms")
+
+
+async def main_async(args):
+    with FakeUnrealEditor(command_latency=args.latency, workers=args.workers) as editor:
+        editor.populate(10)
+        relay = await start_relay(editor.host, editor.port, args.rtt)
+        port = relay.sockets[0].getsockname()[1]
+
+        print(f"{args.iterations} x get_actor_properties, concurrency {args.concurrency}, "
+              f"rtt {args.rtt * 1000:.1f} ms, editor latency {args.latency * 1000:.1f} ms")
+
+        for label, multiplex in (("pooled", False), ("multiplexed", True)):
+            unreal = AsyncUnrealConnection("127.0.0.1", port, max_size=args.pool_size, multiplex=multiplex,
+                                           max_in_flight=args.concurrency)
+            await run(label, unreal, args.iterations, args.concurrency)
+            print(f"{'':<12} {unreal.stats()}")
+            await unreal.close()
+
+        relay.close()
+        await relay.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rtt", type=float, default=0.002, help="Emulated network round trip in seconds")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-command latency in the editor")
+    parser.add_argument("--workers", type=int, default=1, help="Threads answering pipelined commands")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
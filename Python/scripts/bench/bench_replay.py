@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Replay a captured session against the current connection layer.
+
+Loads a capture written with UNREAL_CAPTURE_FILE and serves it from a
+ReplayEditor, which answers each command with its recorded response and
+round trip time. The recorded commands are then sent again through
+AsyncUnrealConnection, each at its recorded offset from the start of the
+session (scaled by --speed), or back to back from --concurrency tasks with
+--flood.
+
+Since the editor's answers and timing are fixed by the capture, differences
+between runs on two builds come from the connection layer. The report
+compares latency percentiles with the recorded ones, and gives the CPU time
+spent on the event loop thread per command.
+
+    UNREAL_CAPTURE_FILE=session.jsonl.gz python unreal_mcp_server.py
+    python scripts/bench/bench_replay.py session.jsonl.gz --json build-a.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from connection import AsyncUnrealConnection, read_capture
+from fake_editor import ReplayEditor
+
+
+def percentiles(seconds: List[float]) -> Tuple[float, float, float]:
+    """Return the p50, p95 and p99 of ``seconds``, in milliseconds."""
+    if not seconds:
+        return 0.0, 0.0, 0.0
+    if len(seconds) == 1:
+        return (seconds[0] * 1000,) * 3
+    cuts = statistics.quantiles(seconds, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def _status(response: Optional[Dict[str, Any]]) -> str:
+    if not response:
+        return "none"
+    if response.get("status") == "error" or response.get("success") is False:
+        return "error"
+    return "success"
+
+
+async def replay(unreal: AsyncUnrealConnection, exchanges: List[Dict[str, Any]], speed: float,
+                 flood: bool, concurrency: int) -> Tuple[List[float], int, float]:
+    """Send the recorded commands and return their latencies, mismatched outcomes and loop CPU seconds."""
+    latencies: List[float] = []
+    mismatches = 0
+
+    async def send(exchange: Dict[str, Any]):
+        nonlocal mismatches
+        start = time.perf_counter()
+        response = await unreal.send_command(exchange["command"], exchange["params"])
+        latencies.append(time.perf_counter() - start)
+        if _status(response) != _status(exchange["response"]):
+            mismatches += 1
+
+    await unreal.connect()
+    cpu_start = time.thread_time()
+    if flood:
+        remaining = iter(exchanges)
+
+        async def worker():
+            for exchange in remaining:
+                await send(exchange)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        started = time.perf_counter()
+        tasks = []
+        for exchange in exchanges:
+            delay = started + exchange["t"] * speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(exchange)))
+        await asyncio.gather(*tasks)
+    return latencies, mismatches, time.thread_time() - cpu_start
+
+
+async def main_async(args):
+    exchanges = list(read_capture(args.capture))
+    if not exchanges:
+        print(f"{args.capture} holds no exchanges")
+        return
+    recorded = [exchange["elapsed"] * args.speed for exchange in exchanges]
+    codecs = [name.strip() for name in args.codecs.split(",") if name.strip()]
+
+    with ReplayEditor(args.capture, pace=not args.no_pace, speed=args.speed) as editor:
+        unreal = AsyncUnrealConnection(editor.host, editor.port, max_size=args.pool_size, codecs=codecs,
+                                       multiplex=not args.no_multiplex, max_in_flight=args.concurrency,
+                                       response_timeout=args.response_timeout)
+        wall_start = time.perf_counter()
+        latencies, mismatches, cpu = await replay(unreal, exchanges, args.speed, args.flood, args.concurrency)
+        wall = time.perf_counter() - wall_start
+        await unreal.close()
+        replay_stats = editor.stats()
+
+    p50, p95, p99 = percentiles(latencies)
+    r50, r95, r99 = percentiles(recorded)
+    print(f"{len(exchanges)} commands from {args.capture} in {wall:.2f} s "
+          f"({'flood x' + str(args.concurrency) if args.flood else 'recorded pacing'}, speed {args.speed})")
+    print(f"{'':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print(f"{'recorded':<10} {r50:>9.2f} {r95:>9.2f} {r99:>9.2f}")
+    print(f"{'replayed':<10} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+    print(f"loop cpu {cpu * 1000:.1f} ms, {cpu / len(exchanges) * 1e6:.1f} us/command; "
+          f"{mismatches} outcome mismatches; editor {replay_stats}")
+
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump({
+                "commands": len(exchanges),
+                "wall_seconds": wall,
+                "recorded_ms": {"p50": r50, "p95": r95, "p99": r99},
+                "replayed_ms": {"p50": p50, "p95": p95, "p99": p99},
+                "cpu_seconds": cpu,
+                "cpu_us_per_command": cpu / len(exchanges) * 1e6,
+                "mismatches": mismatches,
+                "editor": replay_stats,
+            }, out, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="Capture file written with UNREAL_CAPTURE_FILE")
+    parser.add_argument("--speed", type=float, default=1.0, help="Factor applied to recorded times")
+    parser.add_argument("--no-pace", action="store_true", help="Have the editor answer without the recorded delay")
+    parser.add_argument("--flood", action="store_true", help="Send back to back instead of at recorded offsets")
+    parser.add_argument("--concurrency", type=int, default=32, help="Tasks sending with --flood")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--codecs", default="cbor,msgpack", help="Binary codecs to offer, empty keeps JSON")
+    parser.add_argument("--no-multiplex", action="store_true")
+    parser.add_argument("--response-timeout", type=float, default=30.0)
+    parser.add_argument("--json", default="", help="Write the report to this file")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
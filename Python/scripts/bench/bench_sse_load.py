@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+"""
+Load and soak test of the SSE MCP server.
+
+Opens --sessions concurrent MCP sessions with fastmcp.Client, as agents do,
+and has each replay a weighted mix of tool calls for --duration seconds.
+Every --interval seconds it prints the throughput, p50/p95/p99 latency and
+error rate of the calls that finished in the interval, and the server's
+resident memory, so that slowdowns and leaks over a long soak show up as
+trends. A summary per tool follows at the end.
+
+By default it starts a FakeUnrealEditor and an unreal_mcp_server.py
+subprocess pointed at it. Pass --server-url (and --server-pid for memory)
+to load a server that is already running instead.
+
+    python scripts/bench/bench_sse_load.py --sessions 16 --duration 60
+    python scripts/bench/bench_sse_load.py --sessions 64 --duration 3600 --interval 60 \\
+        --mix get_actors_in_level=1,execute_python_script=1 --json soak.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastmcp import Client
+
+# Add the parent directory to the path so we can import the server modules
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(SERVER_DIR)
+
+from fake_editor import FakeUnrealEditor, parse_command_latencies
+
+# Relative weights of the tool calls replayed by each session
+DEFAULT_MIX = {
+    "get_actors_in_level": 25,
+    "find_actors_by_name": 20,
+    "get_actor_properties": 20,
+    "set_actor_transform": 10,
+    "spawn_actor": 5,
+    "delete_actor": 4,
+    "set_actor_property": 5,
+    "compile_blueprint": 3,
+    "create_input_mapping": 2,
+    "execute_python_script": 6,
+}
+
+
+class Session:
+    """One MCP session's state: the actors it spawned and its blueprint."""
+
+    def __init__(self, index: int, actors: int, rng: random.Random):
+        self.index = index
+        self.actors = actors
+        self.rng = rng
+        self.blueprint = f"BP_Load_{index}"
+        self.spawned: List[str] = []
+        self._counter = 0
+
+    def _unique(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}_{self.index}_{self._counter}"
+
+    def _actor(self) -> str:
+        return f"Actor_{self.rng.randrange(self.actors)}"
+
+    def next_call(self, tool: str) -> Tuple[str, Dict[str, Any]]:
+        """Return the tool and arguments of the next call of ``tool``."""
+        rng = self.rng
+        if tool == "delete_actor" and not self.spawned:
+            tool = "spawn_actor"
+        if tool == "get_actors_in_level":
+            return tool, {"fields": ["name", "class"], "limit": 500, "offset": rng.randrange(0, self.actors, 500)}
+        if tool == "find_actors_by_name":
+            return tool, {"pattern": f"Actor_{rng.randrange(self.actors)}"}
+        if tool == "get_actor_properties":
+            return tool, {"name": self._actor()}
+        if tool == "set_actor_transform":
+            return tool, {"name": self._actor(), "location": [rng.uniform(-1000, 1000) for _ in range(3)]}
+        if tool == "set_actor_property":
+            return tool, {"name": self._actor(), "property_name": "Tags", "property_value": "load"}
+        if tool == "spawn_actor":
+            name = self._unique("LoadActor")
+            self.spawned.append(name)
+            return tool, {"name": name, "type": "StaticMeshActor", "location": [0.0, 0.0, 0.0]}
+        if tool == "delete_actor":
+            return tool, {"name": self.spawned.pop(0)}
+        if tool == "compile_blueprint":
+            return tool, {"blueprint_name": self.blueprint}
+        if tool == "create_input_mapping":
+            return tool, {"action_name": self._unique("Action"), "key": "SpaceBar"}
+        if tool == "execute_python_script":
+            return tool, {"script": f"print({rng.randrange(100)})"}
+        raise ValueError(f"No arguments known for tool '{tool}'")
+
+
+class Recorder:
+    """Outcomes of finished calls, as (finished at, tool, seconds, ok)."""
+
+    def __init__(self):
+        self.calls: List[Tuple[float, str, float, bool]] = []
+        self.errors: Dict[str, int] = {}
+
+    def record(self, tool: str, seconds: float, ok: bool, error: Optional[str] = None):
+        self.calls.append((time.perf_counter(), tool, seconds, ok))
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"tool=weight,..."``."""
+    mix = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        tool, separator, weight = entry.partition("=")
+        if not separator or not tool.strip():
+            raise ValueError(f"Invalid mix entry '{entry}', expected tool=weight")
+        mix[tool.strip()] = float(weight)
+    return mix
+
+
+def percentiles(seconds: List[float]) -> Tuple[float, float, float]:
+    """Return the p50, p95 and p99 of ``seconds``, in milliseconds."""
+    if not seconds:
+        return 0.0, 0.0, 0.0
+    if len(seconds) == 1:
+        return (seconds[0] * 1000,) * 3
+    cuts = statistics.quantiles(seconds, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def rss_bytes(pid: Optional[int]) -> Optional[int]:
+    """Return a process's resident memory, if it can be read on this platform."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+
+def _failure(result: Any) -> Optional[str]:
+    """Return why a tool result is a failure, or None if it succeeded."""
+    if getattr(result, "is_error", False) or getattr(result, "isError", False):
+        return "tool error"
+    # Older fastmcp versions return the content list itself
+    content = getattr(result, "content", result)
+    for item in content or []:
+        text = getattr(item, "text", None)
+        if not text:
+            continue
+        try:
+            value = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(value, dict) and (value.get("success") is False or value.get("status") == "error"):
+            return str(value.get("message") or value.get("error") or "failed")[:80]
+    return None
+
+
+async def run_session(url: str, session: Session, tools: List[str], weights: List[float], deadline: float,
+                      recorder: Recorder, think_time: float):
+    """Replay the weighted mix of tool calls in one MCP session until ``deadline``."""
+    async with Client(url) as client:
+        if "compile_blueprint" in tools:
+            await client.call_tool("create_blueprint", {"name": session.blueprint, "parent_class": "Actor"})
+        while time.perf_counter() < deadline:
+            tool, arguments = session.next_call(session.rng.choices(tools, weights)[0])
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool(tool, arguments)
+                error = _failure(result)
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)[:80]}"
+            recorder.record(tool, time.perf_counter() - start, error is None, error)
+            if think_time:
+                await asyncio.sleep(session.rng.expovariate(1 / think_time))
+
+
+async def report(recorder: Recorder, sessions: int, interval: float, pid: Optional[int],
+                 series: List[Dict[str, Any]], started: float):
+    """Print the calls finished in each interval until cancelled."""
+    seen = 0
+    last = started
+    while True:
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        calls = recorder.calls[seen:]
+        seen += len(calls)
+        latencies = [seconds for _, _, seconds, _ in calls]
+        errors = sum(1 for call in calls if not call[3])
+        p50, p95, p99 = percentiles(latencies)
+        rss = rss_bytes(pid)
+        point = {
+            "elapsed": round(now - started, 3),
+            "calls": len(calls),
+            "throughput": len(calls) / (now - last),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "error_rate": errors / len(calls) if calls else 0.0,
+            "rss_bytes": rss,
+        }
+        series.append(point)
+        last = now
+        print(f"t={point['elapsed']:>7.0f}s  sessions {sessions}  {point['throughput']:>8.1f} calls/s  "
+              f"p50 {p50:>8.2f} ms  p95 {p95:>8.2f} ms  p99 {p99:>8.2f} ms  "
+              f"errors {point['error_rate'] * 100:>5.1f}%  rss {_megabytes(rss)}", flush=True)
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return f"{value / (1024 * 1024):.1f} MB" if value is not None else "n/a"
+
+
+def summarize(recorder: Recorder, wall: float) -> Dict[str, Any]:
+    """Print and return the latency and error totals per tool."""
+    by_tool: Dict[str, List[Tuple[float, bool]]] = {}
+    for _, tool, seconds, ok in recorder.calls:
+        by_tool.setdefault(tool, []).append((seconds, ok))
+
+    summary: Dict[str, Any] = {"wall_seconds": wall, "tools": {}}
+    print(f"\n{'tool':<24} {'calls':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = sorted(by_tool.items()) + [("all", [(seconds, ok) for _, _, seconds, ok in recorder.calls])]
+    for tool, calls in rows:
+        errors = sum(1 for _, ok in calls if not ok)
+        p50, p95, p99 = percentiles([seconds for seconds, _ in calls])
+        summary["tools"][tool] = {"calls": len(calls), "errors": errors, "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+        print(f"{tool:<24} {len(calls):>8} {errors:>7} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+    total = len(recorder.calls)
+    summary["throughput"] = total / wall if wall else 0.0
+    summary["errors"] = dict(sorted(recorder.errors.items(), key=lambda item: -item[1]))
+    print(f"\n{total} calls in {wall:.1f} s, {summary['throughput']:.1f} calls/s")
+    for error, count in list(summary["errors"].items())[:10]:
+        print(f"  {count:>6} x {error}")
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(editor_port: int, log_file: str) -> Tuple[subprocess.Popen, str]:
+    """Start unreal_mcp_server.py against the fake editor and wait for it to listen."""
+    port = _free_port()
+    env = dict(os.environ,
+               UNREAL_HOST="127.0.0.1", UNREAL_PORT=str(editor_port),
+               UNREAL_MCP_HOST="127.0.0.1", UNREAL_MCP_PORT=str(port),
+               UNREAL_LOG_FILE=log_file)
+    env.setdefault("UNREAL_LOG_LEVEL", "INFO")
+    process = subprocess.Popen([sys.executable, os.path.join(SERVER_DIR, "unreal_mcp_server.py")],
+                               cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"MCP server exited with code {process.returncode}, see {log_file}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process, f"http://127.0.0.1:{port}/sse"
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"MCP server did not start listening within 30 s, see {log_file}")
+
+
+async def main_async(args, url: str, pid: Optional[int]):
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    tools, weights = list(mix), list(mix.values())
+    recorder = Recorder()
+    series: List[Dict[str, Any]] = []
+
+    print(f"{args.sessions} sessions for {args.duration:.0f} s against {url}, mix {mix}")
+    started = time.perf_counter()
+    deadline = started + args.duration
+    reporter = asyncio.create_task(report(recorder, args.sessions, args.interval, pid, series, started))
+    sessions = []
+    for index in range(args.sessions):
+        session = Session(index, args.actors, random.Random(args.seed + index))
+        sessions.append(run_session(url, session, tools, weights, deadline, recorder, args.think_time))
+        if args.ramp_up:
+            # Stagger session starts instead of opening every SSE stream at once
+            await asyncio.sleep(args.ramp_up / args.sessions)
+    outcomes = await asyncio.gather(*sessions, return_exceptions=True)
+    wall = time.perf_counter() - started
+    reporter.cancel()
+
+    failed = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    for outcome in failed[:5]:
+        print(f"Session failed: {type(outcome).__name__}: {outcome}")
+    summary = summarize(recorder, wall)
+    summary["sessions_failed"] = len(failed)
+    summary["series"] = series
+    rss = [point["rss_bytes"] for point in series if point["rss_bytes"] is not None]
+    if rss:
+        print(f"server rss start {_megabytes(rss[0])}, peak {_megabytes(max(rss))}, end {_megabytes(rss[-1])}")
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(summary, out, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which sessions are opened")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Mean seconds a session waits between calls, 0 sends back to back")
+    parser.add_argument("--mix", default="", help="Tool weights, e.g. get_actors_in_level=5,spawn_actor=1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", default="", help="Write the summary and time series to this file")
+    parser.add_argument("--server-url", default="", help="Load a running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of --server-url, to sample its RSS")
+    parser.add_argument("--actors", type=int, default=1000, help="Actors in the level")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-command latency in the fake editor")
+    parser.add_argument("--command-latency", type=parse_command_latencies, default={},
+                        help="Fake editor latency overrides by command")
+    parser.add_argument("--execution-time", type=parse_command_latencies, default={},
+                        help="Fake editor game thread time by command")
+    parser.add_argument("--frame-time", type=float, default=0.0, help="Fake editor seconds per frame")
+    args = parser.parse_args()
+
+    if args.server_url:
+        asyncio.run(main_async(args, args.server_url, args.server_pid))
+        return
+
+    editor = FakeUnrealEditor(command_latency=args.latency, command_latencies=args.command_latency,
+                              execution_times=args.execution_time, frame_time=args.frame_time)
+    editor.populate(args.actors)
+    with editor, tempfile.TemporaryDirectory() as workdir:
+        log_file = os.path.join(workdir, "unreal_mcp.log")
+        server, url = start_server(editor.port, log_file)
+        try:
+            asyncio.run(main_async(args, url, server.pid))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        print(f"fake editor handled {editor.commands_handled} commands on "
+              f"{editor.connections_accepted} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for receiving large legacy-framed responses.
+
+Compares the old receive loop, which joined and re-parsed everything received
+after every recv, with JsonStreamDecoder, which scans each byte once and
+parses a single time. Responses are get_actors_in_level-shaped documents sent
+over a socket pair. The per-byte cost of the decoder should stay flat as the
+response grows from 1 KB to 50 MB; the old loop's cost grows with the size.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from connection import JsonStreamDecoder
+
+SIZES = [1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20, 50 << 20]
+
+
+def make_response(target_size: int) -> bytes:
+    """Build a get_actors_in_level response of roughly ``target_size`` bytes."""
+    actor = {
+        "name": "StaticMeshActor_000000",
+        "class": "StaticMeshActor",
+        "location": [1234.5678, -98.765, 10.0],
+        "rotation": [0.0, 90.0, 0.0],
+        "scale": [1.0, 1.0, 1.0],
+    }
+    per_actor = len(json.dumps(actor)) + 2
+    count = max(1, target_size // per_actor)
+    actors = [dict(actor, name=f"StaticMeshActor_{index:06d}") for index in range(count)]
+    return json.dumps({"status": "success", "result": {"actors": actors}}).encode("utf-8")
+
+
+def legacy_receive(sock: socket.socket) -> bytes:
+    """The old receive_full_response loop: join and json.loads after every recv."""
+    chunks = []
+    while True:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("closed")
+        chunks.append(chunk)
+        data = b"".join(chunks)
+        try:
+            json.loads(data.decode("utf-8"))
+            return data
+        except json.JSONDecodeError:
+            continue
+
+
+def decoder_receive(sock: socket.socket, decoder: JsonStreamDecoder) -> bytes:
+    """The new path: receive into the decoder's reused buffer, as the event loop does, and scan once."""
+    while True:
+        with decoder.get_buffer() as view:
+            count = sock.recv_into(view)
+        if not count:
+            raise ConnectionError("closed")
+        if decoder.buffer_updated(count):
+            return decoder.take()
+
+
+def timed_receive(payload: bytes, receive) -> float:
+    """Send ``payload`` over a socket pair and time ``receive`` plus one final parse."""
+    reader, writer = socket.socketpair()
+    sender = threading.Thread(target=writer.sendall, args=(payload,))
+    try:
+        start = time.perf_counter()
+        sender.start()
+        data = receive(reader)
+        json.loads(data)
+        elapsed = time.perf_counter() - start
+    finally:
+        sender.join()
+        reader.close()
+        writer.close()
+    assert len(data) == len(payload)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--legacy-max", type=int, default=1 << 20,
+                        help="Largest response to run through the old quadratic loop (bytes)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    decoder = JsonStreamDecoder()
+    print(f"{'size':>10}  {'legacy ns/B':>12}  {'decoder ns/B':>12}  {'decoder MB/s':>12}")
+    for size in SIZES:
+        payload = make_response(size)
+
+        new = min(timed_receive(payload, lambda s: decoder_receive(s, decoder)) for _ in range(args.repeat))
+        if len(payload) <= args.legacy_max:
+            old = min(timed_receive(payload, legacy_receive) for _ in range(args.repeat))
+            old_text = f"{old * 1e9 / len(payload):12.2f}"
+        else:
+            old_text = f"{'skipped':>12}"
+
+        print(f"{len(payload):>10}  {old_text}  {new * 1e9 / len(payload):12.2f}  "
+              f"{len(payload) / new / 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
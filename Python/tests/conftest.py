@@ -0,0 +1,46 @@
+"""
+Shared fixtures for the Unreal MCP tests.
+
+Tests drive a FakeUnrealEditor through AsyncUnrealConnection over real
+sockets, so framing, codecs and multiplexing are exercised as in production.
+Each test runs its scenario with ``asyncio.run``.
+"""
+
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+# Add the parent directory to the path so we can import the server modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection import AsyncUnrealConnection
+from fake_editor import FakeUnrealEditor
+
+
+@pytest.fixture
+def editor():
+    """A running fake editor whose level holds Actor_0 to Actor_9."""
+    with FakeUnrealEditor() as fake:
+        fake.populate(10)
+        yield fake
+
+
+@pytest.fixture(params=[True, False], ids=["multiplexed", "pooled"])
+def multiplex(request) -> bool:
+    """Run a test over one multiplexed stream and over pooled streams."""
+    return request.param
+
+
+@pytest.fixture
+def connect(editor):
+    """Open a connection to ``editor`` inside a test's event loop, closed when the block ends."""
+    @asynccontextmanager
+    async def connect(**kwargs):
+        unreal = AsyncUnrealConnection(editor.host, editor.port, **kwargs)
+        try:
+            yield unreal
+        finally:
+            await unreal.close()
+    return connect
@@ -0,0 +1,166 @@
+"""
+Tests for per-session and global admission limits.
+"""
+
+import asyncio
+import time
+
+from connection import AdmissionLimiter, AsyncUnrealConnection, EditorPool
+from connection.admission import SCOPE_GLOBAL, SCOPE_SESSION
+from connection.scheduler import current_session
+
+
+def new_pool(editor, limiter: AdmissionLimiter) -> EditorPool:
+    return EditorPool(lambda host, port: AsyncUnrealConnection(host, port, max_size=8),
+                      [(editor.host, editor.port)], health_interval=0, limiter=limiter)
+
+
+async def in_session(session: str, call):
+    current_session.set(session)
+    return await call
+
+
+def spawn(pool: EditorPool, session: str, name: str):
+    return asyncio.ensure_future(in_session(session, pool.send_command("spawn_actor", {"name": name})))
+
+
+def test_session_limit_queues_a_sessions_commands_but_not_other_sessions(editor):
+    editor.execution_times["spawn_actor"] = 0.05
+    limiter = AdmissionLimiter(session_limit=1, session_queue=4)
+
+    async def scenario():
+        pool = new_pool(editor, limiter)
+        try:
+            await pool.start()
+            commands = [spawn(pool, "A", f"A_{i}") for i in range(3)] + [spawn(pool, "B", "B_0")]
+            await asyncio.sleep(0.02)
+            # One command of each session is in flight, the other two of A wait for its slot
+            assert limiter.in_flight(SCOPE_SESSION) == 2
+            assert limiter.queued(SCOPE_SESSION) == 2
+            assert all(response["status"] == "success" for response in await asyncio.gather(*commands))
+            stats = limiter.stats()[SCOPE_SESSION]
+            assert stats["admitted"] == 4 and stats["rejected"] == 0
+            assert stats["sessions"] == 0
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_global_limit_queues_commands_across_sessions(editor):
+    editor.execution_times["spawn_actor"] = 0.05
+    limiter = AdmissionLimiter(global_limit=2, global_queue=4)
+
+    async def scenario():
+        pool = new_pool(editor, limiter)
+        try:
+            await pool.start()
+            commands = [spawn(pool, f"agent-{i}", f"Crate_{i}") for i in range(4)]
+            await asyncio.sleep(0.02)
+            assert limiter.in_flight(SCOPE_GLOBAL) == 2
+            assert limiter.queued(SCOPE_GLOBAL) == 2
+            assert all(response["status"] == "success" for response in await asyncio.gather(*commands))
+            assert limiter.in_flight(SCOPE_GLOBAL) == 0
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_returns_a_busy_error_at_once(editor):
+    editor.execution_times["spawn_actor"] = 0.2
+    limiter = AdmissionLimiter(global_limit=2, global_queue=1, session_limit=1, session_queue=1)
+
+    async def scenario():
+        pool = new_pool(editor, limiter)
+        try:
+            await pool.start()
+            commands = [spawn(pool, "A", "A_0"), spawn(pool, "A", "A_1")]
+            await asyncio.sleep(0.02)
+
+            started = time.perf_counter()
+            busy = await in_session("A", pool.send_command("spawn_actor", {"name": "A_2"}))
+            assert time.perf_counter() - started < 0.1
+            assert busy["status"] == "error" and busy["busy"] is True
+            assert busy["scope"] == SCOPE_SESSION
+            assert busy["retry_after"] > 0
+            assert f"retry after {busy['retry_after']:.1f}s" in busy["error"]
+
+            # B and C fill the global slot and queue; D finds the global queue full
+            commands += [spawn(pool, "B", "B_0")]
+            await asyncio.sleep(0.02)
+            commands += [spawn(pool, "C", "C_0")]
+            await asyncio.sleep(0.02)
+            busy = await in_session("D", pool.send_command("spawn_actor", {"name": "D_0"}))
+            assert busy["busy"] is True and busy["scope"] == SCOPE_GLOBAL
+
+            assert all(response["status"] == "success" for response in await asyncio.gather(*commands))
+            stats = limiter.stats()
+            assert stats[SCOPE_SESSION]["rejected"] == 1
+            assert stats[SCOPE_GLOBAL]["rejected"] == 1
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_command_waiting_longer_than_the_timeout_is_turned_away(editor):
+    editor.execution_times["spawn_actor"] = 0.5
+    limiter = AdmissionLimiter(session_limit=1, session_queue=4, timeout=0.1)
+
+    async def scenario():
+        pool = new_pool(editor, limiter)
+        try:
+            await pool.start()
+            first = spawn(pool, "A", "A_0")
+            await asyncio.sleep(0.02)
+
+            started = time.perf_counter()
+            busy = await in_session("A", pool.send_command("spawn_actor", {"name": "A_1"}))
+            assert 0.1 <= time.perf_counter() - started < 0.4
+            assert busy["busy"] is True and busy["scope"] == SCOPE_SESSION
+            assert "waited 0.1s" in busy["error"]
+            assert limiter.queued(SCOPE_SESSION) == 0
+
+            assert (await first)["status"] == "success"
+            assert limiter.stats()[SCOPE_SESSION]["timed_out"] == 1
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    limiter = AdmissionLimiter(global_limit=1, global_queue=4)
+    admitted = []
+
+    async def command(name: str, release: asyncio.Event):
+        async with limiter.admit():
+            admitted.append(name)
+            await release.wait()
+
+    async def scenario():
+        release = {name: asyncio.Event() for name in ("holder", "cancelled", "handed", "next")}
+        tasks = {name: asyncio.ensure_future(command(name, release[name])) for name in release}
+        await asyncio.sleep(0)
+        assert admitted == ["holder"] and limiter.queued(SCOPE_GLOBAL) == 3
+
+        # Cancelled while still queued: it leaves the queue
+        tasks["cancelled"].cancel()
+        await asyncio.sleep(0)
+        assert limiter.queued(SCOPE_GLOBAL) == 2
+
+        # Cancelled just as the holder hands it the slot: it hands the slot on
+        release["holder"].set()
+        await asyncio.sleep(0)
+        tasks["handed"].cancel()
+        await asyncio.sleep(0.01)
+        assert admitted == ["holder", "next"]
+        assert limiter.in_flight(SCOPE_GLOBAL) == 1
+
+        release["next"].set()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        assert tasks["cancelled"].cancelled() and tasks["handed"].cancelled()
+        assert limiter.in_flight(SCOPE_GLOBAL) == 0 and limiter.queued(SCOPE_GLOBAL) == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+"""
+Tests for batch commands.
+"""
+
+import asyncio
+
+import pytest
+
+from connection.batch import batch_params
+
+COMMANDS = [
+    ("spawn_actor", {"name": "First", "type": "StaticMeshActor"}),
+    ("delete_actor", {"name": "Missing"}),
+    ("spawn_actor", {"name": "Second", "type": "StaticMeshActor"}),
+]
+
+
+def test_runs_every_command_by_default(connect, editor, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex) as unreal:
+            return await unreal.send_batch(COMMANDS)
+
+    result = asyncio.run(scenario())["result"]
+    assert [response["status"] for response in result["results"]] == ["success", "error", "success"]
+    assert (result["succeeded"], result["failed"], result["skipped"], result["stopped"]) == (2, 1, 0, False)
+    assert {"First", "Second"} <= set(editor.actors)
+
+
+def test_stop_on_error_skips_the_rest(connect, editor, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex) as unreal:
+            return await unreal.send_batch(COMMANDS, stop_on_error=True)
+
+    result = asyncio.run(scenario())["result"]
+    assert [response["status"] for response in result["results"]] == ["success", "error"]
+    assert (result["succeeded"], result["failed"], result["skipped"], result["stopped"]) == (1, 1, 1, True)
+    assert "First" in editor.actors
+    assert "Second" not in editor.actors
+
+
+def test_batch_params_accepts_mappings_and_pairs():
+    params = batch_params([{"type": "ping"}, ("get_actor_properties", {"name": "Actor_1"})])
+    assert params == {
+        "commands": [
+            {"type": "ping", "params": {}},
+            {"type": "get_actor_properties", "params": {"name": "Actor_1"}},
+        ],
+        "stop_on_error": False,
+    }
+
+
+@pytest.mark.parametrize("commands", [[("batch", {})], [{"params": {}}], ["ping"]])
+def test_batch_params_rejects_malformed_commands(commands):
+    with pytest.raises(ValueError):
+        batch_params(commands)
@@ -0,0 +1,58 @@
+"""
+Tests for the read cache and its invalidation by mutations.
+"""
+
+import asyncio
+
+from connection import ResponseCache
+
+
+def actor_names(response):
+    return {actor["name"] for actor in response["result"]["actors"]}
+
+
+def test_mutation_invalidates_only_what_it_changed(connect, editor, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex, cache=ResponseCache(ttl=60.0)) as unreal:
+            first = await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            await unreal.send_command("get_actor_properties", {"name": "Actor_2"})
+            handled = editor.commands_handled
+            assert await unreal.send_command("get_actor_properties", {"name": "Actor_1"}) == first
+            assert editor.commands_handled == handled
+
+            moved = await unreal.send_command("set_actor_transform", {"name": "Actor_1", "location": [5, 5, 5]})
+            assert moved["status"] == "success"
+            handled = editor.commands_handled
+
+            refreshed = await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            assert refreshed["result"]["location"] == [5.0, 5.0, 5.0]
+            assert editor.commands_handled == handled + 1
+            # Actor_2 wasn't touched, so it is still served from the cache
+            await unreal.send_command("get_actor_properties", {"name": "Actor_2"})
+            assert editor.commands_handled == handled + 1
+
+    asyncio.run(scenario())
+
+
+def test_batched_mutation_invalidates(connect, editor):
+    async def scenario():
+        async with connect(cache=ResponseCache(ttl=60.0)) as unreal:
+            before = await unreal.send_command("get_actors_in_level")
+            await unreal.send_batch([("delete_actor", {"name": "Actor_3"})])
+            after = await unreal.send_command("get_actors_in_level")
+            return before, after
+
+    before, after = asyncio.run(scenario())
+    assert actor_names(before) - actor_names(after) == {"Actor_3"}
+
+
+def test_other_commands_clear_the_cache(connect, editor):
+    async def scenario():
+        async with connect(cache=ResponseCache(ttl=60.0)) as unreal:
+            await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            await unreal.send_command("execute_python_script", {"script": "print(1)"})
+            handled = editor.commands_handled
+            await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            assert editor.commands_handled == handled + 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+"""
+Tests for versioned get_actors_in_level deltas and merging them into the scene mirror.
+"""
+
+import asyncio
+
+from connection import SceneMirror
+
+
+def actor_names(response):
+    return {actor["name"] for actor in response["result"]["actors"]}
+
+
+def test_since_returns_only_changes(connect, editor):
+    async def scenario():
+        async with connect() as unreal:
+            full = await unreal.send_command("get_actors_in_level")
+            editor.execute("set_actor_transform", {"name": "Actor_5", "location": [9, 9, 9]})
+            editor.execute("delete_actor", {"name": "Actor_7"})
+            editor.execute("spawn_actor", {"name": "New", "type": "PointLight"})
+            delta = await unreal.send_command("get_actors_in_level", {"since": full["result"]["version"]})
+            return full["result"], delta["result"]
+
+    full, delta = asyncio.run(scenario())
+    assert not full["delta"]
+    assert delta["delta"]
+    assert [actor["name"] for actor in delta["actors"]] == ["Actor_5", "New"]
+    assert delta["removed"] == ["Actor_7"]
+    assert delta["version"] != full["version"]
+
+
+def test_unknown_version_falls_back_to_a_full_listing(connect, editor):
+    async def scenario():
+        async with connect() as unreal:
+            return await unreal.send_command("get_actors_in_level", {"since": "other-epoch:3"})
+
+    result = asyncio.run(scenario())["result"]
+    assert not result["delta"]
+    assert len(result["actors"]) == 10
+
+
+def test_scene_mirror_merges_deltas(connect, editor, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex, scene=SceneMirror()) as unreal:
+            first = await unreal.send_command("get_actors_in_level")
+            editor.execute("set_actor_transform", {"name": "Actor_1", "location": [4, 4, 4]})
+            editor.execute("delete_actor", {"name": "Actor_2"})
+            editor.execute("spawn_actor", {"name": "Lamp", "type": "PointLight"})
+            merged = await unreal.send_command("get_actors_in_level")
+            return first, merged, unreal.scene.stats()
+
+    first, merged, stats = asyncio.run(scenario())
+    assert actor_names(merged) == actor_names(first) - {"Actor_2"} | {"Lamp"}
+    moved = next(actor for actor in merged["result"]["actors"] if actor["name"] == "Actor_1")
+    assert moved["location"] == [4.0, 4.0, 4.0]
+    # The second listing was answered with a delta, not a full listing
+    assert (stats["seeds"], stats["deltas"]) == (1, 1)
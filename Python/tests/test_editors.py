@@ -0,0 +1,125 @@
+"""
+Tests for routing over several editors.
+"""
+
+import asyncio
+import time
+
+from connection import AsyncUnrealConnection, EditorPool
+from fake_editor import FakeUnrealEditor
+
+
+def new_pool(editors, **kwargs) -> EditorPool:
+    return EditorPool(lambda host, port: AsyncUnrealConnection(host, port), [(e.host, e.port) for e in editors],
+                      health_interval=0, **kwargs)
+
+
+def test_removed_editor_closes_once_drained():
+    async def scenario(slow, spare):
+        pool = new_pool([slow], affinity=False)
+        try:
+            await pool.start()
+            script = asyncio.ensure_future(pool.send_command("execute_python_script", {"script": "print(1)"}))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            await pool.update([(spare.host, spare.port)])
+            await asyncio.gather(*pool._retiring)
+            retired = time.perf_counter() - started
+            assert (await script)["status"] == "success"
+            assert 0.2 <= retired < 0.5
+        finally:
+            await pool.close()
+
+    with FakeUnrealEditor(execution_times={"execute_python_script": 0.3}) as slow, FakeUnrealEditor() as spare:
+        asyncio.run(scenario(slow, spare))
+
+
+def test_removed_editor_closes_after_retire_timeout():
+    async def scenario(slow, spare):
+        pool = new_pool([slow], affinity=False, retire_timeout=0.1)
+        try:
+            await pool.start()
+            script = asyncio.ensure_future(pool.send_command("execute_python_script", {"script": "print(1)"}))
+            await asyncio.sleep(0.05)
+            await pool.update([(spare.host, spare.port)])
+            await asyncio.wait_for(asyncio.gather(*pool._retiring), 0.5)
+            # Closed under the command, which fails instead of holding the editor open
+            assert (await script)["status"] == "error"
+        finally:
+            await pool.close()
+
+    with FakeUnrealEditor(execution_times={"execute_python_script": 1.0}) as slow, FakeUnrealEditor() as spare:
+        asyncio.run(scenario(slow, spare))
+
+
+def test_slow_editor_keeps_its_sessions():
+    """Timeouts and failed health pings don't move a session: the editor is busy, not gone."""
+    async def scenario(editors):
+        pool = EditorPool(lambda host, port: AsyncUnrealConnection(host, port, response_timeout=0.1),
+                          [(e.host, e.port) for e in editors], health_interval=0, health_timeout=0.1)
+        try:
+            await pool.start()
+            with pool.session("agent"):
+                await pool.send_command("ping")
+                bound = pool._bindings["agent"]
+                slow = next(e for e in editors if bound.endswith(f":{e.port}"))
+                slow.execution_times["get_actor_properties"] = 0.3
+                slow.command_latencies["ping"] = 0.3
+
+                timed_out = await pool.send_command("get_actor_properties", {"name": "Actor_1"})
+                assert timed_out["error"] == "Timeout receiving Unreal response"
+                await asyncio.gather(*(instance.monitor.check() for instance in pool.instances))
+                instance = next(instance for instance in pool.instances if instance.name == bound)
+                assert not instance.ready and instance.reachable
+
+                # Let the editor finish the work it was still doing for the commands that timed out
+                slow.execution_times.clear()
+                slow.command_latencies.clear()
+                await asyncio.sleep(0.5)
+                found = await pool.send_command("find_actors_by_name", {"pattern": "Actor"})
+                assert found["status"] == "success", found
+                assert pool._bindings["agent"] == bound
+                assert pool.rebinds == 0
+        finally:
+            await pool.close()
+
+    with FakeUnrealEditor() as first, FakeUnrealEditor() as second:
+        first.populate(2)
+        second.populate(2)
+        asyncio.run(scenario([first, second]))
+
+
+def test_session_moves_off_an_unreachable_editor_with_an_error():
+    async def scenario(editors):
+        pool = new_pool(editors)
+        try:
+            await pool.start()
+            with pool.session("agent"):
+                await pool.send_command("ping")
+                bound = pool._bindings["agent"]
+                next(e for e in editors if bound.endswith(f":{e.port}")).stop()
+                other = next(instance.name for instance in pool.instances if instance.name != bound)
+
+                responses = []
+                while not any(response and response.get("rebound") for response in responses):
+                    assert len(responses) < 6, responses
+                    responses.append(await pool.send_command("get_actors_in_level"))
+                assert all(response is None or response["status"] == "error" for response in responses)
+                moved = responses[-1]
+                assert moved["editor"] == other and bound in moved["error"]
+
+                # The command that found out was not sent; the next one runs on the new editor
+                assert (await pool.send_command("get_actors_in_level"))["status"] == "success"
+                assert pool._bindings["agent"] == other
+                assert pool.rebinds == 1
+        finally:
+            await pool.close()
+
+    first, second = FakeUnrealEditor(), FakeUnrealEditor()
+    first.start()
+    second.start()
+    try:
+        asyncio.run(scenario([first, second]))
+    finally:
+        first.stop()
+        second.stop()
@@ -0,0 +1,54 @@
+"""
+Tests for the simulated editor, driven through AsyncUnrealConnection.
+"""
+
+import asyncio
+import time
+
+from connection import AsyncUnrealConnection
+from fake_editor import FakeUnrealEditor
+
+
+def test_answers_like_the_plugin(connect, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex) as unreal:
+            assert (await unreal.send_command("ping"))["result"] == {"message": "pong"}
+            assert unreal.multiplexed == multiplex
+
+            spawned = await unreal.send_command("spawn_actor", {"name": "Door", "type": "StaticMeshActor",
+                                                                "location": [1, 2, 3]})
+            assert spawned["status"] == "success"
+            properties = await unreal.send_command("get_actor_properties", {"name": "Door"})
+            assert properties["result"]["location"] == [1.0, 2.0, 3.0]
+
+            duplicate = await unreal.send_command("spawn_actor", {"name": "Door", "type": "StaticMeshActor"})
+            assert duplicate == {"status": "error", "error": "Actor with name 'Door' already exists"}
+
+    asyncio.run(scenario())
+
+
+def test_unknown_command_is_an_error(connect):
+    async def scenario():
+        async with connect() as unreal:
+            response = await unreal.send_command("no_such_command")
+            assert response == {"status": "error", "error": "Unknown command: no_such_command"}
+
+    asyncio.run(scenario())
+
+
+def test_game_thread_runs_one_command_at_a_time():
+    async def scenario(editor):
+        unreal = AsyncUnrealConnection(editor.host, editor.port, max_size=4, multiplex=False)
+        try:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(unreal.send_command("compile_blueprint", {"blueprint_name": "BP"})
+                                               for _ in range(4)))
+            elapsed = time.perf_counter() - started
+        finally:
+            await unreal.close()
+        assert all(response["status"] == "success" for response in responses)
+        assert elapsed >= 4 * 0.05
+
+    with FakeUnrealEditor(execution_times={"compile_blueprint": 0.05}) as editor:
+        editor.execute("create_blueprint", {"name": "BP"})
+        asyncio.run(scenario(editor))
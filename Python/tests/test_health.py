@@ -0,0 +1,88 @@
+"""
+Tests for the health monitor.
+"""
+
+import asyncio
+
+from connection import AsyncUnrealConnection
+from connection.health import HealthMonitor
+from connection.resilience import CircuitBreaker
+from fake_editor import FakeUnrealEditor
+
+
+def test_busy_editor_stays_ready(multiplex):
+    """A ping queued behind a running script times out, but the check still counts as ready."""
+    async def scenario(editor):
+        unreal = AsyncUnrealConnection(editor.host, editor.port, multiplex=multiplex,
+                                       breaker=CircuitBreaker(failure_threshold=1))
+        monitor = HealthMonitor(unreal, interval=0, timeout=0.2)
+        try:
+            assert await monitor.check()
+            assert not monitor.status()["busy"]
+
+            script = asyncio.ensure_future(unreal.send_command("execute_python_script", {"script": "print(1)"}))
+            await asyncio.sleep(0.05)
+            assert await monitor.check()
+            assert monitor.ready and monitor.status()["busy"]
+            assert unreal.breaker.stats()["consecutive_failures"] == 0
+
+            assert (await script)["status"] == "success"
+            assert await monitor.check()
+            assert not monitor.status()["busy"]
+        finally:
+            await unreal.close()
+
+    with FakeUnrealEditor(execution_times={"execute_python_script": 0.6}) as editor:
+        asyncio.run(scenario(editor))
+
+
+def test_unanswered_ping_on_an_idle_editor_is_not_ready():
+    async def scenario(editor):
+        unreal = AsyncUnrealConnection(editor.host, editor.port, breaker=CircuitBreaker(failure_threshold=1))
+        monitor = HealthMonitor(unreal, interval=0, timeout=0.1)
+        try:
+            assert await unreal.connect()
+            # Open the stream first, so only the health ping is slow, not the handshake
+            editor.command_latencies["ping"] = 0.3
+            assert not await monitor.check()
+            assert monitor.status()["last_error"] == "No answer within 0.1s"
+            assert not monitor.status()["busy"]
+            # The ping bypasses the breaker
+            assert unreal.breaker.stats()["consecutive_failures"] == 0
+        finally:
+            await unreal.close()
+
+    with FakeUnrealEditor() as editor:
+        asyncio.run(scenario(editor))
+
+
+def test_stop_ends_checks_that_swallowed_their_cancellation(editor):
+    """On Python 3.11, wait_for can drop a cancellation that arrives as the ping completes."""
+    class SwallowingMonitor(HealthMonitor):
+        swallowed = False
+
+        async def check(self) -> bool:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                if self.swallowed:
+                    raise
+                self.swallowed = True
+            return True
+
+    async def scenario():
+        unreal = AsyncUnrealConnection(editor.host, editor.port)
+        monitor = SwallowingMonitor(unreal, interval=0.01)
+        try:
+            task = monitor._task = asyncio.create_task(monitor._run())
+            await asyncio.sleep(0.05)
+            stopping = asyncio.ensure_future(monitor.stop())
+            # Not wait_for: cancelling stop() would cancel the checks a second time
+            done, _ = await asyncio.wait({stopping}, timeout=0.5)
+            stopping.cancel()
+            assert monitor.swallowed
+            assert stopping in done and task.done()
+        finally:
+            await unreal.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+"""
+Tests for the queued logging pipeline.
+"""
+
+import logging
+
+from observability.logs import configure_logging, payload
+
+
+def test_payload_changed_after_logging_is_written_as_logged(tmp_path):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    path = tmp_path / "unreal_mcp.log"
+    listener, _ = configure_logging(str(path), payload_limit=200)
+    try:
+        logger = logging.getLogger("UnrealMCP")
+        small = {"status": "error", "message": "Actor not found"}
+        logger.info("small %s", payload(small))
+        small["error"] = small.pop("message")
+
+        listing = {"status": "success", "result": {"actors": [{"name": f"Actor_{i}"} for i in range(50)]}}
+        logger.info("listing %s", payload(listing))
+        listing["result"]["actors"].clear()
+    finally:
+        listener.stop()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith("small {'status': 'error', 'message': 'Actor not found'}")
+    assert "{'name': 'Actor_0'}" in lines[1] and "[summarized, over 200 chars]" in lines[1]
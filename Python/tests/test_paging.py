@@ -0,0 +1,80 @@
+"""
+Tests for paged actor listings and their cursors.
+"""
+
+import asyncio
+import base64
+
+import pytest
+
+from connection import ListingChangedError
+from connection.paging import check_page_version, decode_cursor, encode_cursor, listing_params
+
+
+def test_cursor_round_trip():
+    params = listing_params(fields=["location"], class_filter="PointLight", limit=50)
+    cursor = encode_cursor(params, 50, "epoch:7")
+    assert decode_cursor(cursor) == ({"fields": ["location"], "class_filter": "PointLight",
+                                      "offset": 50, "limit": 50}, "epoch:7")
+    # Cursors are opaque URL-safe tokens
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+
+
+def test_cursor_without_version():
+    assert decode_cursor(encode_cursor({"limit": 10}, 10)) == ({"offset": 10, "limit": 10}, None)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"[1, 2]").decode("ascii"),
+    base64.urlsafe_b64encode(b'{"limit": 10}').decode("ascii"),
+    base64.urlsafe_b64encode(b'{"offset": "10"}').decode("ascii"),
+    base64.urlsafe_b64encode(b'{"offset": 10, "version": 3}').decode("ascii"),
+])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("kwargs", [{"fields": ["mesh"]}, {"offset": -1}, {"limit": 0}])
+def test_invalid_listing_params_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        listing_params(**kwargs)
+
+
+def test_cursor_pages_cover_the_level(connect, editor):
+    async def scenario():
+        async with connect() as unreal:
+            names = []
+            params, version = listing_params(fields=["name"], limit=4), None
+            while True:
+                result = (await unreal.send_command("get_actors_in_level", params))["result"]
+                check_page_version(version, result)
+                names += [actor["name"] for actor in result["actors"]]
+                if result.get("next_offset") is None:
+                    return names
+                params, version = decode_cursor(encode_cursor(params, result["next_offset"], result["version"]))
+
+    assert asyncio.run(scenario()) == [f"Actor_{index}" for index in range(10)]
+
+
+def test_iter_actor_pages_projects_fields(connect, multiplex):
+    async def scenario():
+        async with connect(multiplex=multiplex) as unreal:
+            return [page async for page in unreal.iter_actor_pages(fields=["location"], page_size=3)]
+
+    pages = asyncio.run(scenario())
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert all(set(actor) == {"name", "location"} for page in pages for actor in page)
+
+
+def test_level_change_between_pages_fails_the_listing(connect, editor):
+    async def scenario():
+        async with connect() as unreal:
+            pages = unreal.iter_actor_pages(page_size=4)
+            await pages.__anext__()
+            editor.execute("spawn_actor", {"name": "Intruder", "type": "StaticMeshActor"})
+            with pytest.raises(ListingChangedError):
+                await pages.__anext__()
+
+    asyncio.run(scenario())
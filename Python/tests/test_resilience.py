@@ -0,0 +1,123 @@
+"""
+Tests for the circuit breaker, adaptive timeouts and retries.
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from connection import AsyncUnrealConnection
+from connection.resilience import STATE_CLOSED, STATE_OPEN, AdaptiveTimeouts, CircuitBreaker, RetryPolicy
+from fake_editor import FakeUnrealEditor
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_breaker_opens_on_failed_connects_and_closes_once_unreal_is_back():
+    port = free_port()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+
+    async def scenario(editor=None):
+        unreal = AsyncUnrealConnection("127.0.0.1", port, connect_timeout=1.0, breaker=breaker)
+        try:
+            return await unreal.send_command("spawn_actor", {"name": "Crate", "type": "StaticMeshActor"})
+        finally:
+            await unreal.close()
+
+    assert asyncio.run(scenario()) is None
+    assert breaker.state == STATE_CLOSED
+    assert asyncio.run(scenario()) is None
+    assert breaker.state == STATE_OPEN
+
+    # Fails fast while open, without trying to connect
+    response = asyncio.run(scenario())
+    assert "circuit breaker open" in response["error"]
+    assert breaker.stats()["rejected"] == 1
+
+    with FakeUnrealEditor(port=port):
+        time.sleep(0.2)
+        # The half-open probe succeeds and closes the breaker
+        assert asyncio.run(scenario())["status"] == "success"
+    assert breaker.state == STATE_CLOSED
+    assert breaker.opened == 1
+
+
+def test_read_behind_a_script_neither_times_out_nor_opens_the_breaker(multiplex):
+    """A read queued on the game thread behind a script gets its timeout from when the script ends."""
+    async def scenario(editor):
+        unreal = AsyncUnrealConnection(
+            editor.host, editor.port, multiplex=multiplex,
+            breaker=CircuitBreaker(failure_threshold=1),
+            timeouts=AdaptiveTimeouts(minimum=0.25, overrides={"execute_python_script": 30.0}),
+            retry=RetryPolicy(),
+        )
+        try:
+            for _ in range(25):
+                await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            # Reads are quick, so their adaptive timeout is down to the minimum
+            assert unreal.timeouts.timeout("get_actor_properties") == 0.25
+
+            script = asyncio.ensure_future(unreal.send_command("execute_python_script", {"script": "print(1)"}))
+            await asyncio.sleep(0.05)
+            reads = await asyncio.gather(*(unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+                                           for _ in range(3)))
+            assert [read["status"] for read in reads] == ["success"] * 3, reads
+            assert (await script)["status"] == "success"
+
+            spawned = await unreal.send_command("spawn_actor", {"name": "Crate", "type": "StaticMeshActor"})
+            assert spawned["status"] == "success"
+            assert unreal.breaker.stats()["opened"] == 0
+            assert unreal.stats()["timeouts"]["get_actor_properties"] == 0.25
+        finally:
+            await unreal.close()
+
+    with FakeUnrealEditor(execution_times={"execute_python_script": 1.0}) as editor:
+        editor.populate(2)
+        asyncio.run(scenario(editor))
+
+
+def test_response_timeout_is_not_retried_or_counted(multiplex):
+    async def scenario(editor):
+        unreal = AsyncUnrealConnection(editor.host, editor.port, multiplex=multiplex, response_timeout=0.1,
+                                       breaker=CircuitBreaker(failure_threshold=1), retry=RetryPolicy())
+        try:
+            await unreal.connect()
+            handled = editor.commands_handled
+            response = await unreal.send_command("get_actor_properties", {"name": "Actor_1"})
+            assert response == {"status": "error", "error": "Timeout receiving Unreal response"}
+            assert unreal.breaker.state == STATE_CLOSED
+            # Let the slow read finish on the game thread: it ran once, so it was not retried
+            await asyncio.sleep(0.4)
+            assert editor.commands_handled == handled + 1
+        finally:
+            await unreal.close()
+
+    with FakeUnrealEditor(execution_times={"get_actor_properties": 0.3}) as editor:
+        editor.populate(2)
+        asyncio.run(scenario(editor))
+
+
+def test_adaptive_timeout_follows_latency():
+    timeouts = AdaptiveTimeouts(default=5.0, minimum=0.5, maximum=10.0, multiplier=3.0, min_samples=4,
+                                overrides={"execute_python_script": 300.0})
+    assert timeouts.timeout("get_actor_properties") == 5.0
+    for seconds in (0.1, 0.2, 0.3, 1.0):
+        timeouts.observe("get_actor_properties", seconds)
+    assert timeouts.timeout("get_actor_properties") == pytest.approx(3.0)
+    for _ in range(4):
+        timeouts.observe("ping", 0.001)
+    assert timeouts.timeout("ping") == 0.5
+    assert timeouts.timeout("execute_python_script") == 300.0
+
+
+def test_retry_delays_are_capped():
+    retry = RetryPolicy(retries=5, base_delay=0.1, max_delay=0.3)
+    assert retry.retryable("get_actor_properties")
+    assert not retry.retryable("spawn_actor")
+    assert all(0.0 <= retry.delay(attempt) <= min(0.1 * 2 ** attempt, 0.3) for attempt in range(6))
@@ -0,0 +1,72 @@
+"""
+Tests for the command scheduler.
+"""
+
+import asyncio
+import time
+
+from connection import CommandScheduler
+from connection.scheduler import PRIORITY_MUTATION, PRIORITY_SCRIPT, current_session
+
+
+async def in_session(session: str, call):
+    current_session.set(session)
+    return await call
+
+
+def test_read_overtakes_queued_mutations_but_not_a_script_already_sent(editor, connect, multiplex):
+    editor.execution_times.update({"execute_python_script": 0.3, "spawn_actor": 0.1})
+    scheduler = CommandScheduler(4)
+
+    async def scenario():
+        async with connect(scheduler=scheduler, multiplex=multiplex, min_size=4, max_size=8) as unreal:
+            # Open the pooled streams up front, so the read doesn't shake hands behind the script
+            await unreal.connect()
+            script = asyncio.create_task(in_session("A", unreal.send_command("execute_python_script", {"script": "pass"})))
+            await asyncio.sleep(0.02)
+            spawns = [asyncio.create_task(in_session("A", unreal.send_command("spawn_actor", {"name": f"Crate_{i}"})))
+                      for i in range(4)]
+            await asyncio.sleep(0.02)
+            # Only the script went out; the mutations wait for it instead of filling the other slots
+            assert scheduler.running(PRIORITY_SCRIPT) == 1
+            assert scheduler.running(PRIORITY_MUTATION) == 0
+            assert scheduler.queued(PRIORITY_MUTATION) == 4
+
+            started = time.perf_counter()
+            read = await in_session("B", unreal.send_command("get_actor_properties", {"name": "Actor_1"}))
+            assert read["status"] == "success"
+            # The read waited for the script on the game thread, but for none of the mutations
+            assert time.perf_counter() - started > 0.2
+            assert not any(spawn.done() for spawn in spawns)
+            assert (await script)["status"] == "success"
+
+            for response in await asyncio.gather(*spawns):
+                assert response["status"] == "success"
+
+    asyncio.run(scenario())
+
+
+def test_one_mutation_outstanding_at_a_time(editor, connect):
+    editor.execution_times["spawn_actor"] = 0.02
+    scheduler = CommandScheduler(4)
+    most = 0
+
+    async def scenario():
+        nonlocal most
+
+        async def watch():
+            nonlocal most
+            while True:
+                most = max(most, scheduler.running(PRIORITY_MUTATION) + scheduler.running(PRIORITY_SCRIPT))
+                await asyncio.sleep(0.002)
+
+        async with connect(scheduler=scheduler, max_size=8) as unreal:
+            watcher = asyncio.create_task(watch())
+            responses = await asyncio.gather(*(
+                in_session(f"agent-{i % 2}", unreal.send_command("spawn_actor", {"name": f"Crate_{i}"}))
+                for i in range(8)))
+            watcher.cancel()
+            assert all(response["status"] == "success" for response in responses)
+
+    asyncio.run(scenario())
+    assert most == 1
@@ -1,5 +1,5 @@
 import os
-import json
+import asyncio
 
 import faiss
 import logging
@@ -11,6 +11,8 @@ from functools import lru_cache
 
 from typing import Dict, List, Any, Optional
 
+from connection.codec import json_loads
+
 openai = OpenAI(
     api_key=os.getenv("OPENAI_API_KEY")
 )
@@ -33,6 +35,12 @@ def _embedding(text: str):
     logger.debug(f"Embedding: {embedding}")
     return np.array(embedding)
 
+@lru_cache(maxsize=4)
+def _load_chunks(json_file: str) -> list:
+    """Load a chunk database once instead of on every recall"""
+    with open(json_file, "rb") as f:
+        return json_loads(f.read())
+
 @lru_cache(maxsize=64)
 def _recall(query: str, db, json_file, top_k: int = 10):
     """Recall top-k results from the database"""
@@ -46,9 +54,8 @@ def _recall(query: str, db, json_file, top_k: int = 10):
 
     index_results = index_results[0].astype(int)
 
-    with open(json_file, "r") as f:
-        json_data = json.load(f)
-        prompt_results = [json_data[i] for i in index_results if i != -1]
+    json_data = _load_chunks(json_file)
+    prompt_results = [json_data[i] for i in index_results if i != -1]
 
     return prompt_results, distance_results[0]
 
@@ -116,12 +123,13 @@ def retrieval(prompt: str, class_top_k: int = 3, method_top_k: int = 10):
 def register_api_doc_tools(mcp: FastMCP):
     """Register API Doc tools with the MCP server."""
     @mcp.tool()
-    @lru_cache(maxsize=64)
-    def api_doc_query(query: str) -> Dict[str, Any]:
+    async def api_doc_query(query: str) -> Dict[str, Any]:
         """Query the Unreal Python API database with the given query."""
         logger.info(f"Received query: {query}")
         try:
-            classes_results, methods_results = retrieval(query)
+            # Embedding and vector search block, so keep them off the event loop;
+            # retrieval() is cached, so repeated queries return immediately
+            classes_results, methods_results = await asyncio.to_thread(retrieval, query)
             text_cue = f"""
             ## Class Results:
             {[f"{clas}\n" for clas in classes_results]}
@@ -0,0 +1,64 @@
+"""
+Batch Tools for Unreal MCP.
+
+This module provides a tool for running several Unreal commands in a single round trip.
+"""
+
+import logging
+from typing import Dict, List, Any
+from mcp.server.fastmcp import FastMCP, Context
+
+from observability import payload
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+def register_batch_tools(mcp: FastMCP):
+    """Register batch tools with the MCP server."""
+
+    @mcp.tool()
+    async def batch_execute(
+        ctx: Context,
+        commands: List[Dict[str, Any]],
+        stop_on_error: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Execute several Unreal commands in order, in a single round trip.
+
+        Use this instead of calling tools one by one for multi-step edits, e.g.
+        creating a Blueprint, adding components and compiling it.
+
+        Args:
+            commands: Ordered list of commands, each {"type": <command name>, "params": {...}},
+                      e.g. [{"type": "create_blueprint", "params": {"name": "BP_Bird", "parent_class": "Pawn"}},
+                            {"type": "compile_blueprint", "params": {"blueprint_name": "BP_Bird"}}]
+            stop_on_error: Skip the remaining commands after the first one that fails
+
+        Returns:
+            Dict with one result per command that ran ("results"), and counts of
+            "succeeded", "failed" and "skipped" commands
+        """
+        from unreal_mcp_server import get_unreal_connection
+
+        try:
+            unreal = await get_unreal_connection()
+            if not unreal:
+                logger.error("Failed to connect to Unreal Engine")
+                return {"success": False, "message": "Failed to connect to Unreal Engine"}
+
+            logger.info(f"Executing batch of {len(commands)} commands (stop_on_error={stop_on_error})")
+            response = await unreal.send_batch(commands, stop_on_error=stop_on_error)
+
+            if not response:
+                logger.error("No response from Unreal Engine")
+                return {"success": False, "message": "No response from Unreal Engine"}
+
+            logger.info("Batch execution response: %s", payload(response))
+            return response
+
+        except Exception as e:
+            error_msg = f"Error executing batch: {e}"
+            logger.error(error_msg)
+            return {"success": False, "message": error_msg}
+
+    logger.info("Batch tools registered successfully")
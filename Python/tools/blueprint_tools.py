@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -15,7 +17,7 @@ def register_blueprint_tools(mcp: FastMCP):
     """Register Blueprint tools with the MCP server."""
 
     @mcp.tool()
-    def create_blueprint(
+    async def create_blueprint(
         ctx: Context,
         name: str,
         parent_class: str
@@ -25,12 +27,12 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
 
-            response = unreal.send_command("create_blueprint", {
+            response = await unreal.send_command("create_blueprint", {
                 "name": name,
                 "parent_class": parent_class
             })
@@ -39,7 +41,7 @@ def register_blueprint_tools(mcp: FastMCP):
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Blueprint creation response: {response}")
+            logger.info("Blueprint creation response: %s", payload(response))
             return response or {}
 
         except Exception as e:
@@ -48,7 +50,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def add_component_to_blueprint(
+    async def add_component_to_blueprint(
         ctx: Context,
         blueprint_name: str,
         component_type: str,
@@ -99,19 +101,19 @@ def register_blueprint_tools(mcp: FastMCP):
                 # Ensure all values are float
                 params[param_name] = [float(val) for val in param_value]
 
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
 
-            logger.info(f"Adding component to blueprint with params: {params}")
-            response = unreal.send_command("add_component_to_blueprint", params)
+            logger.info("Adding component to blueprint with params: %s", payload(params))
+            response = await unreal.send_command("add_component_to_blueprint", params)
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Component addition response: {response}")
+            logger.info("Component addition response: %s", payload(response))
             return response
 
         except Exception as e:
@@ -120,7 +122,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def set_static_mesh_properties(
+    async def set_static_mesh_properties(
         ctx: Context,
         blueprint_name: str,
         component_name: str,
@@ -140,7 +142,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -151,14 +153,14 @@ def register_blueprint_tools(mcp: FastMCP):
                 "static_mesh": static_mesh
             }
 
-            logger.info(f"Setting static mesh properties with params: {params}")
-            response = unreal.send_command("set_static_mesh_properties", params)
+            logger.info("Setting static mesh properties with params: %s", payload(params))
+            response = await unreal.send_command("set_static_mesh_properties", params)
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Set static mesh properties response: {response}")
+            logger.info("Set static mesh properties response: %s", payload(response))
             return response
 
         except Exception as e:
@@ -167,7 +169,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def set_component_property(
+    async def set_component_property(
         ctx: Context,
         blueprint_name: str,
         component_name: str,
@@ -178,7 +180,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -190,14 +192,14 @@ def register_blueprint_tools(mcp: FastMCP):
                 "property_value": property_value
             }
 
-            logger.info(f"Setting component property with params: {params}")
-            response = unreal.send_command("set_component_property", params)
+            logger.info("Setting component property with params: %s", payload(params))
+            response = await unreal.send_command("set_component_property", params)
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Set component property response: {response}")
+            logger.info("Set component property response: %s", payload(response))
             return response
 
         except Exception as e:
@@ -206,7 +208,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def set_physics_properties(
+    async def set_physics_properties(
         ctx: Context,
         blueprint_name: str,
         component_name: str,
@@ -220,7 +222,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -235,14 +237,14 @@ def register_blueprint_tools(mcp: FastMCP):
                 "angular_damping": float(angular_damping)
             }
             
-            logger.info(f"Setting physics properties with params: {params}")
-            response = unreal.send_command("set_physics_properties", params)
+            logger.info("Setting physics properties with params: %s", payload(params))
+            response = await unreal.send_command("set_physics_properties", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Set physics properties response: {response}")
+            logger.info("Set physics properties response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -251,7 +253,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def compile_blueprint(
+    async def compile_blueprint(
         ctx: Context,
         blueprint_name: str
     ) -> Dict[str, Any]:
@@ -259,7 +261,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -269,13 +271,13 @@ def register_blueprint_tools(mcp: FastMCP):
             }
             
             logger.info(f"Compiling blueprint: {blueprint_name}")
-            response = unreal.send_command("compile_blueprint", params)
+            response = await unreal.send_command("compile_blueprint", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Compile blueprint response: {response}")
+            logger.info("Compile blueprint response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -284,7 +286,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def set_blueprint_property(
+    async def set_blueprint_property(
         ctx: Context,
         blueprint_name: str,
         property_name: str,
@@ -304,7 +306,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -315,14 +317,14 @@ def register_blueprint_tools(mcp: FastMCP):
                 "property_value": property_value
             }
             
-            logger.info(f"Setting blueprint property with params: {params}")
-            response = unreal.send_command("set_blueprint_property", params)
+            logger.info("Setting blueprint property with params: %s", payload(params))
+            response = await unreal.send_command("set_blueprint_property", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Set blueprint property response: {response}")
+            logger.info("Set blueprint property response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -331,7 +333,7 @@ def register_blueprint_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     # @mcp.tool() commented out, just use set_component_property instead
-    def set_pawn_properties(
+    async def set_pawn_properties(
         ctx: Context,
         blueprint_name: str,
         auto_possess_player: str = "",
@@ -358,7 +360,7 @@ def register_blueprint_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -394,7 +396,7 @@ def register_blueprint_tools(mcp: FastMCP):
                 }
                 
                 logger.info(f"Setting pawn property {prop_name} to {prop_value}")
-                response = unreal.send_command("set_blueprint_property", params)
+                response = await unreal.send_command("set_blueprint_property", params)
                 
                 if not response:
                     logger.error(f"No response from Unreal Engine for property {prop_name}")
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any, Optional
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -15,60 +17,104 @@ def register_editor_tools(mcp: FastMCP):
     """Register editor tools with the MCP server."""
     
     @mcp.tool()
-    def get_actors_in_level(ctx: Context) -> List[Dict[str, Any]]:
-        """Get a list of all actors in the current level."""
+    async def get_actors_in_level(
+        ctx: Context,
+        fields: Optional[List[str]] = None,
+        class_filter: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the actors in the current level, optionally filtered and one page at a time.
+
+        Args:
+            ctx: The MCP context
+            fields: Actor fields to return besides the name, any of
+                    "class", "label", "location", "rotation", "scale" (default: all).
+                    Use ["class"] when only names and classes are needed.
+            class_filter: Only return actors of this class or its subclasses (e.g. "PointLight")
+            offset: Index of the first matching actor to return
+            limit: Most actors to return (default: all)
+            cursor: "next_cursor" from a previous call, to get the following page with the same filters.
+                    Fails if the level changed since that call; list again from the first page then.
+
+        Returns:
+            Dict with the page of "actors", the "total" number of matching actors, and
+            a "next_cursor" while more remain
+        """
         from unreal_mcp_server import get_unreal_connection
+        from connection.paging import (
+            ListingChangedError,
+            check_page_version,
+            decode_cursor,
+            encode_cursor,
+            listing_params,
+        )
         
         try:
-            unreal = get_unreal_connection()
+            if cursor:
+                params, version = decode_cursor(cursor)
+            else:
+                params, version = listing_params(fields, class_filter, offset, limit), None
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
+        try:
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.warning("Failed to connect to Unreal Engine")
-                return []
+                return {"success": False, "message": "Failed to connect to Unreal Engine"}
                 
-            response = unreal.send_command("get_actors_in_level", {})
+            response = await unreal.send_command("get_actors_in_level", params)
             
             if not response:
                 logger.warning("No response from Unreal Engine")
-                return []
-                
-            # Log the complete response for debugging
-            logger.info(f"Complete response from Unreal: {response}")
-            
-            # Check response format
-            if "result" in response and "actors" in response["result"]:
-                actors = response["result"]["actors"]
-                logger.info(f"Found {len(actors)} actors in level")
-                return actors
-            elif "actors" in response:
-                actors = response["actors"]
-                logger.info(f"Found {len(actors)} actors in level")
-                return actors
+                return {"success": False, "message": "No response from Unreal Engine"}
+
+            if response.get("status") == "error":
+                return {"success": False, "message": response.get("error", "Unknown Unreal error")}
                 
-            logger.warning(f"Unexpected response format: {response}")
-            return []
+            result = response.get("result", response)
+            try:
+                check_page_version(version, result)
+            except ListingChangedError as e:
+                return {"success": False, "message": str(e)}
+            actors = result.get("actors", [])
+            logger.info(f"Found {len(actors)} actors in level")
+
+            next_offset = result.get("next_offset")
+            return {
+                "actors": actors,
+                "total": result.get("total", len(actors)),
+                "next_cursor": (
+                    encode_cursor(params, next_offset, result.get("version")) if next_offset is not None else None
+                ),
+            }
             
         except Exception as e:
             logger.error(f"Error getting actors: {e}")
-            return []
+            return {"success": False, "message": str(e)}
 
     @mcp.tool()
-    def find_actors_by_name(ctx: Context, pattern: str) -> List[str]:
+    async def find_actors_by_name(ctx: Context, pattern: str) -> List[str]:
         """Find actors by name pattern."""
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.warning("Failed to connect to Unreal Engine")
                 return []
                 
-            response = unreal.send_command("find_actors_by_name", {
+            response = await unreal.send_command("find_actors_by_name", {
                 "pattern": pattern
             })
             
             if not response:
                 return []
                 
+            if "result" in response and "actors" in response["result"]:
+                return response["result"]["actors"]
             return response.get("actors", [])
             
         except Exception as e:
@@ -76,7 +122,7 @@ def register_editor_tools(mcp: FastMCP):
             return []
     
     @mcp.tool()
-    def spawn_actor(
+    async def spawn_actor(
         ctx: Context,
         name: str,
         type: str,
@@ -98,7 +144,7 @@ def register_editor_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -121,14 +167,14 @@ def register_editor_tools(mcp: FastMCP):
                 params[param_name] = [float(val) for val in param_value]
 
             logger.info(f"Creating actor '{name}' of type '{type}' with params: {params}")
-            response = unreal.send_command("spawn_actor", params)
+            response = await unreal.send_command("spawn_actor", params)
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
             # Log the complete response for debugging
-            logger.info(f"Actor creation response: {response}")
+            logger.info("Actor creation response: %s", payload(response))
 
             # Handle error responses correctly
             if response.get("status") == "error":
@@ -144,17 +190,17 @@ def register_editor_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def delete_actor(ctx: Context, name: str) -> Dict[str, Any]:
+    async def delete_actor(ctx: Context, name: str) -> Dict[str, Any]:
         """Delete an actor by name."""
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
 
-            response = unreal.send_command("delete_actor", {
+            response = await unreal.send_command("delete_actor", {
                 "name": name
             })
             return response or {}
@@ -164,7 +210,7 @@ def register_editor_tools(mcp: FastMCP):
             return {}
 
     @mcp.tool()
-    def set_actor_transform(
+    async def set_actor_transform(
         ctx: Context,
         name: str,
         location: List[float]  = None,
@@ -175,7 +221,7 @@ def register_editor_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -188,7 +234,7 @@ def register_editor_tools(mcp: FastMCP):
             if scale is not None:
                 params["scale"] = scale
 
-            response = unreal.send_command("set_actor_transform", params)
+            response = await unreal.send_command("set_actor_transform", params)
             return response or {}
 
         except Exception as e:
@@ -196,17 +242,17 @@ def register_editor_tools(mcp: FastMCP):
             return {}
 
     @mcp.tool()
-    def get_actor_properties(ctx: Context, name: str) -> Dict[str, Any]:
+    async def get_actor_properties(ctx: Context, name: str) -> Dict[str, Any]:
         """Get all properties of an actor."""
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
 
-            response = unreal.send_command("get_actor_properties", {
+            response = await unreal.send_command("get_actor_properties", {
                 "name": name
             })
             return response or {}
@@ -216,7 +262,7 @@ def register_editor_tools(mcp: FastMCP):
             return {}
 
     @mcp.tool()
-    def set_actor_property(
+    async def set_actor_property(
         ctx: Context,
         name: str,
         property_name: str,
@@ -236,12 +282,12 @@ def register_editor_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
 
-            response = unreal.send_command("set_actor_property", {
+            response = await unreal.send_command("set_actor_property", {
                 "name": name,
                 "property_name": property_name,
                 "property_value": property_value
@@ -251,7 +297,7 @@ def register_editor_tools(mcp: FastMCP):
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Set actor property response: {response}")
+            logger.info("Set actor property response: %s", payload(response))
             return response
 
         except Exception as e:
@@ -260,7 +306,7 @@ def register_editor_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     # @mcp.tool() commented out because it's buggy
-    def focus_viewport(
+    async def focus_viewport(
         ctx: Context,
         target: str = None,
         location: List[float] = None,
@@ -282,7 +328,7 @@ def register_editor_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -299,7 +345,7 @@ def register_editor_tools(mcp: FastMCP):
             if orientation:
                 params["orientation"] = orientation
 
-            response = unreal.send_command("focus_viewport", params)
+            response = await unreal.send_command("focus_viewport", params)
             return response or {}
 
         except Exception as e:
@@ -307,7 +353,7 @@ def register_editor_tools(mcp: FastMCP):
             return {"status": "error", "message": str(e)}
 
     @mcp.tool()
-    def spawn_blueprint_actor(
+    async def spawn_blueprint_actor(
         ctx: Context,
         blueprint_name: str,
         actor_name: str,
@@ -329,7 +375,7 @@ def register_editor_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -351,14 +397,14 @@ def register_editor_tools(mcp: FastMCP):
                 # Ensure all values are float
                 params[param_name] = [float(val) for val in param_value]
 
-            logger.info(f"Spawning blueprint actor with params: {params}")
-            response = unreal.send_command("spawn_blueprint_actor", params)
+            logger.info("Spawning blueprint actor with params: %s", payload(params))
+            response = await unreal.send_command("spawn_blueprint_actor", params)
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Spawn blueprint actor response: {response}")
+            logger.info("Spawn blueprint actor response: %s", payload(response))
             return response
 
         except Exception as e:
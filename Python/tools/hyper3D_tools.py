@@ -3,10 +3,10 @@ Hyper3D tools module.
 This module provides tools for managing Hyper3D API interactions.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any
 import requests
-import time
 from typing import List
 import os
 
@@ -71,7 +71,7 @@ def download_results(task_uuid):
 
 def register_hyper3d_tools(mcp: FastMCP):
     @mcp.tool()
-    def hyper3d_tool(ctx: Context, prompt: str, path: str = RESULT_PATH) -> Dict[str, Any]:
+    async def hyper3d_tool(ctx: Context, prompt: str, path: str = RESULT_PATH) -> Dict[str, Any]:
         """
         Submit a job to Hyper3D and then download to the given path.
 
@@ -94,7 +94,7 @@ def register_hyper3d_tools(mcp: FastMCP):
         logger.info(f"Starting Hyper3D generation with prompt: '{prompt}'")
 
         # Submit the task and get the task UUID
-        task_response = submit_task(prompt)
+        task_response = await asyncio.to_thread(submit_task, prompt)
         if 'error' in task_response and task_response['error'] is not None:
             error_msg = f"Error submitting task: {task_response['error']}"
             logger.error(error_msg)
@@ -112,15 +112,15 @@ def register_hyper3d_tools(mcp: FastMCP):
         # Poll the status endpoint every 5 seconds until the task is done
         status = []
         while len(status) == 0 or not all(s['status'] in ['Done', 'Failed'] for s in status):
-            time.sleep(5)
-            status_response = check_status(subscription_key)
+            await asyncio.sleep(5)
+            status_response = await asyncio.to_thread(check_status, subscription_key)
             status = status_response['jobs']
             for s in status:
                 logger.info(f"Job {s['uuid']}: {s['status']}")
                 print(f"job {s['uuid']}: {s['status']}")
 
         # Download the results once the task is done
-        download_response = download_results(task_uuid)
+        download_response = await asyncio.to_thread(download_results, task_uuid)
         download_items = download_response['list']
 
         downloaded_files = []
@@ -129,8 +129,8 @@ def register_hyper3d_tools(mcp: FastMCP):
             print(f"File Name: {item['name']}, URL: {item['url']}")
             dest_fname = os.path.join(path, item['name'])
             os.makedirs(os.path.dirname(dest_fname), exist_ok=True)
+            response = await asyncio.to_thread(requests.get, item['url'])
             with open(dest_fname, 'wb') as f:
-                response = requests.get(item['url'])
                 f.write(response.content)
                 print(f"Downloaded {dest_fname}")
                 downloaded_files.append(dest_fname)
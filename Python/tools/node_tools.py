@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any, Optional
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -15,7 +17,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
     """Register Blueprint node manipulation tools with the MCP server."""
     
     @mcp.tool()
-    def add_blueprint_event_node(
+    async def add_blueprint_event_node(
         ctx: Context,
         blueprint_name: str,
         event_name: str,
@@ -48,19 +50,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "node_position": node_position
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding event node '{event_name}' to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_event_node", params)
+            response = await unreal.send_command("add_blueprint_event_node", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Event node creation response: {response}")
+            logger.info("Event node creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -69,7 +71,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def add_blueprint_input_action_node(
+    async def add_blueprint_input_action_node(
         ctx: Context,
         blueprint_name: str,
         action_name: str,
@@ -99,19 +101,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "node_position": node_position
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding input action node for '{action_name}' to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_input_action_node", params)
+            response = await unreal.send_command("add_blueprint_input_action_node", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Input action node creation response: {response}")
+            logger.info("Input action node creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -120,7 +122,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def add_blueprint_function_node(
+    async def add_blueprint_function_node(
         ctx: Context,
         blueprint_name: str,
         target: str,
@@ -158,19 +160,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "node_position": node_position
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding function node '{function_name}' to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_function_node", command_params)
+            response = await unreal.send_command("add_blueprint_function_node", command_params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Function node creation response: {response}")
+            logger.info("Function node creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -179,7 +181,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
             
     @mcp.tool()
-    def connect_blueprint_nodes(
+    async def connect_blueprint_nodes(
         ctx: Context,
         blueprint_name: str,
         source_node_id: str,
@@ -211,19 +213,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "target_pin": target_pin
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Connecting nodes in blueprint '{blueprint_name}'")
-            response = unreal.send_command("connect_blueprint_nodes", params)
+            response = await unreal.send_command("connect_blueprint_nodes", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Node connection response: {response}")
+            logger.info("Node connection response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -232,7 +234,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def add_blueprint_variable(
+    async def add_blueprint_variable(
         ctx: Context,
         blueprint_name: str,
         variable_name: str,
@@ -261,19 +263,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "is_exposed": is_exposed
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding variable '{variable_name}' to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_variable", params)
+            response = await unreal.send_command("add_blueprint_variable", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Variable creation response: {response}")
+            logger.info("Variable creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -282,7 +284,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def add_blueprint_get_self_component_reference(
+    async def add_blueprint_get_self_component_reference(
         ctx: Context,
         blueprint_name: str,
         component_name: str,
@@ -313,19 +315,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "node_position": node_position
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding self component reference node for '{component_name}' to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_get_self_component_reference", params)
+            response = await unreal.send_command("add_blueprint_get_self_component_reference", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Self component reference node creation response: {response}")
+            logger.info("Self component reference node creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -334,7 +336,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def add_blueprint_self_reference(
+    async def add_blueprint_self_reference(
         ctx: Context,
         blueprint_name: str,
         node_position = None
@@ -360,19 +362,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "node_position": node_position
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Adding self reference node to blueprint '{blueprint_name}'")
-            response = unreal.send_command("add_blueprint_self_reference", params)
+            response = await unreal.send_command("add_blueprint_self_reference", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Self reference node creation response: {response}")
+            logger.info("Self reference node creation response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -381,7 +383,7 @@ def register_blueprint_node_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
     
     @mcp.tool()
-    def find_blueprint_nodes(
+    async def find_blueprint_nodes(
         ctx: Context,
         blueprint_name: str,
         node_type = None,
@@ -407,19 +409,19 @@ def register_blueprint_node_tools(mcp: FastMCP):
                 "event_type": event_type
             }
             
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
             
             logger.info(f"Finding nodes in blueprint '{blueprint_name}'")
-            response = unreal.send_command("find_blueprint_nodes", params)
+            response = await unreal.send_command("find_blueprint_nodes", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Node find response: {response}")
+            logger.info("Node find response: %s", payload(response))
             return response
             
         except Exception as e:
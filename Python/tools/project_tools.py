@@ -8,6 +8,8 @@ import logging
 from typing import Dict, Any
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -15,7 +17,7 @@ def register_project_tools(mcp: FastMCP):
     """Register project tools with the MCP server."""
     
     @mcp.tool()
-    def create_input_mapping(
+    async def create_input_mapping(
         ctx: Context,
         action_name: str,
         key: str,
@@ -35,7 +37,7 @@ def register_project_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -47,13 +49,13 @@ def register_project_tools(mcp: FastMCP):
             }
             
             logger.info(f"Creating input mapping '{action_name}' with key '{key}'")
-            response = unreal.send_command("create_input_mapping", params)
+            response = await unreal.send_command("create_input_mapping", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Input mapping creation response: {response}")
+            logger.info("Input mapping creation response: %s", payload(response))
             return response
             
         except Exception as e:
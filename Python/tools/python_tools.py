@@ -9,6 +9,8 @@ import os
 
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -16,7 +18,7 @@ def register_python_tools(mcp: FastMCP):
     """Register Python tools with the MCP server."""
 
     @mcp.tool()
-    def execute_python_script(ctx: Context, script: Optional[str] = None, path: Optional[str] = None) -> Dict[str, Any]:
+    async def execute_python_script(ctx: Context, script: Optional[str] = None, path: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute a Python script in the Unreal Engine context.
 
@@ -30,7 +32,7 @@ def register_python_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
 
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -57,13 +59,13 @@ def register_python_tools(mcp: FastMCP):
                     script = file.read()
 
             # Only send script content to Unreal
-            response = unreal.send_command("execute_python_script", {"script": script})
+            response = await unreal.send_command("execute_python_script", {"script": script})
 
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
 
-            logger.info(f"Python script execution response: {response}")
+            logger.info("Python script execution response: %s", payload(response))
             return response
 
         except Exception as e:
@@ -72,7 +74,7 @@ def register_python_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def save_python_script(ctx: Context, script: str, path: str) -> Dict[str, Any]:
+    async def save_python_script(ctx: Context, script: str, path: str) -> Dict[str, Any]:
         """
         Save a Python script to a specified path in the Unreal Engine context. No need to connect to Unreal.
 
@@ -91,7 +93,7 @@ def register_python_tools(mcp: FastMCP):
     logger.info("Python tools registered successfully")
 
     @mcp.tool()
-    def list_python_scripts(ctx: Context, path: str) -> Dict[str, Any]:
+    async def list_python_scripts(ctx: Context, path: str) -> Dict[str, Any]:
         """
         List all Python scripts in a specified path.
 
@@ -118,7 +120,7 @@ def register_python_tools(mcp: FastMCP):
     logger.info("Python tools registered successfully")
 
     @mcp.tool()
-    def read_python_file(ctx: Context, path: str) -> Dict[str, Any]:
+    async def read_python_file(ctx: Context, path: str) -> Dict[str, Any]:
         """
         Read a Python script from a specified path in the Unreal Engine context. No need to connect to Unreal.
 
@@ -140,6 +142,7 @@ def register_python_tools(mcp: FastMCP):
 if __name__ == "__main__":
     import asyncio
     from fastmcp import Client, FastMCP
+    from connection.codec import json_loads
 
     # Configure logging for testing
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -167,8 +170,7 @@ if __name__ == "__main__":
 
                 # Access the content from CallToolResult
                 result = response.content[0].text if response.content else "{}"
-                import json
-                result_dict = json.loads(result)
+                result_dict = json_loads(result)
 
                 if result_dict.get("success"):
                     scripts = result_dict.get("scripts", [])
@@ -194,8 +196,7 @@ if __name__ == "__main__":
 
                 # Access the content from CallToolResult
                 result = response.content[0].text if response.content else "{}"
-                import json
-                result_dict = json.loads(result)
+                result_dict = json_loads(result)
 
                 if not result_dict.get("success"):
                     print(f"Expected error message: {result_dict.get('message')}")
@@ -216,8 +217,7 @@ if __name__ == "__main__":
 
                 # Access the content from CallToolResult
                 result = response.content[0].text if response.content else "{}"
-                import json
-                result_dict = json.loads(result)
+                result_dict = json_loads(result)
 
                 if result_dict.get("success"):
                     scripts = result_dict.get("scripts", [])
@@ -0,0 +1,47 @@
+"""
+Status Tools for Unreal MCP.
+
+This module provides a tool reporting whether the Unreal editors are reachable and how loaded they are.
+"""
+
+import logging
+from typing import Dict, Any
+from mcp.server.fastmcp import FastMCP, Context
+
+# Get logger
+logger = logging.getLogger("UnrealMCP")
+
+def register_status_tools(mcp: FastMCP):
+    """Register status tools with the MCP server."""
+
+    @mcp.tool()
+    async def get_unreal_status(ctx: Context) -> Dict[str, Any]:
+        """
+        Report whether the Unreal Engine editors are reachable.
+
+        Use this when tool calls fail with connection errors, to tell an editor
+        that is down or restarting from a problem with a single command.
+
+        Returns:
+            Dict with "ready" (at least one editor is reachable), "live" (health
+            checks run on schedule), "admission" (commands in flight and queued
+            per session and overall, and how many were turned away as busy) and
+            "editors", giving for each editor its readiness, the last check's
+            latency and error, the commands outstanding on it, its average
+            latency and connection pool counters
+        """
+        from unreal_mcp_server import get_editor_pool
+
+        try:
+            pool = get_editor_pool()
+            if not pool.running:
+                # No background checks (e.g. UNREAL_HEALTH_INTERVAL=0): check now
+                await pool.check()
+            return pool.status()
+
+        except Exception as e:
+            error_msg = f"Error getting Unreal status: {e}"
+            logger.error(error_msg)
+            return {"success": False, "message": error_msg}
+
+    logger.info("Status tools registered successfully")
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any
 from mcp.server.fastmcp import FastMCP, Context
 
+from observability import payload
+
 # Get logger
 logger = logging.getLogger("UnrealMCP")
 
@@ -15,7 +17,7 @@ def register_umg_tools(mcp: FastMCP):
     """Register UMG tools with the MCP server."""
 
     @mcp.tool()
-    def create_umg_widget_blueprint(
+    async def create_umg_widget_blueprint(
         ctx: Context,
         widget_name: str,
         parent_class: str = "UserWidget",
@@ -35,7 +37,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -46,14 +48,14 @@ def register_umg_tools(mcp: FastMCP):
                 "path": path
             }
             
-            logger.info(f"Creating UMG Widget Blueprint with params: {params}")
-            response = unreal.send_command("create_umg_widget_blueprint", params)
+            logger.info("Creating UMG Widget Blueprint with params: %s", payload(params))
+            response = await unreal.send_command("create_umg_widget_blueprint", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Create UMG Widget Blueprint response: {response}")
+            logger.info("Create UMG Widget Blueprint response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -62,7 +64,7 @@ def register_umg_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def add_text_block_to_widget(
+    async def add_text_block_to_widget(
         ctx: Context,
         widget_name: str,
         text_block_name: str,
@@ -90,7 +92,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -105,14 +107,14 @@ def register_umg_tools(mcp: FastMCP):
                 "color": color
             }
             
-            logger.info(f"Adding Text Block to widget with params: {params}")
-            response = unreal.send_command("add_text_block_to_widget", params)
+            logger.info("Adding Text Block to widget with params: %s", payload(params))
+            response = await unreal.send_command("add_text_block_to_widget", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Add Text Block response: {response}")
+            logger.info("Add Text Block response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -121,7 +123,7 @@ def register_umg_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def add_button_to_widget(
+    async def add_button_to_widget(
         ctx: Context,
         widget_name: str,
         button_name: str,
@@ -151,7 +153,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -167,14 +169,14 @@ def register_umg_tools(mcp: FastMCP):
                 "background_color": background_color
             }
             
-            logger.info(f"Adding Button to widget with params: {params}")
-            response = unreal.send_command("add_button_to_widget", params)
+            logger.info("Adding Button to widget with params: %s", payload(params))
+            response = await unreal.send_command("add_button_to_widget", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Add Button response: {response}")
+            logger.info("Add Button response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -183,7 +185,7 @@ def register_umg_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def bind_widget_event(
+    async def bind_widget_event(
         ctx: Context,
         widget_name: str,
         widget_component_name: str,
@@ -205,7 +207,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -221,14 +223,14 @@ def register_umg_tools(mcp: FastMCP):
                 "function_name": function_name
             }
             
-            logger.info(f"Binding widget event with params: {params}")
-            response = unreal.send_command("bind_widget_event", params)
+            logger.info("Binding widget event with params: %s", payload(params))
+            response = await unreal.send_command("bind_widget_event", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Bind widget event response: {response}")
+            logger.info("Bind widget event response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -237,7 +239,7 @@ def register_umg_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def add_widget_to_viewport(
+    async def add_widget_to_viewport(
         ctx: Context,
         widget_name: str,
         z_order: int = 0
@@ -255,7 +257,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -265,14 +267,14 @@ def register_umg_tools(mcp: FastMCP):
                 "z_order": z_order
             }
             
-            logger.info(f"Adding widget to viewport with params: {params}")
-            response = unreal.send_command("add_widget_to_viewport", params)
+            logger.info("Adding widget to viewport with params: %s", payload(params))
+            response = await unreal.send_command("add_widget_to_viewport", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Add widget to viewport response: {response}")
+            logger.info("Add widget to viewport response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -281,7 +283,7 @@ def register_umg_tools(mcp: FastMCP):
             return {"success": False, "message": error_msg}
 
     @mcp.tool()
-    def set_text_block_binding(
+    async def set_text_block_binding(
         ctx: Context,
         widget_name: str,
         text_block_name: str,
@@ -303,7 +305,7 @@ def register_umg_tools(mcp: FastMCP):
         from unreal_mcp_server import get_unreal_connection
         
         try:
-            unreal = get_unreal_connection()
+            unreal = await get_unreal_connection()
             if not unreal:
                 logger.error("Failed to connect to Unreal Engine")
                 return {"success": False, "message": "Failed to connect to Unreal Engine"}
@@ -315,14 +317,14 @@ def register_umg_tools(mcp: FastMCP):
                 "binding_type": binding_type
             }
             
-            logger.info(f"Setting text block binding with params: {params}")
-            response = unreal.send_command("set_text_block_binding", params)
+            logger.info("Setting text block binding with params: %s", payload(params))
+            response = await unreal.send_command("set_text_block_binding", params)
             
             if not response:
                 logger.error("No response from Unreal Engine")
                 return {"success": False, "message": "No response from Unreal Engine"}
             
-            logger.info(f"Set text block binding response: {response}")
+            logger.info("Set text block binding response: %s", payload(response))
             return response
             
         except Exception as e:
@@ -3,212 +3,221 @@ Unreal Engine MCP Server
 
 A simple MCP server for interacting with Unreal Engine.
 """
+import atexit
 import os
 import logging
-import socket
 import sys
-import json
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
+import uvicorn
 
-# Configure logging with more detailed format
-logging.basicConfig(
-    level=logging.DEBUG,  # Change to DEBUG level for more details
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler('unreal_mcp.log'),
-        # logging.StreamHandler(sys.stdout) # Remove this handler to unexpected non-whitespace characters in JSON
-    ]
+# Tools import this module by name; when it runs as a script, make that import
+# return the running module instead of loading a second copy with its own connection
+if __name__ == "__main__":
+    sys.modules.setdefault("unreal_mcp_server", sys.modules[__name__])
+
+from connection import (
+    AdmissionLimiter,
+    AsyncUnrealConnection,
+    CommandScheduler,
+    Compressor,
+    EditorPool,
+    ResponseCache,
+    SceneMirror,
+    TrafficRecorder,
+    parse_editors,
+)
+from connection.codec import JSON_BACKEND
+from connection.compression import parse_command_levels
+from connection.resilience import AdaptiveTimeouts, CircuitBreaker, RetryPolicy, parse_command_timeouts
+from connection.scheduler import parse_command_priorities
+from observability import (
+    CONTENT_TYPE,
+    CommandMetrics,
+    JsonlSpanExporter,
+    MetricsRegistry,
+    Tracer,
+    configure_logging,
+    parse_sampling,
+    trace_tools,
 )
-logger = logging.getLogger("UnrealMCP")
-
-# Configuration
-UNREAL_HOST = "35.89.69.209"
-UNREAL_PORT = 55557
-
-class UnrealConnection:
-    """Connection to an Unreal Engine instance."""
-
-    def __init__(self):
-        """Initialize the connection."""
-        self.socket = None
-        self.connected = False
 
-    def connect(self) -> bool:
-        """Connect to the Unreal Engine instance."""
-        try:
-            # Close any existing socket
-            if self.socket:
-                try:
-                    self.socket.close()
-                except:
-                    pass
-                self.socket = None
-
-            logger.info(f"Connecting to Unreal at {UNREAL_HOST}:{UNREAL_PORT}...")
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(5)  # 5 second timeout
-
-            # Set socket options for better stability
-            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-
-            # Set larger buffer sizes
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
-
-            self.socket.connect((UNREAL_HOST, UNREAL_PORT))
-            self.connected = True
-            logger.info("Connected to Unreal Engine")
-            return True
-
-        except Exception as e:
-            logger.error(f"Failed to connect to Unreal: {e}")
-            self.connected = False
-            return False
-
-    def disconnect(self):
-        """Disconnect from the Unreal Engine instance."""
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
-        self.socket = None
-        self.connected = False
-
-    def receive_full_response(self, sock, buffer_size=4096) -> bytes:
-        """Receive a complete response from Unreal, handling chunked data."""
-        chunks = []
-        sock.settimeout(5)  # 5 second timeout
-        try:
-            while True:
-                chunk = sock.recv(buffer_size)
-                if not chunk:
-                    if not chunks:
-                        raise Exception("Connection closed before receiving data")
-                    break
-                chunks.append(chunk)
-
-                # Process the data received so far
-                data = b''.join(chunks)
-                decoded_data = data.decode('utf-8')
-
-                # Try to parse as JSON to check if complete
-                try:
-                    json.loads(decoded_data)
-                    logger.info(f"Received complete response ({len(data)} bytes)")
-                    return data
-                except json.JSONDecodeError:
-                    # Not complete JSON yet, continue reading
-                    logger.debug(f"Received partial response, waiting for more data...")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Error processing response chunk: {str(e)}")
-                    continue
-        except socket.timeout:
-            logger.warning("Socket timeout during receive")
-            if chunks:
-                # If we have some data already, try to use it
-                data = b''.join(chunks)
-                try:
-                    json.loads(data.decode('utf-8'))
-                    logger.info(f"Using partial response after timeout ({len(data)} bytes)")
-                    return data
-                except:
-                    pass
-            raise Exception("Timeout receiving Unreal response")
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-
-    def send_command(self, command: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
-        """Send a command to Unreal Engine and get the response."""
-        # Always reconnect for each command, since Unreal closes the connection after each command
-        # This is different from Unity which keeps connections alive
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
-            self.connected = False
-
-        if not self.connect():
-            logger.error("Failed to connect to Unreal Engine for command")
-            return None
+# Log through a queue to a rotating file, so the request path never waits on disk.
+# No stdout handler: it would put unexpected non-whitespace characters in the JSON stream.
+_log_listener, _log_handler = configure_logging(
+    os.environ.get("UNREAL_LOG_FILE", "unreal_mcp.log"),
+    level=logging.getLevelName(os.environ.get("UNREAL_LOG_LEVEL", "DEBUG").upper()),
+    max_bytes=int(os.environ.get("UNREAL_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+    backup_count=int(os.environ.get("UNREAL_LOG_BACKUPS", "5")),
+    payload_limit=int(os.environ.get("UNREAL_LOG_PAYLOAD_LIMIT", "2048")),
+    sampling=parse_sampling(os.environ.get("UNREAL_LOG_PAYLOAD_SAMPLING", "")),
+)
+atexit.register(_log_listener.stop)
+logger = logging.getLogger("UnrealMCP")
 
-        try:
-            # Match Unity's command format exactly
-            command_obj = {
-                "type": command,  # Use "type" instead of "command"
-                "params": params or {}  # Use Unity's params or {} pattern
-            }
-
-            # Send without newline, exactly like Unity
-            command_json = json.dumps(command_obj)
-            logger.info(f"Sending command: {command_json}")
-            self.socket.sendall(command_json.encode('utf-8'))
-
-            # Read response using improved handler
-            response_data = self.receive_full_response(self.socket)
-            response = json.loads(response_data.decode('utf-8'))
-
-            # Log complete response for debugging
-            logger.info(f"Complete response from Unreal: {response}")
-
-            # Check for both error formats: {"status": "error", ...} and {"success": false, ...}
-            if response.get("status") == "error":
-                error_message = response.get("error") or response.get("message", "Unknown Unreal error")
-                logger.error(f"Unreal error (status=error): {error_message}")
-                # We want to preserve the original error structure but ensure error is accessible
-                if "error" not in response:
-                    response["error"] = error_message
-            elif response.get("success") is False:
-                # This format uses {"success": false, "error": "message"} or {"success": false, "message": "message"}
-                error_message = response.get("error") or response.get("message", "Unknown Unreal error")
-                logger.error(f"Unreal error (success=false): {error_message}")
-                # Convert to the standard format expected by higher layers
-                response = {
-                    "status": "error",
-                    "error": error_message
-                }
-
-            # Always close the connection after command is complete
-            # since Unreal will close it on its side anyway
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
-            self.connected = False
-
-            return response
-
-        except Exception as e:
-            logger.error(f"Error sending command: {e}")
-            # Always reset connection state on any error
-            self.connected = False
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
-            return {
-                "status": "error",
-                "error": str(e)
-            }
-
-# No global connection state needed since Unreal uses short connections
-
-def get_unreal_connection() -> Optional[UnrealConnection]:
-    """Get a new connection to Unreal Engine for each request."""
+# Configuration, e.g. UNREAL_HOST=127.0.0.1 to run against fake_editor.py
+UNREAL_HOST = os.environ.get("UNREAL_HOST", "35.89.69.209")
+UNREAL_PORT = int(os.environ.get("UNREAL_PORT", "55557"))
+
+# Editors to route commands to, as host:port,...; defaults to UNREAL_HOST:UNREAL_PORT.
+# UNREAL_EDITORS_FILE lists them one per line instead, and is re-read when it changes.
+EDITORS = parse_editors(os.environ.get("UNREAL_EDITORS", "")) or [(UNREAL_HOST, UNREAL_PORT)]
+EDITORS_FILE = os.environ.get("UNREAL_EDITORS_FILE", "")
+EDITORS_RELOAD = float(os.environ.get("UNREAL_EDITORS_RELOAD", "5"))
+# Seconds a removed editor may take to finish its outstanding commands before it is closed
+EDITORS_RETIRE_TIMEOUT = float(os.environ.get("UNREAL_EDITORS_RETIRE_TIMEOUT", "300"))
+# Send the commands of each MCP client session to one editor; 0 routes every command on its own
+SESSION_AFFINITY = os.environ.get("UNREAL_SESSION_AFFINITY", "1") != "0"
+
+# Address the MCP SSE server listens on
+MCP_HOST = os.environ.get("UNREAL_MCP_HOST", "0.0.0.0")
+MCP_PORT = int(os.environ.get("UNREAL_MCP_PORT", "9000"))
+
+# Connection pool configuration
+POOL_MIN_SIZE = int(os.environ.get("UNREAL_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.environ.get("UNREAL_POOL_MAX_SIZE", "4"))
+POOL_IDLE_TIMEOUT = float(os.environ.get("UNREAL_POOL_IDLE_TIMEOUT", "60"))
+
+# Read cache configuration; a TTL of 0 disables caching
+CACHE_TTL = float(os.environ.get("UNREAL_CACHE_TTL", "5"))
+CACHE_MAX_ENTRIES = int(os.environ.get("UNREAL_CACHE_MAX_ENTRIES", "256"))
+
+# Binary codecs to offer Unreal, most preferred first; empty keeps JSON
+CODECS = [name.strip() for name in os.environ.get("UNREAL_CODECS", "cbor,msgpack").split(",") if name.strip()]
+
+# Scene mirror configuration; a max age of 0 sends every name search to Unreal
+SCENE_MAX_AGE = float(os.environ.get("UNREAL_SCENE_MAX_AGE", "30"))
+
+# Frame compression configuration; a threshold of 0 disables compression
+COMPRESSION_THRESHOLD = int(os.environ.get("UNREAL_COMPRESSION_THRESHOLD", "0"))
+COMPRESSION_LEVEL = int(os.environ.get("UNREAL_COMPRESSION_LEVEL", "6"))
+COMPRESSION_LEVELS = parse_command_levels(os.environ.get("UNREAL_COMPRESSION_LEVELS", ""))
+
+# Failure handling: the breaker fails commands fast after consecutive connection
+# failures (a threshold of 0 disables it), response timeouts follow each
+# command's observed latency (a multiplier of 0 keeps UNREAL_RESPONSE_TIMEOUT
+# for every command), and idempotent reads are retried with jittered backoff
+BREAKER_THRESHOLD = int(os.environ.get("UNREAL_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.environ.get("UNREAL_BREAKER_RESET", "10"))
+RESPONSE_TIMEOUT = float(os.environ.get("UNREAL_RESPONSE_TIMEOUT", "5"))
+TIMEOUT_MULTIPLIER = float(os.environ.get("UNREAL_TIMEOUT_MULTIPLIER", "3"))
+TIMEOUT_PERCENTILE = float(os.environ.get("UNREAL_TIMEOUT_PERCENTILE", "0.99"))
+TIMEOUT_MIN = float(os.environ.get("UNREAL_TIMEOUT_MIN", "1"))
+TIMEOUT_MAX = float(os.environ.get("UNREAL_TIMEOUT_MAX", "120"))
+TIMEOUT_OVERRIDES = parse_command_timeouts(os.environ.get("UNREAL_TIMEOUT_OVERRIDES", "execute_python_script=300"))
+RETRIES = int(os.environ.get("UNREAL_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.environ.get("UNREAL_RETRY_BASE_DELAY", "0.05"))
+RETRY_MAX_DELAY = float(os.environ.get("UNREAL_RETRY_MAX_DELAY", "1"))
+
+# Command scheduler: at most SCHEDULER_SLOTS commands outstanding per editor (0
+# disables scheduling), handed out to interactive reads, then mutations, then
+# long-running scripts, with a queue-wait budget per class
+SCHEDULER_SLOTS = int(os.environ.get("UNREAL_SCHEDULER_SLOTS", "4"))
+QUEUE_BUDGETS = parse_command_timeouts(os.environ.get("UNREAL_QUEUE_BUDGETS", ""))
+COMMAND_PRIORITIES = parse_command_priorities(os.environ.get("UNREAL_COMMAND_PRIORITIES", ""))
+
+# Admission limits: at most MAX_IN_FLIGHT commands in flight across all client
+# sessions and SESSION_MAX_IN_FLIGHT from one session (0 for no limit), with
+# bounded queues in front of them; a command that finds its queue full, or
+# waits longer than ADMISSION_TIMEOUT, gets a busy error with a retry-after hint
+MAX_IN_FLIGHT = int(os.environ.get("UNREAL_MAX_IN_FLIGHT", "32"))
+MAX_QUEUED = int(os.environ.get("UNREAL_MAX_QUEUED", "64"))
+SESSION_MAX_IN_FLIGHT = int(os.environ.get("UNREAL_SESSION_MAX_IN_FLIGHT", "8"))
+SESSION_MAX_QUEUED = int(os.environ.get("UNREAL_SESSION_MAX_QUEUED", "16"))
+ADMISSION_TIMEOUT = float(os.environ.get("UNREAL_ADMISSION_TIMEOUT", "30"))
+
+# Health monitor: pings each editor every interval seconds (0 only checks at
+# startup and from the status tool) and refills its pool when it comes back
+HEALTH_INTERVAL = float(os.environ.get("UNREAL_HEALTH_INTERVAL", "5"))
+HEALTH_TIMEOUT = float(os.environ.get("UNREAL_HEALTH_TIMEOUT", "5"))
+
+# Metrics served at /metrics on the MCP HTTP server
+METRICS = MetricsRegistry()
+COMMAND_METRICS = CommandMetrics(METRICS)
+
+# Trace spans are appended to this JSONL file in OTLP/JSON; empty disables tracing
+TRACE_FILE = os.environ.get("UNREAL_TRACE_FILE", "")
+TRACER = Tracer(JsonlSpanExporter(TRACE_FILE)) if TRACE_FILE else None
+if TRACER is not None:
+    atexit.register(TRACER.shutdown)
+
+# Commands sent to Unreal and their responses are captured to this file for replay; empty disables capture
+CAPTURE_FILE = os.environ.get("UNREAL_CAPTURE_FILE", "")
+CAPTURE = TrafficRecorder(CAPTURE_FILE) if CAPTURE_FILE else None
+if CAPTURE is not None:
+    atexit.register(CAPTURE.close)
+
+# Shared editor pool; each editor's connection keeps streams to it open between commands
+_editor_pool: Optional[EditorPool] = None
+
+def _new_connection(host: str, port: int) -> AsyncUnrealConnection:
+    """Create the connection to one editor, without connecting it."""
+    return AsyncUnrealConnection(
+        host,
+        port,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        idle_timeout=POOL_IDLE_TIMEOUT,
+        codecs=CODECS,
+        compression=(
+            Compressor(COMPRESSION_THRESHOLD, COMPRESSION_LEVEL, COMPRESSION_LEVELS, COMMAND_METRICS)
+            if COMPRESSION_THRESHOLD > 0 else None
+        ),
+        cache=ResponseCache(CACHE_MAX_ENTRIES, CACHE_TTL) if CACHE_TTL > 0 else None,
+        scene=SceneMirror(SCENE_MAX_AGE) if SCENE_MAX_AGE > 0 else None,
+        metrics=COMMAND_METRICS,
+        tracer=TRACER,
+        capture=CAPTURE,
+        response_timeout=RESPONSE_TIMEOUT,
+        breaker=CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET) if BREAKER_THRESHOLD > 0 else None,
+        timeouts=(
+            AdaptiveTimeouts(RESPONSE_TIMEOUT, TIMEOUT_MIN, TIMEOUT_MAX, TIMEOUT_MULTIPLIER,
+                             TIMEOUT_PERCENTILE, overrides=TIMEOUT_OVERRIDES)
+            if TIMEOUT_MULTIPLIER > 0 else None
+        ),
+        retry=RetryPolicy(RETRIES, RETRY_BASE_DELAY, RETRY_MAX_DELAY) if RETRIES > 0 else None,
+        scheduler=(
+            CommandScheduler(SCHEDULER_SLOTS, QUEUE_BUDGETS, COMMAND_PRIORITIES, COMMAND_METRICS, f"{host}:{port}")
+            if SCHEDULER_SLOTS > 0 else None
+        ),
+    )
+
+def get_editor_pool() -> EditorPool:
+    """Get the shared pool of editors, created on first use without connecting."""
+    global _editor_pool
+    if _editor_pool is None:
+        _editor_pool = EditorPool(
+            _new_connection,
+            EDITORS,
+            path=EDITORS_FILE or None,
+            health_interval=HEALTH_INTERVAL,
+            health_timeout=HEALTH_TIMEOUT,
+            reload_interval=EDITORS_RELOAD,
+            retire_timeout=EDITORS_RETIRE_TIMEOUT,
+            affinity=SESSION_AFFINITY,
+            limiter=(
+                AdmissionLimiter(MAX_IN_FLIGHT, SESSION_MAX_IN_FLIGHT, MAX_QUEUED, SESSION_MAX_QUEUED,
+                                 ADMISSION_TIMEOUT, COMMAND_METRICS)
+                if MAX_IN_FLIGHT > 0 or SESSION_MAX_IN_FLIGHT > 0 else None
+            ),
+            metrics=COMMAND_METRICS,
+        )
+        pool = _editor_pool
+        METRICS.gauge("unreal_streams_open", "Streams open to Unreal").set_function(lambda: pool.size)
+        COMMAND_METRICS.watch_editors(pool)
+        if pool.limiter is not None:
+            COMMAND_METRICS.watch_admission(pool.limiter)
+    return _editor_pool
+
+async def get_unreal_connection() -> Optional[EditorPool]:
+    """Get the shared pool of editors, routing each command to the least loaded one."""
     try:
-        connection = UnrealConnection()
-        if connection.connect():
-            logger.debug("Created new Unreal Engine connection")
-            return connection
+        pool = get_editor_pool()
+        if await pool.connect():
+            return pool
         else:
             logger.warning("Could not connect to Unreal Engine")
             return None
@@ -217,22 +226,65 @@ def get_unreal_connection() -> Optional[UnrealConnection]:
         return None
 
 @asynccontextmanager
-async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
-    """Handle server startup and shutdown."""
-    logger.info("UnrealMCP server starting up")
-    
+async def app_lifespan(app) -> AsyncIterator[None]:
+    """Handle server startup and shutdown: warm up the editors and monitor their health."""
+    logger.info(f"UnrealMCP server starting up, using {JSON_BACKEND} for JSON")
+    pool = get_editor_pool()
+    await pool.start()
+
     try:
-        yield {}
+        yield
     finally:
+        await pool.stop()
+        for instance in pool.instances:
+            connection = instance.connection
+            logger.info(f"Editor {instance.name} health stats: {instance.monitor.status()}")
+            if connection.cache is not None:
+                logger.info(f"Editor {instance.name} response cache stats: {connection.cache.stats()}")
+            if connection.scene is not None:
+                logger.info(f"Editor {instance.name} scene mirror stats: {connection.scene.stats()}")
+            if connection.compression is not None:
+                logger.info(f"Editor {instance.name} compression stats: {connection.compression.stats()}")
+            if connection.breaker is not None:
+                logger.info(f"Editor {instance.name} circuit breaker stats: {connection.breaker.stats()}")
+            if connection.scheduler is not None:
+                logger.info(f"Editor {instance.name} scheduler stats: {connection.scheduler.stats()}")
+        if pool.limiter is not None:
+            logger.info(f"Admission stats: {pool.limiter.stats()}")
+        await pool.close()
+        if TRACER is not None:
+            logger.info(f"Tracing stats: {TRACER.exporter.stats()}")
+        if CAPTURE is not None:
+            logger.info(f"Capture stats: {CAPTURE.stats()}")
+        logger.info(f"Logging stats: {_log_handler.stats()}")
         logger.info("Unreal MCP server shut down")
 
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Handle the start and end of an MCP session.
+
+    With the SSE transport this runs once per client session, so the shared
+    editor pool is set up and closed by app_lifespan instead. The session's
+    tool calls run within it, and are routed to the session's editor.
+    """
+    with get_editor_pool().session() as session:
+        logger.debug(f"MCP session {session} started")
+        try:
+            yield {"session": session}
+        finally:
+            logger.debug(f"MCP session {session} ended")
+
 # Initialize server
 mcp = FastMCP(
     "UnrealMCP",
     lifespan=server_lifespan,
-    host="0.0.0.0", port=9000
+    host=MCP_HOST, port=MCP_PORT
 )
 
+# Trace every tool call from its entry down to the socket
+if TRACER is not None:
+    trace_tools(mcp, TRACER)
+
 # Import and register tools
 from tools.editor_tools import register_editor_tools
 from tools.blueprint_tools import register_blueprint_tools
@@ -241,6 +293,8 @@ from tools.project_tools import register_project_tools
 from tools.umg_tools import register_umg_tools
 from tools.python_tools import register_python_tools
 from tools.api_doc_tools import register_api_doc_tools
+from tools.batch_tools import register_batch_tools
+from tools.status_tools import register_status_tools
 
 # Register tools
 register_editor_tools(mcp)
@@ -250,6 +304,8 @@ register_project_tools(mcp)
 # register_umg_tools(mcp)
 register_python_tools(mcp)
 register_api_doc_tools(mcp)
+register_batch_tools(mcp)
+register_status_tools(mcp)
 
 @mcp.prompt()
 def info():
@@ -266,7 +322,7 @@ def info():
     - `take_screenshot(filename, show_ui, resolution)` - Capture screenshots
 
     ### Actor Management
-    - `get_actors_in_level()` - List all actors in current level
+    - `get_actors_in_level(fields, class_filter, offset, limit, cursor)` - List actors in current level, a page at a time
     - `find_actors_by_name(pattern)` - Find actors by name pattern
     - `spawn_actor(name, type, location=[0,0,0], rotation=[0,0,0], scale=[1,1,1])` - Create actors
     - `delete_actor(name)` - Remove actors
@@ -289,6 +345,12 @@ def info():
 
     ## Project Tools
     - `create_input_mapping(action_name, key, input_type)` - Create input mappings
+
+    ## Status Tools
+    - `get_unreal_status()` - Whether each Unreal editor is reachable, with its load, health check and connection pool details
+
+    ## Batch Tools
+    - `batch_execute(commands, stop_on_error=True)` - Run several commands, each `{"type": ..., "params": {...}}`, in one round trip
     
     ## Best Practices
     ### Python Scripting
@@ -296,7 +358,12 @@ def info():
     - Always check if there is a python script you can reuse by using `list_python_scripts(path)`
     - Always save the python script first by using `save_python_script(script, path)` and then execute it by using `execute_python_script(script, path)`, so that you can reuse it afterwards
 
+    ### Batching
+    - Prefer `batch_execute` for multi-step edits such as building a Blueprint, instead of one tool call per step
+    - Keep `stop_on_error` enabled when later steps depend on earlier ones
+
     ### Editor and Actor Management
+    - In large levels, list actors with `fields`, `class_filter` and a `limit`, and follow `next_cursor` only as far as needed
     - Use unique names for actors to avoid conflicts
     - Clean up temporary actors
     - Validate transforms before applying
@@ -321,6 +388,15 @@ def info():
     """
 
 # Run the server
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve METRICS in the Prometheus text format."""
+    return Response(METRICS.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     logger.info("Starting MCP server with http transport")
-    mcp.run(transport='sse')  # Set server log level to DEBUG for more details
\ No newline at end of file
+    # Serve the SSE app like mcp.run(transport='sse'), with /metrics on the same port
+    app = mcp.sse_app()
+    # Set up the shared editor pool once for the process, not per SSE session
+    app.router.lifespan_context = app_lifespan
+    app.add_route("/metrics", metrics_endpoint, methods=["GET"])
+    uvicorn.run(app, host=mcp.settings.host, port=mcp.settings.port, log_level=mcp.settings.log_level.lower())
\ No newline at end of file